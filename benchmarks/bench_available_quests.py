@@ -0,0 +1,83 @@
+"""
+Benchmark: listing available quests, full scan vs. QuestTracker
+
+Builds a catalog of 20k quests (prerequisite trees, levels 1-50) and a
+character who has completed a third of them, then times
+get_available_quests with and without the character's QuestTracker,
+and the time to keep the tracker up to date through accept/complete.
+
+Run from the repository root:
+    python benchmarks/bench_available_quests.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import quest_handler
+
+QUEST_COUNT = 20000
+LISTINGS = 3
+
+
+def make_quests(count):
+    """count quests, each needing an earlier quest 80% of the time"""
+    rng = random.Random(163)
+    quests = {}
+
+    for i in range(count):
+        prereq = "NONE" if i == 0 or rng.random() < 0.2 else f"q{rng.randrange(max(0, i - 50), i)}"
+        quests[f"q{i}"] = {
+            "quest_id": f"q{i}", "title": f"Quest {i}", "description": "",
+            "reward_xp": 0, "reward_gold": 0,
+            "required_level": rng.randint(1, 50), "prerequisite": prereq,
+        }
+
+    return quests
+
+
+def main():
+    quests = make_quests(QUEST_COUNT)
+    graph = quest_handler.QuestGraph(quests)
+
+    char = character_manager.create_character("Bench", "Warrior")
+    char["level"] = 50
+    tracker = quest_handler.QuestTracker(char, graph)
+
+    # complete about a third of the catalog through the tracker
+    start = time.perf_counter()
+    done = 0
+    while done < QUEST_COUNT // 3:
+        available = tracker.available_quests()
+        if len(available) == 0:
+            break
+        quest_id = available[0]["quest_id"]
+        quest_handler.accept_quest(char, quest_id, quests, graph, tracker)
+        quest_handler.complete_quest(char, quest_id, quests, tracker)
+        done += 1
+    updates = (time.perf_counter() - start) / done * 1e6
+
+    start = time.perf_counter()
+    for _ in range(LISTINGS):
+        scanned = quest_handler.get_available_quests(char, quests)
+    scan = (time.perf_counter() - start) / LISTINGS * 1000
+
+    start = time.perf_counter()
+    for _ in range(LISTINGS):
+        tracked = quest_handler.get_available_quests(char, quests, tracker)
+    indexed = (time.perf_counter() - start) / LISTINGS * 1000
+
+    assert sorted(q["quest_id"] for q in scanned) == sorted(q["quest_id"] for q in tracked)
+
+    print(f"{QUEST_COUNT} quests, {done} completed, {len(tracked)} available")
+    print(f"{'scan':>8}: {scan:>9.2f}ms per listing")
+    print(f"{'tracker':>8}: {indexed:>9.2f}ms per listing ({scan / indexed:.0f}x)")
+    print(f"{'':>8}  {updates:>9.1f}us per accept + complete (tracker updates included)")
+
+
+if __name__ == "__main__":
+    main()
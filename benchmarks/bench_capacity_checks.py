@@ -0,0 +1,73 @@
+"""
+Benchmark: inventory capacity checks vs. inventory size
+
+Times check_basket_space on inventories of 100 to 10k items (spread
+over many stackable item ids, with weights) against working the slots
+and weight out from the items held on every check, which is what a
+capacity check has to do without running totals.
+
+Run from the repository root:
+    python benchmarks/bench_capacity_checks.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inventory_system
+
+SIZES = [100, 1000, 10000]
+CHECKS = 20000
+
+
+def make_inventory(size):
+    """Inventory of size items over size // 10 ids, 5 per stack"""
+    ids = [f"item_{i}" for i in range(max(1, size // 10))]
+    capacity = inventory_system.InventoryCapacity(
+        max_slots=size, max_stack=5, max_weight=size * 10,
+        weights={item_id: 2 for item_id in ids},
+    )
+    inventory = inventory_system.Inventory(capacity=capacity)
+    for i in range(size):
+        inventory.append(ids[i % len(ids)])
+    return inventory
+
+
+def recount_check(inventory, additions):
+    """Capacity check that recomputes slots and weight from the items"""
+    capacity = inventory.capacity
+    slots = 0
+    weight = 0
+    counts = inventory.counts()
+    for item_id, quantity in additions.items():
+        counts[item_id] = counts.get(item_id, 0) + quantity
+    for item_id, count in counts.items():
+        slots += capacity.slots_for(item_id, count)
+        weight += count * capacity.weights.get(item_id, 0)
+    return slots <= capacity.max_slots and weight <= capacity.max_weight
+
+
+def checks_per_second(check, inventory):
+    """Rate of capacity checks for adding one item"""
+    character = {"inventory": inventory}
+    additions = {"item_0": 1}
+    start = time.perf_counter()
+    for _ in range(CHECKS):
+        check(character, additions)
+    return CHECKS / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'items':>8} {'recount':>14} {'running totals':>16}")
+
+    for size in SIZES:
+        inventory = make_inventory(size)
+        slow = checks_per_second(lambda c, a: recount_check(c["inventory"], a), inventory)
+        fast = checks_per_second(inventory_system.check_basket_space, inventory)
+        print(f"{size:>8} {slow:>10.0f}/sec {fast:>12.0f}/sec ({fast / slow:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
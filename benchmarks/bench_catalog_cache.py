@@ -0,0 +1,71 @@
+"""
+Benchmark: text parse vs. compiled cache for game_data.load_items
+
+Generates item catalogs of 1k / 10k / 100k entries in a temporary directory
+and times a cold text parse against a load from the compiled cache.
+
+Run from the repository root:
+    python benchmarks/bench_catalog_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+SIZES = [1000, 10000, 100000]
+REPEATS = 3
+
+
+def write_item_file(path, count):
+    """Write a synthetic item catalog with count entries"""
+    types = ["weapon", "armor", "consumable"]
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(
+                f"ITEM_ID: item_{i}\n"
+                f"NAME: Item {i}\n"
+                f"TYPE: {types[i % 3]}\n"
+                f"EFFECT: strength:{i % 20 + 1}\n"
+                f"COST: {i % 500 + 1}\n"
+                f"DESCRIPTION: Generated item number {i}\n"
+                "\n"
+            )
+
+
+def best_time(func):
+    """Return the fastest of REPEATS runs in seconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    print(f"{'entries':>8} {'text parse':>12} {'cached load':>12} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in SIZES:
+            path = os.path.join(tmp, f"items_{count}.txt")
+            write_item_file(path, count)
+
+            text_time = best_time(lambda: game_data.load_items(path))
+
+            # first call writes the cache, the timed calls read it
+            game_data.load_items(path, use_cache=True)
+            cached_time = best_time(lambda: game_data.load_items(path, use_cache=True))
+
+            print(f"{count:>8} {text_time * 1000:>10.1f}ms {cached_time * 1000:>10.1f}ms "
+                  f"{text_time / cached_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: bytes per resident character, dict vs. Character record
+
+Creates many characters both ways and measures the memory they hold with
+tracemalloc.
+
+Run from the repository root:
+    python benchmarks/bench_character_memory.py
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+COUNT = 100000
+
+
+def make_dict_character(name):
+    """The character dictionary create_character used to return"""
+    return {
+        "name": name,
+        "class": "Warrior",
+        "level": 1,
+        "health": 120,
+        "max_health": 120,
+        "strength": 15,
+        "magic": 5,
+        "experience": 0,
+        "gold": 100,
+        "inventory": [],
+        "active_quests": [],
+        "completed_quests": []
+    }
+
+
+def bytes_per_character(factory):
+    """Average traced bytes held by one character made by factory"""
+    names = [f"hero_{i}" for i in range(COUNT)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    characters = [factory(name) for name in names]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del characters
+    return (after - before) / COUNT
+
+
+def main():
+    as_dict = bytes_per_character(make_dict_character)
+    as_record = bytes_per_character(
+        lambda name: character_manager.create_character(name, "Warrior")
+    )
+
+    print(f"{COUNT} characters")
+    print(f"dict:      {as_dict:>7.0f} bytes/character")
+    print(f"Character: {as_record:>7.0f} bytes/character ({as_record / as_dict:.0%} of dict)")
+
+
+if __name__ == "__main__":
+    main()
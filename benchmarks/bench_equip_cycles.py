@@ -0,0 +1,107 @@
+"""
+Benchmark: equip/unequip cycles with string vs. compiled item effects
+
+"string" is the old behaviour: the effect string is parsed on every equip
+and unequip and stored on the character as a string. "compiled" uses the
+'effects' tuple game_data puts on loaded items.
+
+Run from the repository root:
+    python benchmarks/bench_equip_cycles.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from custom_exceptions import InventoryFullError, InvalidItemTypeError, ItemNotFoundError
+
+CYCLES = 200000
+REPEATS = 5
+
+
+def string_equip_weapon(character, item_id, item_data):
+    """equip_weapon as it was before effects were compiled"""
+    inventory = character["inventory"]
+
+    if item_id not in inventory:
+        raise ItemNotFoundError(f"Item not found: {item_id}")
+    if item_data["type"] != "weapon":
+        raise InvalidItemTypeError("Item is not a weapon.")
+
+    if "equipped_weapon" in character and character["equipped_weapon"] is not None:
+        stat_name, value = inventory_system.parse_item_effect(character["equipped_weapon_effect"])
+        inventory_system.apply_stat_effect(character, stat_name, -value)
+        inventory.append(character["equipped_weapon"])
+
+    effect_string = item_data["effect"]
+    stat_name, value = inventory_system.parse_item_effect(effect_string)
+    inventory_system.apply_stat_effect(character, stat_name, value)
+
+    character["equipped_weapon"] = item_id
+    character["equipped_weapon_effect"] = effect_string
+    inventory.remove(item_id)
+
+    return f"You equipped {item_id} (+{stat_name} {value})."
+
+
+def string_unequip_weapon(character):
+    """unequip_weapon as it was before effects were compiled"""
+    inventory = character["inventory"]
+
+    if "equipped_weapon" not in character or character["equipped_weapon"] is None:
+        return None
+
+    weapon_id = character["equipped_weapon"]
+    effect = character["equipped_weapon_effect"]
+
+    if len(inventory) >= inventory_system.MAX_INVENTORY_SIZE:
+        raise InventoryFullError("Inventory is full.")
+
+    stat_name, value = inventory_system.parse_item_effect(effect)
+    inventory_system.apply_stat_effect(character, stat_name, -value)
+
+    inventory.append(weapon_id)
+    character["equipped_weapon"] = None
+    character["equipped_weapon_effect"] = None
+
+    return weapon_id
+
+
+def cycle_time(equip, unequip, item_data):
+    """Seconds for CYCLES equip+unequip cycles on a fresh character"""
+    char = character_manager.create_character("Bench", "Warrior")
+    char["inventory"].append("iron_sword")
+
+    start = time.perf_counter()
+    for _ in range(CYCLES):
+        equip(char, "iron_sword", item_data)
+        unequip(char)
+    return time.perf_counter() - start
+
+
+def main():
+    sword = {"type": "weapon", "effect": "strength:5"}
+    compiled_sword = dict(sword, effects=inventory_system.compile_item_effect(sword["effect"]))
+
+    # runs alternate so that drift in machine speed hits both sides alike;
+    # the best of REPEATS runs is kept for each
+    before = after = None
+    for _ in range(REPEATS):
+        elapsed = cycle_time(string_equip_weapon, string_unequip_weapon, sword)
+        before = elapsed if before is None else min(before, elapsed)
+        elapsed = cycle_time(inventory_system.equip_weapon, inventory_system.unequip_weapon,
+                             compiled_sword)
+        after = elapsed if after is None else min(after, elapsed)
+
+    before = CYCLES / before
+    after = CYCLES / after
+    print(f"{'string':>10}: {before:>10.0f} cycles/sec")
+    print(f"{'compiled':>10}: {after:>10.0f} cycles/sec ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
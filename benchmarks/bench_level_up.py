@@ -0,0 +1,43 @@
+"""
+Benchmark: closed-form level ups vs. the one-level-per-iteration loop
+
+Times character_manager.calculate_level_ups against the reference loop
+for increasingly large experience grants at level 1, and checks that both
+give the same result.
+
+Run from the repository root:
+    python benchmarks/bench_level_up.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+GRANTS = [1000, 100000, 10000000, 1000000000]
+
+
+def main():
+    print(f"{'xp grant':>12} {'levels':>7} {'loop':>12} {'closed form':>12}")
+
+    for xp in GRANTS:
+        fast = character_manager.calculate_level_ups(1, xp)
+        slow = character_manager._calculate_level_ups_loop(1, xp)
+        assert fast == slow
+
+        runs = 200
+        loop_time = timeit.timeit(
+            lambda: character_manager._calculate_level_ups_loop(1, xp), number=runs
+        ) / runs
+        fast_time = timeit.timeit(
+            lambda: character_manager.calculate_level_ups(1, xp), number=runs
+        ) / runs
+
+        print(f"{xp:>12} {fast[2]:>7} {loop_time * 1e6:>10.1f}us {fast_time * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
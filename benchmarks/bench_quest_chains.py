@@ -0,0 +1,71 @@
+"""
+Benchmark: prerequisite chain lookups, walked vs. QuestGraph
+
+Builds quest catalogs made of long prerequisite chains and looks up the
+chain of every 100th quest, first by following links and inserting at
+the front of a list (how get_quest_prerequisite_chain used to work),
+then through a QuestGraph built once for the catalog.
+
+Run from the repository root:
+    python benchmarks/bench_quest_chains.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+
+CHAIN_LENGTHS = [1000, 5000, 10000]
+
+
+def make_chain(length):
+    """Quest catalog of one chain: q0 <- q1 <- ... <- q{length - 1}"""
+    quests = {}
+    for i in range(length):
+        prereq = "NONE" if i == 0 else f"q{i - 1}"
+        quests[f"q{i}"] = {"quest_id": f"q{i}", "prerequisite": prereq, "required_level": 1}
+    return quests
+
+
+def walked_chain(quest_id, quests):
+    """get_quest_prerequisite_chain before QuestGraph"""
+    chain = []
+    current = quest_id
+    while True:
+        chain.insert(0, current)
+        prereq = quests[current]["prerequisite"]
+        if prereq == "NONE":
+            break
+        current = prereq
+    return chain
+
+
+def main():
+    print(f"{'chain':>8} {'walked':>10} {'graph build':>12} {'graph':>10}")
+
+    for length in CHAIN_LENGTHS:
+        quests = make_chain(length)
+        lookups = [f"q{i}" for i in range(0, length, 100)]
+
+        start = time.perf_counter()
+        for quest_id in lookups:
+            walked_chain(quest_id, quests)
+        walked = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph = quest_handler.QuestGraph(quests)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for quest_id in lookups:
+            quest_handler.get_quest_prerequisite_chain(quest_id, quests, graph)
+        indexed = time.perf_counter() - start
+
+        print(f"{length:>8} {walked * 1000:>8.1f}ms {build * 1000:>10.1f}ms {indexed * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
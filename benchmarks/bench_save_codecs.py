@@ -0,0 +1,63 @@
+"""
+Benchmark: save file size and save/load latency for each save codec
+
+Saves a small (new character) and a large (long inventory and quest
+history) character with every codec in SAVE_CODECS, then reports the
+file size and the average save_character / load_character time.
+
+Run from the repository root:
+    python benchmarks/bench_save_codecs.py [directory]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+REPEATS = 500
+
+
+def make_characters():
+    """A fresh character and a well-played one"""
+    small = character_manager.create_character("Fresh", "Warrior")
+
+    large = character_manager.create_character("Veteran", "Mage")
+    large["inventory"] = [f"item_{i % 40}" for i in range(200)]
+    large["completed_quests"] = [f"quest_{i}" for i in range(300)]
+    large["active_quests"] = [f"quest_{i}" for i in range(300, 310)]
+
+    return [small, large]
+
+
+def average_time(func):
+    """Average time of one call in microseconds over REPEATS calls"""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) / REPEATS * 1e6
+
+
+def main():
+    parent = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"{'character':>10} {'codec':>6} {'bytes':>7} {'save':>10} {'load':>10}")
+
+    with tempfile.TemporaryDirectory(dir=parent) as tmp:
+        for char in make_characters():
+            for codec in character_manager.SAVE_CODECS:
+                character_manager.set_save_codec(codec)
+
+                save = average_time(lambda: character_manager.save_character(char, tmp))
+                load = average_time(lambda: character_manager.load_character(char["name"], tmp))
+                size = os.path.getsize(os.path.join(tmp, f"{char['name']}_save.txt"))
+
+                print(f"{char['name']:>10} {codec:>6} {size:>7} {save:>8.1f}us {load:>8.1f}us")
+
+    character_manager.set_save_codec("text")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark: character saves per second for each durability mode
+
+Saves the same character repeatedly into a temporary directory (on the
+local disk by default; pass a directory to test another volume).
+
+Run from the repository root:
+    python benchmarks/bench_save_durability.py [directory]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+SECONDS_PER_MODE = 2.0
+
+
+def saves_per_second(save_directory):
+    """Save one character as often as possible for SECONDS_PER_MODE"""
+    char = character_manager.create_character("BenchHero", "Warrior")
+    count = 0
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < SECONDS_PER_MODE:
+        char["gold"] += 1
+        character_manager.save_character(char, save_directory)
+        count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parent = sys.argv[1] if len(sys.argv) > 1 else None
+
+    with tempfile.TemporaryDirectory(dir=parent) as tmp:
+        print(f"saving into {tmp}")
+        for mode in character_manager.SAVE_DURABILITY_MODES:
+            character_manager.set_save_durability(mode)
+            print(f"{mode:>20}: {saves_per_second(tmp):>9.0f} saves/sec")
+
+    character_manager.set_save_durability("none")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: save lookup latency vs. directory size, flat vs. sharded
+
+Fills a temporary directory with 1k / 10k / 100k save files in each
+layout, then times load_character for randomly chosen characters and
+the time to list every save.
+
+Run from the repository root:
+    python benchmarks/bench_save_layout.py [directory]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+SIZES = [1000, 10000, 100000]
+LOOKUPS = 2000
+
+
+def fill_directory(save_directory, count, layout):
+    """Write count save files in the given layout; returns their names"""
+    data = character_manager.format_save_data(
+        character_manager.create_character("Template", "Warrior")
+    )
+    names = [f"Hero{i}" for i in range(count)]
+
+    for name in names:
+        filename = character_manager._save_path(save_directory, name, layout)
+        directory = os.path.dirname(filename)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(filename, "w") as f:
+            f.write(data.replace("NAME: Template", f"NAME: {name}", 1))
+
+    return names
+
+
+def lookup_time(save_directory, names):
+    """Average load_character time in microseconds over LOOKUPS names"""
+    sample = random.sample(names, min(LOOKUPS, len(names)))
+    start = time.perf_counter()
+    for name in sample:
+        character_manager.load_character(name, save_directory)
+    return (time.perf_counter() - start) / len(sample) * 1e6
+
+
+def main():
+    parent = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"{'saves':>8} {'layout':>8} {'lookup':>10} {'list all':>10}")
+
+    for count in SIZES:
+        for layout in character_manager.SAVE_LAYOUTS:
+            character_manager.set_save_layout(layout)
+
+            with tempfile.TemporaryDirectory(dir=parent) as tmp:
+                names = fill_directory(tmp, count, layout)
+                lookup = lookup_time(tmp, names)
+
+                start = time.perf_counter()
+                character_manager._list_save_files(tmp)
+                listing = time.perf_counter() - start
+
+            print(f"{count:>8} {layout:>8} {lookup:>8.1f}us {listing * 1000:>8.1f}ms")
+
+    character_manager.set_save_layout("flat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: shop queries on a large catalog, scanned vs. ShopCatalog
+
+Builds a catalog of 100k generated items and times three shop queries
+both by scanning every item (what the shop menu used to do) and through
+inventory_system.ShopCatalog:
+
+    page     - third page of weapons costing 100-500 gold, cheapest first
+    best     - three best strength items a character can afford
+    by stat  - first page of items giving 40+ max_health
+
+Run from the repository root:
+    python benchmarks/bench_shop_catalog.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inventory_system
+
+ITEM_COUNT = 100000
+QUERIES = 200
+PAGE_SIZE = 10
+
+
+def make_items(count):
+    """count random items with compiled effects"""
+    rng = random.Random(163)
+    items = {}
+
+    for i in range(count):
+        item_type = rng.choice(["weapon", "armor", "consumable"])
+        stat_name = {"weapon": "strength", "armor": "max_health", "consumable": "health"}[item_type]
+        effect = f"{stat_name}:{rng.randint(1, 50)}"
+        items[f"item_{i}"] = {
+            "item_id": f"item_{i}", "name": f"Item {i}", "type": item_type,
+            "effect": effect, "effects": inventory_system.compile_item_effect(effect),
+            "cost": rng.randint(1, 5000), "description": "",
+        }
+
+    return items
+
+
+def scan_page(items, gold):
+    matches = sorted((d["cost"], i) for i, d in items.items()
+                     if d["type"] == "weapon" and 100 <= d["cost"] <= 500)
+    return matches[2 * PAGE_SIZE:3 * PAGE_SIZE]
+
+
+def scan_best(items, gold):
+    matches = [(-d["effects"][0][1], d["cost"], i) for i, d in items.items()
+               if d["cost"] <= gold and d["effects"][0][0] == "strength"]
+    return sorted(matches)[:3]
+
+
+def scan_by_stat(items, gold):
+    matches = [(-d["effects"][0][1], i) for i, d in items.items()
+               if d["effects"][0][0] == "max_health" and d["effects"][0][1] >= 40]
+    return sorted(matches)[:PAGE_SIZE]
+
+
+def average_time(func, arg, golds):
+    """Average time of one call in microseconds"""
+    start = time.perf_counter()
+    for gold in golds:
+        func(arg, gold)
+    return (time.perf_counter() - start) / len(golds) * 1e6
+
+
+def main():
+    items = make_items(ITEM_COUNT)
+    golds = [random.Random(i).randint(50, 5000) for i in range(QUERIES)]
+
+    start = time.perf_counter()
+    catalog = inventory_system.ShopCatalog(items)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    catalog.best_affordable(0, "strength")
+    best_build = time.perf_counter() - start
+
+    queries = [
+        ("page", scan_page,
+         lambda c, gold: c.find("weapon", 100, 500, page=2, page_size=PAGE_SIZE)),
+        ("best", scan_best,
+         lambda c, gold: c.best_affordable(gold, "strength", k=3)),
+        ("by stat", scan_by_stat,
+         lambda c, gold: c.find_by_stat("max_health", min_value=40, page_size=PAGE_SIZE)),
+    ]
+
+    print(f"{ITEM_COUNT} items: index built in {build * 1000:.0f}ms, "
+          f"strength table in {best_build * 1000:.0f}ms")
+    print(f"{'query':>8} {'scan':>12} {'catalog':>12}")
+    for label, scan, indexed in queries:
+        slow = average_time(scan, items, golds)
+        fast = average_time(indexed, catalog, golds)
+        print(f"{label:>8} {slow:>10.1f}us {fast:>10.1f}us ({slow / fast:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: stat reads during a long battle, replayed vs. materialized
+
+A character wears an item in every equipment slot and fights a long
+battle through combat_system.SimpleBattle.calculate_damage, which reads
+strength on both sides every turn.
+
+"replayed" works out each stat on every read from the base value plus
+every equipped item's effects. "materialized" is the character as
+inventory_system keeps it: the totals are stored and only change when a
+slot does.
+
+Run from the repository root:
+    python benchmarks/bench_stat_reads.py
+"""
+
+import os
+import sys
+import time
+from collections.abc import Mapping
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+import inventory_system
+
+TURNS = 200000
+REPEATS = 3
+
+
+class ReplayedStats(Mapping):
+    """Character whose stats are recomputed from its equipment on every read"""
+
+    def __init__(self, character):
+        equipment = inventory_system.get_equipment(character)
+        self.base = {key: value for key, value in character.items() if key != "equipment"}
+        for stat_name, bonus in equipment.bonuses.items():
+            self.base[stat_name] -= bonus
+        self.slots = dict(equipment.slots)
+
+    def __getitem__(self, key):
+        value = self.base[key]
+        for item_id, effects in self.slots.values():
+            for stat_name, bonus in effects:
+                if stat_name == key:
+                    value += bonus
+        return value
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+
+def equipped_character():
+    """A Warrior with an item in every slot"""
+    char = character_manager.create_character("Bench", "Warrior")
+
+    for i, slot in enumerate(inventory_system.EQUIPMENT_SLOTS):
+        item_id = f"{slot}_{i}"
+        item = {"type": "armor", "slot": slot, "effect": f"strength:{i + 1},max_health:5"}
+        char["inventory"].append(item_id)
+        inventory_system.equip_item(char, item_id, item)
+
+    return char
+
+
+def reads_per_second(character, enemy):
+    """Best rate of strength reads over REPEATS battles of TURNS turns"""
+    battle = combat_system.SimpleBattle(character, enemy)
+    calculate_damage = battle.calculate_damage
+    best = None
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(TURNS):
+            calculate_damage(character, enemy)
+            calculate_damage(enemy, character)
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    # each calculate_damage reads the character's strength once
+    return 2 * TURNS / best
+
+
+def main():
+    char = equipped_character()
+    replayed = ReplayedStats(char)
+    enemy = combat_system.create_enemy("dragon")
+
+    assert replayed["strength"] == char["strength"]
+
+    slow = reads_per_second(replayed, enemy)
+    fast = reads_per_second(char, enemy)
+
+    slots = len(inventory_system.EQUIPMENT_SLOTS)
+    print(f"{slots} equipped slots, {TURNS} turns")
+    print(f"{'replayed':>13}: {slow:>10.0f} strength reads/sec")
+    print(f"{'materialized':>13}: {fast:>10.0f} strength reads/sec ({fast / slow:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
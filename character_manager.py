@@ -10,6 +10,21 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+import io
+import math
+import hashlib
+import bisect
+import sqlite3
+import tarfile
+import zlib
+import lzma
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from inventory_system import Inventory, get_item_counts
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -18,6 +33,141 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# ============================================================================
+# CHARACTER RECORD
+# ============================================================================
+
+# Keys every character has, in save file order
+CHARACTER_FIELDS = [
+    "name", "class", "level", "health", "max_health",
+    "strength", "magic", "experience", "gold",
+    "inventory", "active_quests", "completed_quests"
+]
+
+# Optional keys set by inventory_system when equipping
+EQUIPMENT_FIELDS = [
+    "equipped_weapon", "equipped_weapon_effect",
+    "equipped_armor", "equipped_armor_effect",
+    "equipment"
+]
+
+# Mapping key -> attribute slot ("class" is a keyword, so it gets renamed)
+_CHARACTER_SLOTS = {key: key for key in CHARACTER_FIELDS + EQUIPMENT_FIELDS}
+_CHARACTER_SLOTS["class"] = "character_class"
+
+class Character(MutableMapping):
+    """
+    Compact character record
+
+    Stores each field in a __slots__ attribute instead of a per-character
+    dict, which cuts the memory used by every resident character. It still
+    behaves like the character dictionary (character["health"],
+    "equipped_weapon" in character, .get(), .items() ...) so every module
+    can use it unchanged. Keys outside the known fields are kept in a small
+    dict that is only created when one is first set.
+    """
+
+    __slots__ = tuple(_CHARACTER_SLOTS.values()) + ("_extra",)
+
+    def __init__(self, name, character_class, level, health, max_health,
+                 strength, magic, experience=0, gold=100,
+                 inventory=None, active_quests=None, completed_quests=None):
+        self.name = name
+        self.character_class = character_class
+        self.level = level
+        self.health = health
+        self.max_health = max_health
+        self.strength = strength
+        self.magic = magic
+        self.experience = experience
+        self.gold = gold
+        self.inventory = Inventory() if inventory is None else inventory
+        self.active_quests = [] if active_quests is None else active_quests
+        self.completed_quests = [] if completed_quests is None else completed_quests
+        self._extra = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Character from a character dictionary (or Character)"""
+        character = cls.__new__(cls)
+        character._extra = None
+        for key, value in data.items():
+            character[key] = value
+        return character
+
+    def __getitem__(self, key):
+        slot = _CHARACTER_SLOTS.get(key)
+        if slot is not None:
+            try:
+                return getattr(self, slot)
+            except AttributeError:
+                raise KeyError(key)
+
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        slot = _CHARACTER_SLOTS.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+            return
+
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key):
+        slot = _CHARACTER_SLOTS.get(key)
+        if slot is not None:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                raise KeyError(key)
+            return
+
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key):
+        slot = _CHARACTER_SLOTS.get(key)
+        if slot is not None:
+            return hasattr(self, slot)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key, slot in _CHARACTER_SLOTS.items():
+            if hasattr(self, slot):
+                yield key
+        if self._extra is not None:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def get(self, key, default=None):
+        # faster than the MutableMapping version, which goes through KeyError
+        if key in self:
+            return self[key]
+        return default
+
+    def copy(self):
+        """Shallow copy, like dict.copy()"""
+        return Character.from_dict(self)
+
+    def to_dict(self):
+        """Return the character as a plain dictionary"""
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"Character({self.to_dict()!r})"
+
+# Stat increases per level up
+LEVEL_UP_MAX_HEALTH = 10
+LEVEL_UP_STRENGTH = 2
+LEVEL_UP_MAGIC = 2
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -28,7 +178,7 @@ def create_character(name, character_class):
     
     Valid classes: Warrior, Mage, Rogue, Cleric
     
-    Returns: Dictionary with character data including:
+    Returns: Character (used like a dictionary) with data including:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
     
@@ -61,20 +211,17 @@ def create_character(name, character_class):
 
     stats = class_stats[character_class]
 
-    character = {
-        "name": name,
-        "class": character_class,
-        "level": 1,
-        "health": stats["health"],
-        "max_health": stats["health"],
-        "strength": stats["strength"],
-        "magic": stats["magic"],
-        "experience": 0,
-        "gold": 100,
-        "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
-    }
+    character = Character(
+        name,
+        character_class,
+        level=1,
+        health=stats["health"],
+        max_health=stats["health"],
+        strength=stats["strength"],
+        magic=stats["magic"],
+        experience=0,
+        gold=100
+    )
 
     return character
 
@@ -98,6 +245,19 @@ def save_character(character, save_directory="data/save_games"):
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
+    The file is replaced atomically (written to a temp file, then renamed),
+    so a crash mid-save leaves the previous save intact. How hard it is
+    pushed to disk is set with set_save_durability. With set_save_journal
+    turned on, only the changed fields are appended to a journal instead.
+    set_save_codec("zlib") or set_save_codec("lzma") compresses the file;
+    load_character works out the codec from the file itself. With
+    set_save_layout("sharded") the file goes in a hashed subdirectory of
+    save_directory (see SAVE LAYOUT).
+
+    If a save backend has been set with set_save_backend, the character is
+    saved there instead and save_directory is ignored (the same goes for
+    load_character, list_saved_characters and delete_character).
+
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
@@ -105,31 +265,27 @@ def save_character(character, save_directory="data/save_games"):
     # Create save_directory if it doesn't exist
     # Handle any file I/O errors appropriately
     # Lists should be saved as comma-separated values
-    if not os.path.exists(save_directory):
-        os.makedirs(save_directory)
+    if _save_backend is not None:
+        return _save_backend.save_character(character)
 
-    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    filename = _save_path(save_directory, character["name"])
+    if not os.path.exists(os.path.dirname(filename)):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
 
     try:
-        with open(filename, "w") as f:
-            f.write(f"NAME: {character['name']}\n")
-            f.write(f"CLASS: {character['class']}\n")
-            f.write(f"LEVEL: {character['level']}\n")
-            f.write(f"HEALTH: {character['health']}\n")
-            f.write(f"MAX_HEALTH: {character['max_health']}\n")
-            f.write(f"STRENGTH: {character['strength']}\n")
-            f.write(f"MAGIC: {character['magic']}\n")
-            f.write(f"EXPERIENCE: {character['experience']}\n")
-            f.write(f"GOLD: {character['gold']}\n")
-
-            inv = ",".join(character["inventory"])
-            active = ",".join(character["active_quests"])
-            done = ",".join(character["completed_quests"])
-
-            f.write(f"INVENTORY: {inv}\n")
-            f.write(f"ACTIVE_QUESTS: {active}\n")
-            f.write(f"COMPLETED_QUESTS: {done}\n")
+        # a save still in the other layout moves over first
+        existing = _find_save_file(save_directory, character["name"])
+        if existing is not None and existing != filename:
+            _move_save_file(existing, filename)
 
+        if _journal_enabled:
+            _save_with_journal(character, filename)
+        else:
+            write_file_atomic(filename, encode_save_data(format_save_data(character)),
+                              _save_durability)
+
+        _uncache_character(character["name"], save_directory)
+        _index_save(character, save_directory)
         return True
     except:
         raise IOError("error saving character file")
@@ -142,7 +298,11 @@ def load_character(character_name, save_directory="data/save_games"):
         character_name: Name of character to load
         save_directory: Directory containing save files
     
-    Returns: Character dictionary
+    With set_character_cache, recently loaded characters come from memory
+    while their save file is unchanged (see CHARACTER CACHE).
+
+    Returns: Character (used like a dictionary), or a CharacterView if the
+             cache hands out copy-on-write views
     Raises: 
         CharacterNotFoundError if save file doesn't exist
         SaveFileCorruptedError if file exists but can't be read
@@ -153,66 +313,154 @@ def load_character(character_name, save_directory="data/save_games"):
     # Try to read file → SaveFileCorruptedError
     # Validate data format → InvalidSaveDataError
     # Parse comma-separated lists back into Python lists
-    
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    if _save_backend is not None:
+        return _save_backend.load_character(character_name)
+
+    if _character_cache is not None:
+        return _character_cache.load(character_name, save_directory)
+
+    return Character.from_dict(_load_text_save(character_name, save_directory))
+
+def _load_text_save(character_name, save_directory):
+    """
+    Read a text save file, replaying its journal if it has one
+
+    Returns: Validated character dictionary
+    Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+    """
+    filename = _find_save_file(save_directory, character_name)
 
-    if not os.path.exists(filename):
+    if filename is None:
         raise CharacterNotFoundError(f"no save file for: {character_name}")
 
     try:
-        with open(filename, "r") as f:
-            lines = f.readlines()
+        with open(filename, "rb") as f:
+            data = f.read()
     except:
         raise SaveFileCorruptedError("could not read save file")
 
+    character = parse_save_data(decode_save_data(data).splitlines(keepends=True))
+
+    # only journaled snapshots carry a generation (see SAVE JOURNAL)
+    generation = character.pop("generation", None)
+    if generation is not None:
+        _apply_save_journal(character, filename, generation)
+
+    return character
+
+def format_save_data(character):
+    """
+    Build the full text of a character's save file (format in save_character)
+
+    Returns: String with one KEY: value line per field
+    """
+    inv = ",".join(character["inventory"])
+    active = ",".join(character["active_quests"])
+    done = ",".join(character["completed_quests"])
+
+    return (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {character['level']}\n"
+        f"HEALTH: {character['health']}\n"
+        f"MAX_HEALTH: {character['max_health']}\n"
+        f"STRENGTH: {character['strength']}\n"
+        f"MAGIC: {character['magic']}\n"
+        f"EXPERIENCE: {character['experience']}\n"
+        f"GOLD: {character['gold']}\n"
+        f"INVENTORY: {inv}\n"
+        f"ACTIVE_QUESTS: {active}\n"
+        f"COMPLETED_QUESTS: {done}\n"
+    )
+
+def parse_save_data(lines):
+    """
+    Parse the lines of a save file into a character dictionary
+
+    Returns: Validated character dictionary
+    Raises: InvalidSaveDataError if data format is wrong
+    """
     character = {}
 
     for line in lines:
         if line.strip() == "":
             continue
-        if ": " not in line:
-            raise InvalidSaveDataError("invalid line format")
-
-        key, value = line.strip().split(":", 1)
-        key = key.lower()
-        value = value.strip()
-
-        if key in ["level", "health", "max_health", "strength", "magic", "experience", "gold"]:
-            try:
-                value = int(value)
-            except:
-                raise InvalidSaveDataError(f"invalid number for {key}")
-
-        elif key in ["inventory", "active_quests", "completed_quests"]:
-            if value == "":
-                value = []
-            else:
-                value = value.split(",")
 
+        key, value = _parse_save_line(line)
         character[key] = value
 
     validate_character_data(character)
+    character["inventory"] = Inventory(character["inventory"])
 
     return character
 
+def _parse_save_line(line):
+    """
+    Parse one "KEY: value" save line
+
+    Returns: Tuple of (lowercase key, value as int / list / string)
+    Raises: InvalidSaveDataError if the line is malformed
+    """
+    if ": " not in line:
+        raise InvalidSaveDataError("invalid line format")
+
+    key, value = line.strip().split(":", 1)
+    key = key.lower()
+    value = value.strip()
+
+    if key in ["level", "health", "max_health", "strength", "magic", "experience", "gold"]:
+        try:
+            value = int(value)
+        except:
+            raise InvalidSaveDataError(f"invalid number for {key}")
+
+    elif key in ["inventory", "active_quests", "completed_quests"]:
+        if value == "":
+            value = []
+        else:
+            value = value.split(",")
+
+    return key, value
+
 def list_saved_characters(save_directory="data/save_games"):
     """
     Get list of all saved character names
-    
-    Returns: List of character names (without _save.txt extension)
+
+    Text saves are listed from the directory's save index (see SAVE
+    INDEX), which is built the first time this is called.
+
+    Returns: List of character names (without _save.txt extension), sorted
     """
     # TODO: Implement this function
     # Return empty list if directory doesn't exist
     # Extract character names from filenames
+    if _save_backend is not None:
+        return _save_backend.list_saved_characters()
+
     if not os.path.exists(save_directory):
         return []
 
-    names = []
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            names.append(filename.replace("_save.txt", ""))
+    return _get_save_index(save_directory, create=True).names()
 
-    return names
+def _list_save_files(save_directory):
+    """Names of the text save files in save_directory, in either layout"""
+    if not os.path.exists(save_directory):
+        return []
+
+    names = set()
+    with os.scandir(save_directory) as entries:
+        for entry in entries:
+            if entry.name.endswith("_save.txt"):
+                names.add(entry.name[:-len("_save.txt")])
+            elif _is_shard_directory(entry):
+                with os.scandir(entry.path) as shards:
+                    for shard in shards:
+                        if _is_shard_directory(shard):
+                            for filename in os.listdir(shard.path):
+                                if filename.endswith("_save.txt"):
+                                    names.add(filename[:-len("_save.txt")])
+
+    return list(names)
 
 def delete_character(character_name, save_directory="data/save_games"):
     """
@@ -223,148 +471,1987 @@ def delete_character(character_name, save_directory="data/save_games"):
     """
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    if _save_backend is not None:
+        return _save_backend.delete_character(character_name)
 
-    if not os.path.exists(filename):
+    filename = _find_save_file(save_directory, character_name)
+
+    if filename is None:
         raise CharacterNotFoundError(f"no save file for: {character_name}")
 
     try:
         os.remove(filename)
+        _forget_save_journal(filename)
+        _uncache_character(character_name, save_directory)
+        _index_delete(character_name, save_directory)
     except:
         raise SaveFileCorruptedError("could not delete save file")
 
     return True 
 
 # ============================================================================
-# CHARACTER OPERATIONS
+# SAVE LAYOUT
 # ============================================================================
+#
+# "flat" keeps every text save directly in the save directory. "sharded"
+# puts each one two directories down, named from a hash of the character
+# name, so no single directory ends up holding every save:
+#
+#     data/save_games/3f/a2/Hero_save.txt
+#
+# Lookups check both places, so a directory can be migrated with
+# migrate_save_layout while the game is running, and saving a character
+# that is still in the old layout moves it over. The save index only
+# notices saves added by hand to the top-level directory; after copying
+# saves into shard directories, call rebuild_save_index.
 
-def gain_experience(character, xp_amount):
+SAVE_LAYOUTS = ["flat", "sharded"]
+
+_save_layout = "flat"
+
+_SHARD_CHARACTERS = set("0123456789abcdef")
+
+def set_save_layout(layout):
     """
-    Add experience to character and handle level ups
-    
-    Level up formula: level_up_xp = current_level * 100
-    Example when leveling up:
-    - Increase level by 1
-    - Increase max_health by 10
-    - Increase strength by 2
-    - Increase magic by 2
-    - Restore health to max_health
-    
-    Raises: CharacterDeadError if character health is 0
+    Choose where new text saves are written
+
+    Returns: The layout that was active before
+    Raises: ValueError if layout isn't in SAVE_LAYOUTS
     """
-    # TODO: Implement experience gain and leveling
-    # Check if character is dead first
-    # Add experience
-    # Check for level up (can level up multiple times)
-    # Update stats on level up
-    if character["health"] == 0:
-        raise CharacterDeadError("cannot gain xp while dead")
+    global _save_layout
 
-    character["experience"] += xp_amount
+    if layout not in SAVE_LAYOUTS:
+        raise ValueError(f"unknown save layout: {layout}")
 
-    while character["experience"] >= character["level"] * 100:
-        character["experience"] -= character["level"] * 100
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
-        character["health"] = character["max_health"]
+    previous = _save_layout
+    _save_layout = layout
+    return previous
 
-    return True
+def _save_path(save_directory, character_name, layout=None):
+    """Where a character's save file goes in the given (or current) layout"""
+    if layout is None:
+        layout = _save_layout
 
-def add_gold(character, amount):
+    filename = f"{character_name}_save.txt"
+    if layout == "flat":
+        return os.path.join(save_directory, filename)
+
+    digest = hashlib.sha1(character_name.encode("utf-8")).hexdigest()
+    return os.path.join(save_directory, digest[:2], digest[2:4], filename)
+
+def _find_save_file(save_directory, character_name):
     """
-    Add gold to character's inventory
-    
-    Args:
-        character: Character dictionary
-        amount: Amount of gold to add (can be negative for spending)
-    
-    Returns: New gold total
-    Raises: ValueError if result would be negative
+    Find a character's save file in either layout
+
+    Also finishes a move that stopped between the save file and its
+    journal, so the journal is always next to its save.
+
+    Returns: Path of the save file, or None if there isn't one
     """
-    # TODO: Implement gold management
-    # Check that result won't be negative
-    # Update character's gold
-    new_total = character["gold"] + amount
-    if new_total < 0:
-        raise ValueError("not enough gold")
-    character["gold"] = new_total
-    return character["gold"]
+    for layout in [_save_layout] + [l for l in SAVE_LAYOUTS if l != _save_layout]:
+        filename = _save_path(save_directory, character_name, layout)
+        if not os.path.exists(filename):
+            continue
 
-def heal_character(character, amount):
+        for other in SAVE_LAYOUTS:
+            if other == layout:
+                continue
+            other_journal = _journal_path(_save_path(save_directory, character_name, other))
+            if os.path.exists(other_journal):
+                with _journal_lock:
+                    if not os.path.exists(_journal_path(filename)):
+                        os.replace(other_journal, _journal_path(filename))
+
+        return filename
+
+    return None
+
+def _move_save_file(old_filename, new_filename):
+    """Move a save file and its journal (save file first)"""
+    directory = os.path.dirname(new_filename)
+    if not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    with _journal_lock:
+        os.replace(old_filename, new_filename)
+        if os.path.exists(_journal_path(old_filename)):
+            os.replace(_journal_path(old_filename), _journal_path(new_filename))
+
+        state = _journal_states.pop(old_filename, None)
+        if state is not None:
+            _remember_journal_state(new_filename, state)
+
+def _is_shard_directory(entry):
+    """True for a two-hex-digit directory made by the sharded layout"""
+    return (len(entry.name) == 2 and set(entry.name) <= _SHARD_CHARACTERS
+            and entry.is_dir())
+
+def migrate_save_layout(save_directory="data/save_games", layout="sharded"):
     """
-    Heal character by specified amount
-    
-    Health cannot exceed max_health
-    
-    Returns: Actual amount healed
+    Move every text save in save_directory into the given layout
+
+    New saves start using the layout straight away, and saves keep
+    loading while the move is in progress. Running it again only moves
+    what's left.
+
+    Returns: Number of save files moved
+    Raises: ValueError if layout isn't in SAVE_LAYOUTS
     """
-    # TODO: Implement healing
-    # Calculate actual healing (don't exceed max_health)
-    # Update character health
-    start = character["health"]
-    new_hp = min(start + amount, character["max_health"])
-    character["health"] = new_hp
-    return new_hp - start
+    set_save_layout(layout)
 
-def is_character_dead(character):
+    moved = 0
+    for name in _list_save_files(save_directory):
+        filename = _find_save_file(save_directory, name)
+        target = _save_path(save_directory, name, layout)
+        if filename is not None and filename != target:
+            _move_save_file(filename, target)
+            moved += 1
+
+    # names, classes and levels are unchanged; only the directory moved
+    index = _get_save_index(save_directory)
+    if index is not None:
+        index.mark_synced()
+
+    return moved
+
+# ============================================================================
+# SAVE CODECS
+# ============================================================================
+#
+# Text saves can be written compressed. Loading doesn't need to know the
+# codec: a zlib or xz header at the start of the file gives it away, and
+# anything else is read as plain text, so old saves keep working after
+# the codec changes. Journals are always plain text (see SAVE JOURNAL).
+
+SAVE_CODECS = ["text", "zlib", "lzma"]
+
+_save_codec = "text"
+
+# xz container magic; zlib streams are recognized by their 2-byte header
+_LZMA_MAGIC = b"\xfd7zXZ\x00"
+
+def set_save_codec(codec):
     """
-    Check if character's health is 0 or below
-    
-    Returns: True if dead, False if alive
+    Choose how text save files are encoded when written
+
+    Returns: The codec that was active before
+    Raises: ValueError if codec isn't in SAVE_CODECS
     """
-    # TODO: Implement death check
-    return character['health'] <= 0
+    global _save_codec
 
-def revive_character(character):
+    if codec not in SAVE_CODECS:
+        raise ValueError(f"unknown save codec: {codec}")
+
+    previous = _save_codec
+    _save_codec = codec
+    return previous
+
+def encode_save_data(text, codec=None):
     """
-    Revive a dead character with 50% health
-    
-    Returns: True if revived
+    Encode save file text with the given (or current) codec
+
+    Returns: str for the text codec, compressed bytes otherwise
     """
-    # TODO: Implement revival
-    # Restore health to half of max_health
-    half = character["max_health"] // 2
-    character["health"] = half
-    return True
+    if codec is None:
+        codec = _save_codec
+
+    if codec == "zlib":
+        return zlib.compress(text.encode("utf-8"), 6)
+    if codec == "lzma":
+        return lzma.compress(text.encode("utf-8"))
+    return text
+
+def decode_save_data(data):
+    """
+    Turn the bytes of a save file back into text, whatever its codec
+
+    Raises: SaveFileCorruptedError if the data can't be decoded
+    """
+    try:
+        if data.startswith(_LZMA_MAGIC):
+            data = lzma.decompress(data)
+        elif len(data) >= 2 and data[0] == 0x78 and (data[0] * 256 + data[1]) % 31 == 0:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+    except (lzma.LZMAError, zlib.error, UnicodeDecodeError):
+        raise SaveFileCorruptedError("could not decode save file")
 
 # ============================================================================
-# VALIDATION
+# ATOMIC SAVE FILES
 # ============================================================================
 
-def validate_character_data(character):
+# How far a save is pushed to disk before save_character returns:
+# - "none": rename only; survives a process crash, not a power loss
+# - "fsync-file": also fsync the file's data before the rename
+# - "fsync-file-and-dir": also fsync the directory so the rename itself
+#   survives a power loss
+SAVE_DURABILITY_MODES = ["none", "fsync-file", "fsync-file-and-dir"]
+
+_save_durability = "none"
+
+def set_save_durability(mode):
     """
-    Validate that character dictionary has all required fields
-    
-    Required fields: name, class, level, health, max_health, 
-                    strength, magic, experience, gold, inventory,
-                    active_quests, completed_quests
-    
-    Returns: True if valid
-    Raises: InvalidSaveDataError if missing fields or invalid types
+    Choose the durability mode used for text save files
+
+    Returns: The mode that was active before
+    Raises: ValueError if mode isn't in SAVE_DURABILITY_MODES
     """
-    # TODO: Implement validation
-    # Check all required keys exist
-    # Check that numeric values are numbers
-    # Check that lists are actually lists
-    required = [
-        "name", "class", "level", "health", "max_health",
-        "strength", "magic", "experience", "gold",
-        "inventory", "active_quests", "completed_quests"
-    ]
+    global _save_durability
 
-    for field in required:
-        if field not in character:
-            raise InvalidSaveDataError(f"missing field: {field}")
+    if mode not in SAVE_DURABILITY_MODES:
+        raise ValueError(f"unknown durability mode: {mode}")
 
-    num_fields = ["level", "health", "max_health", "strength", "magic", "experience", "gold"]
-    for n in num_fields:
-        if not isinstance(character[n], int):
-            raise InvalidSaveDataError(f"{n} must be an int")
+    previous = _save_durability
+    _save_durability = mode
+    return previous
+
+def write_file_atomic(filename, data, durability="none"):
+    """
+    Replace filename with data so readers only ever see old or new contents
+
+    data is written to a temporary file in the same directory, which is
+    then renamed over filename.
+
+    Args:
+        filename: File to create or replace
+        data: str or bytes to write
+        durability: One of SAVE_DURABILITY_MODES
+    """
+    directory = os.path.dirname(filename) or "."
+    temp_name = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    mode = "wb" if isinstance(data, bytes) else "w"
+
+    try:
+        with open(temp_name, mode) as f:
+            f.write(data)
+            if durability != "none":
+                f.flush()
+                os.fsync(f.fileno())
+
+        os.replace(temp_name, filename)
+    except BaseException:
+        try:
+            os.remove(temp_name)
+        except OSError:
+            pass
+        raise
+
+    if durability == "fsync-file-and-dir":
+        _fsync_directory(directory)
+
+def _fsync_directory(directory):
+    """Flush a directory entry to disk (not possible on Windows)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+# ============================================================================
+# SAVE JOURNAL
+# ============================================================================
+#
+# With the journal on, a save appends only the fields that changed since
+# the last save to {name}_save.journal instead of rewriting the save file:
+#
+#     GENERATION: 1700000000000000000     <- first line, matches the snapshot
+#     GOLD: 140
+#     INVENTORY_ADD: health_potion
+#     END                                 <- one group per save
+#
+# Once the journal grows past the compaction size, the next save writes a
+# fresh snapshot (the normal save file plus a GENERATION line) and starts
+# a new journal. A journal only counts if its generation matches the
+# snapshot's, so a crash between those two writes can't replay old
+# changes onto the new snapshot, and a group without its END line (a
+# save interrupted mid-append) is skipped.
+
+# Journal size in bytes that triggers a new snapshot
+JOURNAL_COMPACT_BYTES = 4096
+
+# Saves whose journal state is kept; the least recently used are dropped
+# (their next save writes a snapshot instead of appending)
+JOURNAL_STATE_LIMIT = 256
+
+_journal_enabled = False
+_journal_compact_bytes = JOURNAL_COMPACT_BYTES
+
+# save filename -> {"generation", "size", "record"} for saves this
+# process has recently written or loaded; the record is what the journal
+# diffs against (see _journal_record), not the whole character
+_journal_states = OrderedDict()
+_journal_lock = threading.Lock()
+
+# Fields written as "KEY: value" when they change
+_JOURNAL_FIELDS = [
+    "name", "class", "level", "health", "max_health", "strength", "magic",
+    "experience", "gold", "active_quests", "completed_quests"
+]
+
+def set_save_journal(enabled, compact_bytes=JOURNAL_COMPACT_BYTES):
+    """
+    Turn the append-only save journal on or off for text saves
+
+    Args:
+        enabled: True to journal saves, False to rewrite the file each time
+        compact_bytes: Journal size that triggers a new snapshot
+
+    Returns: True if the journal was on before
+    """
+    global _journal_enabled, _journal_compact_bytes
+
+    previous = _journal_enabled
+    _journal_enabled = enabled
+    _journal_compact_bytes = compact_bytes
+
+    with _journal_lock:
+        _journal_states.clear()
+
+    return previous
+
+def _journal_path(filename):
+    """{name}_save.txt -> {name}_save.journal"""
+    return filename[:-len(".txt")] + ".journal"
+
+def _save_with_journal(character, filename):
+    """Append a character's changed fields, or write a new snapshot"""
+    current = _journal_record(character)
+
+    with _journal_lock:
+        state = _journal_states.get(filename)
+
+        # nothing to diff against yet, or the journal is due for compaction
+        if state is None or state["size"] >= _journal_compact_bytes:
+            _write_journal_snapshot(character, current, filename)
+            return
+
+        _journal_states.move_to_end(filename)
+        changes = _journal_changes(state["record"], current)
+        if len(changes) == 0:
+            return
+
+        data = "\n".join(changes) + "\nEND\n"
+        try:
+            with open(_journal_path(filename), "a") as f:
+                f.write(data)
+                if _save_durability != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+        except:
+            # the journal may end in a partial group now; start over with
+            # a snapshot next time instead of appending after it
+            del _journal_states[filename]
+            raise
+
+        state["size"] += len(data)
+        state["record"] = current
+
+def _write_journal_snapshot(character, record, filename):
+    """Write a full snapshot and start an empty journal of a new generation"""
+    generation = str(time.time_ns())
+    header = f"GENERATION: {generation}\n"
+
+    # snapshot first: until the new journal exists, the old one no longer
+    # matches and is ignored
+    write_file_atomic(filename, encode_save_data(header + format_save_data(character)),
+                      _save_durability)
+    write_file_atomic(_journal_path(filename), header, _save_durability)
+
+    _remember_journal_state(filename, {
+        "generation": generation,
+        "size": len(header),
+        "record": record
+    })
+
+def _remember_journal_state(filename, state):
+    """Keep a save's journal state, dropping the least recently used (lock held)"""
+    _journal_states[filename] = state
+    _journal_states.move_to_end(filename)
+    while len(_journal_states) > JOURNAL_STATE_LIMIT:
+        _journal_states.popitem(last=False)
+
+def _journal_record(character):
+    """
+    What the journal diffs a character against: a tuple of its
+    _JOURNAL_FIELDS values (lists as tuples) and its item counts
+    """
+    values = []
+    for key in _JOURNAL_FIELDS:
+        value = character[key]
+        values.append(tuple(value) if isinstance(value, list) else value)
+    return tuple(values), get_item_counts(character["inventory"])
+
+def _journal_changes(old, new):
+    """Journal lines that turn the old journal record into the new one"""
+    changes = []
+    old_values, old_counts = old
+    new_values, new_counts = new
+
+    for key, old_value, value in zip(_JOURNAL_FIELDS, old_values, new_values):
+        if old_value != value:
+            if isinstance(value, tuple):
+                value = ",".join(value)
+            changes.append(f"{key.upper()}: {value}")
+
+    # the inventory is journaled as item additions and removals
+    counts = dict(new_counts)
+    for item_id, count in old_counts.items():
+        counts[item_id] = counts.get(item_id, 0) - count
+
+    for item_id, count in counts.items():
+        if count > 0:
+            changes.extend([f"INVENTORY_ADD: {item_id}"] * count)
+        elif count < 0:
+            changes.extend([f"INVENTORY_REMOVE: {item_id}"] * -count)
+
+    return changes
+
+def _apply_save_journal(character, filename, generation):
+    """
+    Replay a snapshot's journal onto the loaded character dictionary
+
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    journal_name = _journal_path(filename)
+    size = 0
+
+    if os.path.exists(journal_name):
+        try:
+            with open(journal_name, "r") as f:
+                lines = f.readlines()
+        except:
+            raise SaveFileCorruptedError("could not read save journal")
+
+        if len(lines) > 0 and lines[0].strip() == f"GENERATION: {generation}":
+            group = []
+            for line in lines[1:]:
+                size += len(line)
+                if line.strip() == "END":
+                    for change in group:
+                        _apply_journal_line(character, change)
+                    group = []
+                else:
+                    group.append(line)
+
+            size += len(lines[0])
+            validate_character_data(character)
+
+            if len(group) > 0:
+                # unfinished last group: don't append after it
+                size = 0
+
+    if _journal_enabled:
+        # later saves in this process can append to this journal
+        with _journal_lock:
+            if size > 0:
+                _remember_journal_state(filename, {
+                    "generation": generation,
+                    "size": size,
+                    "record": _journal_record(character)
+                })
+
+def _apply_journal_line(character, line):
+    """Apply one journal line to a character dictionary"""
+    key, value = _parse_save_line(line)
+
+    if key == "inventory_add":
+        character["inventory"].append(value)
+    elif key == "inventory_remove":
+        if value not in character["inventory"]:
+            raise InvalidSaveDataError(f"journal removes missing item: {value}")
+        character["inventory"].remove(value)
+    else:
+        character[key] = value
+
+def _forget_save_journal(filename):
+    """Delete a save's journal and any cached journal state"""
+    with _journal_lock:
+        _journal_states.pop(filename, None)
+
+    if os.path.exists(_journal_path(filename)):
+        os.remove(_journal_path(filename))
+
+# ============================================================================
+# SAVE INDEX
+# ============================================================================
+#
+# Each text save directory gets a save_index.txt the first time its saves
+# are listed. It's an append-only log that save_character and
+# delete_character add to, so listing never has to open every save file:
+#
+#     SET<TAB>name<TAB>class<TAB>level<TAB>modified_ns
+#     DEL<TAB>name
+#     SYNC<TAB>directory_mtime_ns         <- after every change
+#
+# The SYNC line records the directory's mtime once the index has caught
+# up with it. If the directory has changed since (a save file copied in
+# or removed by hand), the index is rebuilt from a scan. Changes other
+# processes log are picked up by reading the log past the last offset
+# read. The log is rewritten once it holds many more lines than entries.
+#
+# The log only spares the next process a scan. If the directory can't be
+# written to (read-only media, another user's saves), the index lives in
+# memory instead: it is still rescanned when the directory's mtime
+# changes, and the log is written in full once writing works again.
+
+SAVE_INDEX_FILENAME = "save_index.txt"
+
+# Compact once the log has this many lines per entry (and at least 64)
+SAVE_INDEX_COMPACT_RATIO = 4
+
+# abspath of a save directory -> its SaveIndex
+_save_indexes = {}
+_save_indexes_lock = threading.Lock()
+
+class SaveIndex:
+    """
+    Sorted index of the text saves in one directory
+
+    Keeps every save's name, class, level and last-modified time in
+    memory, with the names kept sorted overall, by level and by class,
+    so a page of results is a slice. Saves that can't be read are still
+    listed, with class and level set to None. Safe to share between
+    threads.
+    """
+
+    def __init__(self, save_directory):
+        self.save_directory = save_directory
+        self.path = os.path.join(save_directory, SAVE_INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._clear()
+
+        with self._lock:
+            if not self._read_log() or self._synced_mtime != self._directory_mtime():
+                self._rescan()
+
+    def _clear(self):
+        """Forget every entry"""
+        self.entries = {}
+        self._names = []
+        self._by_level = []
+        self._by_class = {}
+        self._log_lines = 0
+        self._offset = 0
+        self._inode = None
+        self._synced_mtime = None
+        # False while the log is behind the entries in memory
+        self._logged = True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def names(self):
+        """Every indexed character name, sorted"""
+        with self._lock:
+            self._refresh()
+            return list(self._names)
+
+    def page(self, page=0, page_size=10, character_class=None, min_level=None, max_level=None):
+        """
+        One page of index entries, optionally filtered
+
+        Pages are in name order, or in level order (then name) when a
+        level range is given.
+
+        Args:
+            page: Page number, starting at 0
+            page_size: Entries per page
+            character_class: Only saves of this class
+            min_level, max_level: Only saves in this level range (inclusive)
+
+        Returns: Tuple of (list of entry dictionaries, total matching count)
+        """
+        with self._lock:
+            self._refresh()
+
+            if min_level is None and max_level is None:
+                if character_class is None:
+                    names = self._names
+                else:
+                    names = self._by_class.get(character_class, {"names": []})["names"]
+                start, stop = 0, len(names)
+            else:
+                if character_class is None:
+                    names = self._by_level
+                else:
+                    names = self._by_class.get(character_class, {"levels": []})["levels"]
+                start = 0 if min_level is None else bisect.bisect_left(names, (min_level, ""))
+                stop = len(names) if max_level is None else bisect.bisect_left(names, (max_level + 1, ""))
+
+            first = start + page * page_size
+            last = min(stop, first + page_size)
+            selected = names[first:last] if first < stop else []
+            if len(selected) > 0 and isinstance(selected[0], tuple):
+                selected = [name for level, name in selected]
+
+            return [dict(self.entries[name]) for name in selected], max(0, stop - start)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def record_save(self, character, modified_ns=None):
+        """Add or update a character's entry after it has been saved"""
+        if modified_ns is None:
+            modified_ns = time.time_ns()
+        entry = {
+            "name": character["name"],
+            "class": character["class"],
+            "level": character["level"],
+            "modified": modified_ns / 1e9
+        }
+
+        with self._lock:
+            self._refresh(check_directory=False)
+            self._set(entry)
+            self._append([
+                f"SET\t{entry['name']}\t{entry['class']}\t{entry['level']}\t{modified_ns}"
+            ])
+
+    def record_delete(self, character_name):
+        """Drop a character's entry after its save has been deleted"""
+        with self._lock:
+            self._refresh(check_directory=False)
+            self._remove(character_name)
+            self._append([f"DEL\t{character_name}"])
+
+    def mark_synced(self):
+        """Record that the directory changed without any entry changing"""
+        with self._lock:
+            self._refresh(check_directory=False)
+            self._append_sync()
+
+    def rebuild(self):
+        """Rescan the directory and rewrite the index from scratch"""
+        with self._lock:
+            self._rescan()
+
+    # ------------------------------------------------------------------
+    # In-memory entries
+    # ------------------------------------------------------------------
+
+    def _set(self, entry):
+        """Insert or replace one entry in the sorted lists"""
+        name = entry["name"]
+        self._remove(name)
+        self.entries[name] = entry
+        bisect.insort(self._names, name)
+
+        if entry["level"] is not None:
+            bisect.insort(self._by_level, (entry["level"], name))
+        if entry["class"] is not None:
+            by_class = self._by_class.setdefault(entry["class"], {"names": [], "levels": []})
+            bisect.insort(by_class["names"], name)
+            if entry["level"] is not None:
+                bisect.insort(by_class["levels"], (entry["level"], name))
+
+    def _remove(self, name):
+        """Take one entry out of the sorted lists, if it's there"""
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return
+
+        _remove_sorted(self._names, name)
+        if entry["level"] is not None:
+            _remove_sorted(self._by_level, (entry["level"], name))
+        if entry["class"] is not None:
+            by_class = self._by_class[entry["class"]]
+            _remove_sorted(by_class["names"], name)
+            if entry["level"] is not None:
+                _remove_sorted(by_class["levels"], (entry["level"], name))
+
+    # ------------------------------------------------------------------
+    # Log file
+    # ------------------------------------------------------------------
+
+    def _refresh(self, check_directory=True):
+        """
+        Catch up with the log, and with the directory unless a save or
+        delete of our own is about to be recorded (lock held)
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            if self._logged or (check_directory and self._synced_mtime != self._directory_mtime()):
+                self._rescan()
+            return
+
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            # rewritten by another process
+            self._clear()
+            self._read_log()
+        elif stat.st_size > self._offset:
+            self._read_log()
+
+        if check_directory and self._synced_mtime != self._directory_mtime():
+            self._rescan()
+
+    def _rescan(self):
+        """Rebuild the entries and the log from the save files (lock held)"""
+        self._clear()
+        for name in _list_save_files(self.save_directory):
+            self._set(_scan_save_entry(name, self.save_directory))
+        self._write_log()
+
+    def _read_log(self):
+        """
+        Apply log lines past the last offset read
+
+        Returns: False if there is no log file
+        """
+        try:
+            with open(self.path, "rb") as f:
+                self._inode = os.fstat(f.fileno()).st_ino
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return False
+
+        # only whole lines; a line still being written is read next time
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+
+        for line in data[:end].decode("utf-8", "replace").splitlines():
+            self._log_lines += 1
+            self._apply_log_line(line.split("\t"))
+
+        return True
+
+    def _apply_log_line(self, fields):
+        """Apply one parsed log line; unrecognized lines are skipped"""
+        if fields[0] == "SET" and len(fields) == 5:
+            try:
+                level = None if fields[3] == "None" else int(fields[3])
+                modified = int(fields[4]) / 1e9
+            except ValueError:
+                return
+            self._set({
+                "name": fields[1],
+                "class": None if fields[2] == "None" else fields[2],
+                "level": level,
+                "modified": modified
+            })
+        elif fields[0] == "DEL" and len(fields) == 2:
+            self._remove(fields[1])
+        elif fields[0] == "SYNC" and len(fields) == 2 and fields[1].isdigit():
+            self._synced_mtime = int(fields[1])
+
+    def _append(self, lines):
+        """Append changes plus a SYNC line, compacting the log if it's due"""
+        if not self._logged or \
+                self._log_lines + len(lines) > max(64, SAVE_INDEX_COMPACT_RATIO * len(self.entries)):
+            self._write_log()
+            return
+
+        self._synced_mtime = self._directory_mtime()
+        lines = lines + [f"SYNC\t{self._synced_mtime}"]
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+
+        try:
+            with open(self.path, "ab") as f:
+                f.write(data)
+                if _save_durability != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._inode = os.fstat(f.fileno()).st_ino
+        except OSError:
+            self._keep_in_memory()
+            return
+
+        self._offset += len(data)
+        self._log_lines += len(lines)
+
+    def _write_log(self):
+        """Replace the log with one SET line per entry, if the directory is writable"""
+        if not os.access(self.save_directory, os.W_OK):
+            self._keep_in_memory()
+            return
+
+        lines = []
+        for name in self._names:
+            entry = self.entries[name]
+            modified_ns = int(entry["modified"] * 1e9)
+            lines.append(f"SET\t{name}\t{entry['class']}\t{entry['level']}\t{modified_ns}")
+
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+        try:
+            write_file_atomic(self.path, data, _save_durability)
+            self._inode = os.stat(self.path).st_ino
+        except OSError:
+            self._keep_in_memory()
+            return
+
+        self._logged = True
+        self._offset = len(data)
+        self._log_lines = len(lines)
+        # the rename changed the directory, so SYNC goes on afterwards
+        self._append_sync()
+
+    def _append_sync(self):
+        """Record that the index is up to date with the directory"""
+        if not self._logged:
+            self._write_log()
+            return
+
+        self._synced_mtime = self._directory_mtime()
+        data = f"SYNC\t{self._synced_mtime}\n".encode("utf-8")
+
+        try:
+            with open(self.path, "ab") as f:
+                f.write(data)
+        except OSError:
+            self._keep_in_memory()
+            return
+
+        self._offset += len(data)
+        self._log_lines += 1
+
+    def _keep_in_memory(self):
+        """
+        Carry on from the entries in memory after the log couldn't be
+        written (lock held)
+
+        The entries are up to date with the directory as it is now. A log
+        file that is already there is left alone, and only read again if
+        another process changes it.
+        """
+        self._logged = False
+        self._synced_mtime = self._directory_mtime()
+        try:
+            stat = os.stat(self.path)
+            self._inode = stat.st_ino
+            self._offset = stat.st_size
+        except OSError:
+            self._inode = None
+            self._offset = 0
+
+    def _directory_mtime(self):
+        """The save directory's mtime in nanoseconds (None if it's gone)"""
+        try:
+            return os.stat(self.save_directory).st_mtime_ns
+        except OSError:
+            return None
+
+def _remove_sorted(values, value):
+    """Remove value from a sorted list by binary search"""
+    i = bisect.bisect_left(values, value)
+    if i < len(values) and values[i] == value:
+        del values[i]
+
+def _scan_save_entry(name, save_directory):
+    """Build an index entry by reading a save file (and its journal)"""
+    filename = _find_save_file(save_directory, name) or _save_path(save_directory, name)
+    modified_ns = 0
+    for path in [filename, _journal_path(filename)]:
+        try:
+            modified_ns = max(modified_ns, os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
+
+    try:
+        character = _load_text_save(name, save_directory)
+        character_class = character["class"]
+        level = character["level"]
+    except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+        character_class = None
+        level = None
+
+    return {"name": name, "class": character_class, "level": level, "modified": modified_ns / 1e9}
+
+def _get_save_index(save_directory, create=False):
+    """
+    The SaveIndex for a save directory
+
+    Args:
+        save_directory: Directory of text saves
+        create: Build the index if the directory doesn't have one yet
+
+    Returns: SaveIndex, or None if there isn't one and create is False
+    """
+    key = os.path.abspath(save_directory)
+
+    with _save_indexes_lock:
+        index = _save_indexes.get(key)
+        if index is None:
+            if not create and not os.path.exists(os.path.join(save_directory, SAVE_INDEX_FILENAME)):
+                return None
+            index = SaveIndex(save_directory)
+            _save_indexes[key] = index
+
+    return index
+
+def rebuild_save_index(save_directory="data/save_games"):
+    """
+    Rebuild a directory's save index by scanning its save files
+
+    Returns: Number of saves indexed
+    """
+    if not os.path.exists(save_directory):
+        os.makedirs(save_directory)
+
+    index = _get_save_index(save_directory, create=True)
+    index.rebuild()
+    return len(index.entries)
+
+def list_saved_characters_page(page=0, page_size=10, character_class=None, min_level=None,
+                               max_level=None, save_directory="data/save_games"):
+    """
+    Get one page of saved characters with their class, level and save time
+
+    Text saves are read from the directory's save index. With a save
+    backend set, the backend's list_saved_characters_page is used if it
+    has one; otherwise its names are paged with class and level unknown.
+
+    Args:
+        page: Page number, starting at 0
+        page_size: Characters per page
+        character_class: Only characters of this class
+        min_level, max_level: Only characters in this level range
+        save_directory: Directory containing save files
+
+    Returns: Dictionary with 'characters' (list of dictionaries with
+             name, class, level and modified) and 'total' (matching count)
+    """
+    if _save_backend is not None:
+        if hasattr(_save_backend, "list_saved_characters_page"):
+            characters, total = _save_backend.list_saved_characters_page(
+                page, page_size, character_class, min_level, max_level
+            )
+        else:
+            names = _save_backend.list_saved_characters()
+            total = len(names)
+            characters = [
+                {"name": name, "class": None, "level": None, "modified": None}
+                for name in names[page * page_size:(page + 1) * page_size]
+            ]
+        return {"characters": characters, "total": total}
+
+    if not os.path.exists(save_directory):
+        return {"characters": [], "total": 0}
+
+    index = _get_save_index(save_directory, create=True)
+    characters, total = index.page(page, page_size, character_class, min_level, max_level)
+    return {"characters": characters, "total": total}
+
+def _index_save(character, save_directory):
+    """Record a save in the directory's index, if it has one"""
+    index = _get_save_index(save_directory)
+    if index is not None:
+        index.record_save(character)
+
+def _index_delete(character_name, save_directory):
+    """Record a deleted save in the directory's index, if it has one"""
+    index = _get_save_index(save_directory)
+    if index is not None:
+        index.record_delete(character_name)
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+#
+# With a CharacterCache set, load_character keeps recently loaded text
+# saves in memory. An entry is only used while the save file's (and its
+# journal's) mtime and size are unchanged, so edits from another process
+# are still picked up; save_character and delete_character also drop the
+# entry directly. Saves in a save backend are not cached.
+
+# Cache used by load_character. None means every load reads the file.
+_character_cache = None
+
+# Marks a key deleted from a CharacterView
+_DELETED = object()
+
+def set_character_cache(cache):
+    """
+    Put a cache in front of load_character
+
+    Args:
+        cache: CharacterCache, or None to read every load from disk
+
+    Returns: The cache that was active before
+    """
+    global _character_cache
+    previous = _character_cache
+    _character_cache = cache
+    return previous
+
+def get_character_cache():
+    """Return the active character cache (None means no caching)"""
+    return _character_cache
+
+class CharacterCache:
+    """
+    Bounded LRU cache of loaded characters
+
+    Callers never get the cached Character itself: they get a copy, or
+    with copy_on_write a CharacterView that only copies what gets changed.
+    Either way, changing what load_character returned can't change what
+    the next caller gets. hits and misses count lookups. Safe to share
+    between threads.
+    """
+
+    def __init__(self, max_entries=128, copy_on_write=False):
+        self.max_entries = max_entries
+        self.copy_on_write = copy_on_write
+        self.hits = 0
+        self.misses = 0
+        # (save directory, name) -> (filename, stamp, Character)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, character_name, save_directory):
+        """
+        Load a character, from the cache if its save hasn't changed
+
+        Returns: Copy of the character, or a CharacterView
+        Raises: CharacterNotFoundError, SaveFileCorruptedError,
+                InvalidSaveDataError
+        """
+        key = (os.path.abspath(save_directory), character_name)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None and _save_stamp(entry[0]) == entry[1]:
+            with self._lock:
+                self.hits += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            return self._hand_out(entry[2])
+
+        filename = _find_save_file(save_directory, character_name)
+        if filename is None:
+            self.invalidate(character_name, save_directory)
+            raise CharacterNotFoundError(f"no save file for: {character_name}")
+
+        # stamped before reading: a save that lands mid-read makes the
+        # stamp stale, so the next load reads the file again
+        stamp = _save_stamp(filename)
+        character = Character.from_dict(_load_text_save(character_name, save_directory))
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (filename, stamp, character)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return self._hand_out(character)
+
+    def invalidate(self, character_name, save_directory):
+        """Drop a character's entry (after it has been saved or deleted)"""
+        with self._lock:
+            self._entries.pop((os.path.abspath(save_directory), character_name), None)
+
+    def clear(self):
+        """Drop every entry and reset the hit/miss counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _hand_out(self, character):
+        """What a caller gets back for a cached character"""
+        if self.copy_on_write:
+            return CharacterView(character)
+        return _snapshot_character(character)
+
+def _save_stamp(filename):
+    """(mtime, size) of a save file and its journal, or None if it's gone"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+
+    try:
+        journal = os.stat(_journal_path(filename))
+        journal_stamp = (journal.st_mtime_ns, journal.st_size)
+    except OSError:
+        journal_stamp = None
+
+    return (stat.st_mtime_ns, stat.st_size, journal_stamp)
+
+def _uncache_character(character_name, save_directory):
+    """Drop a character from the active cache, if there is one"""
+    if _character_cache is not None:
+        _character_cache.invalidate(character_name, save_directory)
+
+class CharacterView(MutableMapping):
+    """
+    Copy-on-write view of a cached Character
+
+    Reads come from the shared Character until a key is set or deleted,
+    which only changes the view. Containers (inventory and quest lists)
+    are copied the first time they are read, so in-place changes like
+    view["inventory"].append(item) stay in the view too.
+    """
+
+    __slots__ = ("_base", "_own")
+
+    def __init__(self, base):
+        self._base = base
+        self._own = {}
+
+    def __getitem__(self, key):
+        if key in self._own:
+            value = self._own[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+
+        value = self._base[key]
+        if hasattr(value, "copy"):
+            value = value.copy()
+            self._own[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._own[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._own[key] = _DELETED
+
+    def __contains__(self, key):
+        if key in self._own:
+            return self._own[key] is not _DELETED
+        return key in self._base
+
+    def __iter__(self):
+        for key in self._base:
+            if self._own.get(key) is not _DELETED:
+                yield key
+        for key, value in list(self._own.items()):
+            if value is not _DELETED and key not in self._base:
+                yield key
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def copy(self):
+        """Independent Character with the view's current contents"""
+        return _snapshot_character(self)
+
+    def to_dict(self):
+        """Return the character as a plain dictionary"""
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"CharacterView({self.to_dict()!r})"
+
+# ============================================================================
+# SAVE BACKENDS
+# ============================================================================
+
+# Backend used by save_character / load_character / list_saved_characters /
+# delete_character. None means text files in save_directory.
+_save_backend = None
+
+def set_save_backend(backend):
+    """
+    Choose where characters are saved
+
+    Args:
+        backend: Object with save_character(character),
+                 load_character(name), list_saved_characters() and
+                 delete_character(name) methods (e.g. SQLiteSaveBackend),
+                 or None to go back to text save files
+
+    Returns: The backend that was active before
+    """
+    global _save_backend
+    previous = _save_backend
+    _save_backend = backend
+    return previous
+
+def get_save_backend():
+    """Return the active save backend (None means text save files)"""
+    return _save_backend
+
+class SQLiteSaveBackend:
+    """
+    Save backend that keeps every character in one SQLite database file
+
+    Characters are stored one row each, keyed (and indexed) by name, with
+    the same text as a save file in the data column. The database runs in
+    WAL mode so lookups aren't blocked by a save in progress. Safe to share
+    between threads.
+
+    Raises (when created): SaveFileCorruptedError if the file isn't a
+                           usable database
+    """
+
+    def __init__(self, db_path="data/save_games.db"):
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        try:
+            self._connection = sqlite3.connect(db_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS saves ("
+                " name TEXT PRIMARY KEY,"
+                " class TEXT NOT NULL,"
+                " level INTEGER NOT NULL,"
+                " data TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._connection.commit()
+        except sqlite3.DatabaseError:
+            raise SaveFileCorruptedError(f"could not open save database: {db_path}")
+
+    def save_character(self, character):
+        """Insert or replace a character's row; returns True"""
+        data = format_save_data(character)
+
+        with self._lock:
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO saves (name, class, level, data, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (character["name"], character["class"], character["level"], data, time.time())
+                )
+                self._connection.commit()
+            except sqlite3.DatabaseError:
+                raise IOError("error saving character to database")
+
+        return True
+
+    def load_character(self, character_name):
+        """
+        Load a character by name
+
+        Raises: CharacterNotFoundError, SaveFileCorruptedError,
+                InvalidSaveDataError
+        """
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT data FROM saves WHERE name = ?", (character_name,)
+                ).fetchone()
+            except sqlite3.DatabaseError:
+                raise SaveFileCorruptedError("could not read save database")
+
+        if row is None:
+            raise CharacterNotFoundError(f"no save file for: {character_name}")
+
+        return Character.from_dict(parse_save_data(row[0].split("\n")))
+
+    def list_saved_characters(self):
+        """Return every saved character name, sorted"""
+        with self._lock:
+            rows = self._connection.execute("SELECT name FROM saves ORDER BY name").fetchall()
+        return [row[0] for row in rows]
+
+    def list_saved_characters_page(self, page=0, page_size=10, character_class=None,
+                                   min_level=None, max_level=None):
+        """
+        One page of saved characters, filtered like SaveIndex.page
+
+        Returns: Tuple of (list of dictionaries with name, class, level
+                 and modified, total matching count)
+        """
+        conditions = []
+        params = []
+        if character_class is not None:
+            conditions.append("class = ?")
+            params.append(character_class)
+        if min_level is not None:
+            conditions.append("level >= ?")
+            params.append(min_level)
+        if max_level is not None:
+            conditions.append("level <= ?")
+            params.append(max_level)
+
+        where = " WHERE " + " AND ".join(conditions) if len(conditions) > 0 else ""
+        if min_level is None and max_level is None:
+            order = " ORDER BY name"
+        else:
+            order = " ORDER BY level, name"
+
+        with self._lock:
+            total = self._connection.execute(
+                "SELECT COUNT(*) FROM saves" + where, params
+            ).fetchone()[0]
+            rows = self._connection.execute(
+                "SELECT name, class, level, updated_at FROM saves" + where + order
+                + " LIMIT ? OFFSET ?", params + [page_size, page * page_size]
+            ).fetchall()
+
+        characters = [
+            {"name": row[0], "class": row[1], "level": row[2], "modified": row[3]}
+            for row in rows
+        ]
+        return characters, total
+
+    def delete_character(self, character_name):
+        """
+        Delete a character's row; returns True
+
+        Raises: CharacterNotFoundError if there is no such character
+        """
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM saves WHERE name = ?", (character_name,))
+            self._connection.commit()
+
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"no save file for: {character_name}")
+        return True
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+def migrate_text_saves_to_sqlite(save_directory="data/save_games", db_path="data/save_games.db",
+                                 delete_text_files=False):
+    """
+    Copy every text save file in save_directory into a SQLite database
+
+    Files that can't be read or parsed are left alone and reported.
+    Running it again is safe; characters already in the database are
+    overwritten with the text file's contents.
+
+    Args:
+        save_directory: Directory of {name}_save.txt files
+        db_path: SQLite database to create or add to
+        delete_text_files: Remove each text file once it has been copied
+
+    Returns: Dictionary with 'migrated' (count) and 'failed' (list of names)
+    """
+    backend = SQLiteSaveBackend(db_path)
+    migrated = 0
+    failed = []
+
+    try:
+        for name in _list_save_files(save_directory):
+            try:
+                character = _load_text_save(name, save_directory)
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+                failed.append(name)
+                continue
+
+            backend.save_character(character)
+            migrated += 1
+
+            if delete_text_files:
+                filename = _find_save_file(save_directory, name)
+                os.remove(filename)
+                _forget_save_journal(filename)
+                _index_delete(name, save_directory)
+    finally:
+        backend.close()
+
+    return {"migrated": migrated, "failed": failed}
+
+# ============================================================================
+# SAVE ARCHIVES
+# ============================================================================
+#
+# export_saves streams every save into one tar archive (gzipped by
+# default) with a plain-text {name}_save.txt member per character, so
+# backing up is one sequential file instead of thousands of small ones.
+# import_saves streams it back in batches, so memory use stays bounded
+# by the batch size whatever the archive's size.
+
+# Members larger than this aren't save files and are reported as failed
+MAX_ARCHIVED_SAVE_BYTES = 1024 * 1024
+
+def export_saves(archive_path, save_directory="data/save_games", compression="gz"):
+    """
+    Write every saved character to a tar archive
+
+    Characters are read one at a time through load_character, so this
+    works for text saves (in any layout or codec) and for save backends.
+    Saves that can't be loaded are skipped and reported.
+
+    Args:
+        archive_path: Archive file to create
+        save_directory: Directory containing save files
+        compression: "gz", "bz2", "xz" or "" for an uncompressed tar
+
+    Returns: Dictionary with 'exported' (count) and 'failed' (list of names)
+    """
+    exported = 0
+    failed = []
+    mode = f"w|{compression}" if compression else "w|"
+
+    with tarfile.open(archive_path, mode) as archive:
+        for name in list_saved_characters(save_directory):
+            try:
+                character = load_character(name, save_directory)
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+                failed.append(name)
+                continue
+
+            data = format_save_data(character).encode("utf-8")
+            info = tarfile.TarInfo(f"{name}_save.txt")
+            info.size = len(data)
+            info.mtime = int(time.time())
+            archive.addfile(info, io.BytesIO(data))
+            exported += 1
+
+    return {"exported": exported, "failed": failed}
+
+def import_saves(archive_path, save_directory="data/save_games", workers=1, batch_size=256):
+    """
+    Save every character in an archive made by export_saves
+
+    Members are read in batches of batch_size. With workers > 1 each batch
+    is parsed and validated in a process pool while the previous batch is
+    being saved. Characters are saved with save_character, so the active
+    save backend, layout and codec apply, and existing saves with the same
+    name are replaced. Members that aren't valid saves are reported.
+
+    Args:
+        archive_path: Archive to read (any tar compression)
+        save_directory: Directory to save into
+        workers: Processes used to parse records (1 parses in-process)
+        batch_size: Records read from the archive at a time
+
+    Returns: Dictionary with 'imported' (count) and 'failed' (list of
+             member names)
+    Raises: SaveFileCorruptedError if the archive itself can't be read
+    """
+    result = {"imported": 0, "failed": []}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending = None
+
+    try:
+        with tarfile.open(archive_path, "r|*") as archive:
+            for batch in _iter_archive_batches(archive, batch_size, result["failed"]):
+                if pool is None:
+                    _save_archived_batch(_parse_archived_saves(batch), save_directory, result)
+                    continue
+
+                # parse this batch while the previous one is saved
+                future = pool.submit(_parse_archived_saves, batch)
+                if pending is not None:
+                    _save_archived_batch(pending.result(), save_directory, result)
+                pending = future
+
+        if pending is not None:
+            _save_archived_batch(pending.result(), save_directory, result)
+    except (tarfile.TarError, EOFError, zlib.error, lzma.LZMAError) as e:
+        raise SaveFileCorruptedError(f"could not read save archive: {e}")
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return result
+
+def _iter_archive_batches(archive, batch_size, failed):
+    """Yield lists of (member name, data) read from a streamed archive"""
+    batch = []
+
+    for member in archive:
+        if not member.isfile():
+            continue
+        if member.size > MAX_ARCHIVED_SAVE_BYTES:
+            failed.append(member.name)
+            continue
+
+        batch.append((member.name, archive.extractfile(member).read()))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if len(batch) > 0:
+        yield batch
+
+def _parse_archived_saves(batch):
+    """
+    Parse and validate a batch of archive members (runs in a worker)
+
+    Returns: List of (member name, character dictionary or None)
+    """
+    parsed = []
+
+    for member_name, data in batch:
+        name = os.path.basename(member_name)[:-len("_save.txt")]
+        try:
+            if not member_name.endswith("_save.txt"):
+                raise InvalidSaveDataError("not a save file")
+            character = parse_save_data(decode_save_data(data).splitlines(keepends=True))
+            # the name becomes a file name, so it must match the member's
+            if character["name"] != name or name in ["", ".", ".."]:
+                raise InvalidSaveDataError("name doesn't match the archive member")
+            character.pop("generation", None)
+        except (SaveFileCorruptedError, InvalidSaveDataError):
+            character = None
+        parsed.append((member_name, character))
+
+    return parsed
+
+def _save_archived_batch(parsed, save_directory, result):
+    """Save a parsed batch, counting what was imported and what failed"""
+    for member_name, character in parsed:
+        if character is None:
+            result["failed"].append(member_name)
+            continue
+
+        save_character(Character.from_dict(character), save_directory)
+        result["imported"] += 1
+
+# ============================================================================
+# WRITE-BEHIND SAVES
+# ============================================================================
+
+class SaveQueue:
+    """
+    Write-behind queue in front of save_character
+
+    save() only records a snapshot of the character. Saves of the same
+    character made within `window` seconds of its first queued save are
+    coalesced into one write of the latest snapshot. A background thread
+    writes due saves in batches of up to batch_size. Call flush() when the
+    data must be on disk (quitting, character death) and close() when done.
+
+    If a background write fails, the snapshot stays queued (unless a newer
+    one replaced it) and the error is kept in last_error; flush() raises it.
+    """
+
+    def __init__(self, save_directory="data/save_games", window=1.0, batch_size=64):
+        self.save_directory = save_directory
+        self.window = window
+        self.batch_size = batch_size
+        self.last_error = None
+        self.writes = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def save(self, character):
+        """
+        Queue a save of the character's current state
+
+        Returns: True (the write happens later)
+        """
+        snapshot = _snapshot_character(character)
+
+        with self._lock:
+            if snapshot["name"] in self._pending:
+                # keep the original deadline so a busy character still
+                # gets written once per window
+                queued_at = self._pending[snapshot["name"]][0]
+            else:
+                queued_at = time.monotonic()
+            self._pending[snapshot["name"]] = (queued_at, snapshot)
+
+        return True
+
+    def pending_count(self):
+        """Number of characters waiting to be written"""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Write every queued save now
+
+        Returns: Number of characters written
+        Raises: The first error hit while writing (the rest are still tried)
+        """
+        written, error = self._write_due(float("inf"))
+        if error is not None:
+            raise error
+        return written
+
+    def close(self):
+        """Stop the background thread and write anything still queued"""
+        self._stop_event.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(self.window / 2):
+            written, error = self._write_due(time.monotonic() - self.window)
+            if error is not None:
+                self.last_error = error
+
+    def _write_due(self, cutoff):
+        """Write queued saves that were first queued at or before cutoff"""
+        written = 0
+        first_error = None
+
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = []
+                    for name, (queued_at, snapshot) in self._pending.items():
+                        if queued_at <= cutoff:
+                            batch.append((name, queued_at, snapshot))
+                            if len(batch) >= self.batch_size:
+                                break
+                    for name, queued_at, snapshot in batch:
+                        del self._pending[name]
+
+                if len(batch) == 0:
+                    break
+
+                for name, queued_at, snapshot in batch:
+                    try:
+                        save_character(snapshot, self.save_directory)
+                        written += 1
+                    except Exception as e:
+                        if first_error is None:
+                            first_error = e
+                        with self._lock:
+                            self._pending.setdefault(name, (queued_at, snapshot))
+
+                if first_error is not None:
+                    # don't spin on a failing disk; the next flush retries
+                    break
+
+            self.writes += written
+
+        return written, first_error
+
+def _snapshot_character(character):
+    """Copy a character so later changes don't alter a queued save"""
+    snapshot = Character.from_dict(character)
+    for key in ["inventory", "active_quests", "completed_quests"]:
+        snapshot[key] = character[key].copy()
+    return snapshot
+
+# ============================================================================
+# CHARACTER OPERATIONS
+# ============================================================================
+
+def gain_experience(character, xp_amount):
+    """
+    Add experience to character and handle level ups
+    
+    Level up formula: level_up_xp = current_level * 100
+    Example when leveling up:
+    - Increase level by 1
+    - Increase max_health by 10
+    - Increase strength by 2
+    - Increase magic by 2
+    - Restore health to max_health
+    
+    Raises: CharacterDeadError if character health is 0
+    """
+    # TODO: Implement experience gain and leveling
+    # Check if character is dead first
+    # Add experience
+    # Check for level up (can level up multiple times)
+    # Update stats on level up
+    if character["health"] == 0:
+        raise CharacterDeadError("cannot gain xp while dead")
+
+    character["experience"] += xp_amount
+
+    level, experience, levels_gained = calculate_level_ups(
+        character["level"], character["experience"]
+    )
+
+    if levels_gained > 0:
+        character["level"] = level
+        character["experience"] = experience
+        character["max_health"] += LEVEL_UP_MAX_HEALTH * levels_gained
+        character["strength"] += LEVEL_UP_STRENGTH * levels_gained
+        character["magic"] += LEVEL_UP_MAGIC * levels_gained
+        character["health"] = character["max_health"]
+
+    return True
+
+def calculate_level_ups(level, experience):
+    """
+    Work out how many levels a character's experience pays for
+
+    Each level up costs current_level * 100 experience, and a big enough
+    amount can pay for several levels in a row. Going from level L up n
+    levels costs 100 * (n*L + n*(n-1)/2) in total, so n is found directly
+    from that quadratic instead of one level at a time. Gives the same
+    result as _calculate_level_ups_loop.
+
+    Returns: Tuple of (new_level, leftover_experience, levels_gained)
+    """
+    if level < 1 or experience < level * 100:
+        # levels below 1 don't follow the growing cost curve
+        return _calculate_level_ups_loop(level, experience)
+
+    # largest n with 50n^2 + (100L - 50)n - experience <= 0
+    b = 100 * level - 50
+    levels_gained = (math.isqrt(b * b + 200 * experience) - b) // 100
+
+    # isqrt rounds down, so nudge n onto the exact boundary
+    while _level_up_cost(level, levels_gained + 1) <= experience:
+        levels_gained += 1
+    while _level_up_cost(level, levels_gained) > experience:
+        levels_gained -= 1
+
+    leftover = experience - _level_up_cost(level, levels_gained)
+    return level + levels_gained, leftover, levels_gained
+
+def _level_up_cost(level, levels_gained):
+    """Total experience needed to go up levels_gained levels from level"""
+    return 100 * (levels_gained * level + levels_gained * (levels_gained - 1) // 2)
+
+def _calculate_level_ups_loop(level, experience):
+    """
+    Reference version of calculate_level_ups: one level per iteration
+
+    Returns: Tuple of (new_level, leftover_experience, levels_gained)
+    """
+    levels_gained = 0
+
+    while experience >= level * 100:
+        experience -= level * 100
+        level += 1
+        levels_gained += 1
+
+    return level, experience, levels_gained
+
+def add_gold(character, amount):
+    """
+    Add gold to character's inventory
+    
+    Args:
+        character: Character dictionary
+        amount: Amount of gold to add (can be negative for spending)
+    
+    Returns: New gold total
+    Raises: ValueError if result would be negative
+    """
+    # TODO: Implement gold management
+    # Check that result won't be negative
+    # Update character's gold
+    new_total = character["gold"] + amount
+    if new_total < 0:
+        raise ValueError("not enough gold")
+    character["gold"] = new_total
+    return character["gold"]
+
+def heal_character(character, amount):
+    """
+    Heal character by specified amount
+    
+    Health cannot exceed max_health
+    
+    Returns: Actual amount healed
+    """
+    # TODO: Implement healing
+    # Calculate actual healing (don't exceed max_health)
+    # Update character health
+    start = character["health"]
+    new_hp = min(start + amount, character["max_health"])
+    character["health"] = new_hp
+    return new_hp - start
+
+def is_character_dead(character):
+    """
+    Check if character's health is 0 or below
+    
+    Returns: True if dead, False if alive
+    """
+    # TODO: Implement death check
+    return character['health'] <= 0
+
+def revive_character(character):
+    """
+    Revive a dead character with 50% health
+    
+    Returns: True if revived
+    """
+    # TODO: Implement revival
+    # Restore health to half of max_health
+    half = character["max_health"] // 2
+    character["health"] = half
+    return True
+
+# ============================================================================
+# BULK OPERATIONS
+# ============================================================================
+
+# Stats a CharacterRoster keeps as columns
+ROSTER_STATS = ["level", "health", "max_health", "strength", "magic", "experience", "gold"]
+
+class CharacterRoster:
+    """
+    Column storage of many characters' numeric stats for bulk jobs
+
+    Each stat in ROSTER_STATS is one array of 64-bit integers, with one row
+    per character, so a nightly job can update a whole shard without
+    touching a dict per character. The bulk_* methods follow exactly the
+    same rules as gain_experience, add_gold and heal_character.
+
+    Typical use:
+        roster = CharacterRoster(characters)
+        roster.bulk_gain_experience(500)
+        roster.update_characters(characters)
+    """
+
+    def __init__(self, characters=None):
+        self.names = []
+        self.columns = {stat: array("q") for stat in ROSTER_STATS}
+
+        if characters is not None:
+            for character in characters:
+                self.add(character)
+
+    def add(self, character):
+        """
+        Add a character's stats as a new row
+
+        Returns: Row index of the character
+        """
+        self.names.append(character["name"])
+        for stat in ROSTER_STATS:
+            self.columns[stat].append(character[stat])
+        return len(self.names) - 1
+
+    def __len__(self):
+        return len(self.names)
+
+    def get_stat(self, row, stat):
+        """Return one stat of one row"""
+        return self.columns[stat][row]
+
+    def update_character(self, row, character):
+        """Copy a row's stats back into a character dictionary"""
+        for stat in ROSTER_STATS:
+            character[stat] = self.columns[stat][row]
+
+    def update_characters(self, characters):
+        """Copy every row back into characters (in the order they were added)"""
+        for row, character in enumerate(characters):
+            self.update_character(row, character)
+
+    def bulk_gain_experience(self, xp_amount):
+        """
+        Give every living character xp_amount experience, with level ups
+
+        A character with 0 health is skipped (gain_experience would raise
+        CharacterDeadError for it).
+
+        Returns: List of rows that were skipped
+        """
+        levels = self.columns["level"]
+        health = self.columns["health"]
+        max_health = self.columns["max_health"]
+        strength = self.columns["strength"]
+        magic = self.columns["magic"]
+        experience = self.columns["experience"]
+
+        skipped = []
+        for row in range(len(levels)):
+            if health[row] == 0:
+                skipped.append(row)
+                continue
+
+            level, leftover, gained = calculate_level_ups(
+                levels[row], experience[row] + xp_amount
+            )
+            experience[row] = leftover
+
+            if gained > 0:
+                levels[row] = level
+                max_health[row] += LEVEL_UP_MAX_HEALTH * gained
+                strength[row] += LEVEL_UP_STRENGTH * gained
+                magic[row] += LEVEL_UP_MAGIC * gained
+                health[row] = max_health[row]
+
+        return skipped
+
+    def bulk_add_gold(self, amount):
+        """
+        Add amount gold to every character (negative to take gold)
+
+        Returns: Total gold added across the roster
+        Raises: ValueError if any character would go below 0 gold; no
+                character is changed in that case
+        """
+        gold = self.columns["gold"]
+
+        if amount < 0 and any(total + amount < 0 for total in gold):
+            raise ValueError("not enough gold")
+
+        for row in range(len(gold)):
+            gold[row] += amount
+
+        return amount * len(gold)
+
+    def bulk_heal(self, amount):
+        """
+        Heal every character by amount, without going over max_health
+
+        Returns: Array with the amount actually healed for each row
+        """
+        health = self.columns["health"]
+        max_health = self.columns["max_health"]
+
+        healed = array("q", [0]) * len(health)
+        for row in range(len(health)):
+            new_hp = min(health[row] + amount, max_health[row])
+            healed[row] = new_hp - health[row]
+            health[row] = new_hp
+
+        return healed
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def validate_character_data(character):
+    """
+    Validate that character dictionary has all required fields
+    
+    Required fields: name, class, level, health, max_health, 
+                    strength, magic, experience, gold, inventory,
+                    active_quests, completed_quests
+    
+    Returns: True if valid
+    Raises: InvalidSaveDataError if missing fields or invalid types
+    """
+    # TODO: Implement validation
+    # Check all required keys exist
+    # Check that numeric values are numbers
+    # Check that lists are actually lists
+    required = [
+        "name", "class", "level", "health", "max_health",
+        "strength", "magic", "experience", "gold",
+        "inventory", "active_quests", "completed_quests"
+    ]
+
+    for field in required:
+        if field not in character:
+            raise InvalidSaveDataError(f"missing field: {field}")
+
+    num_fields = ["level", "health", "max_health", "strength", "magic", "experience", "gold"]
+    for n in num_fields:
+        if not isinstance(character[n], int):
+            raise InvalidSaveDataError(f"{n} must be an int")
+
+    if not isinstance(character["inventory"], (list, Inventory)):
+        raise InvalidSaveDataError("inventory must be a list or Inventory")
 
-    list_fields = ["inventory", "active_quests", "completed_quests"]
+    list_fields = ["active_quests", "completed_quests"]
     for lst in list_fields:
         if not isinstance(character[lst], list):
             raise InvalidSaveDataError(f"{lst} must be a list")
@@ -10,17 +10,34 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import sys
+import hashlib
+import pickle
+import mmap
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+import inventory_system
 from custom_exceptions import (
+    InvalidItemTypeError,
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Bump this whenever the parsed record layout changes so old caches are ignored
+CATALOG_CACHE_VERSION = 3
+CATALOG_CACHE_MAGIC = b"QCCATALOG"
+
+# Parallel loading never hands a worker less than this many bytes
+MIN_PARALLEL_CHUNK_BYTES = 256 * 1024
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=False, workers=1):
     """
     Load quest data from file
     
@@ -33,6 +50,11 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    If use_cache is True, a compiled copy of the parsed quests is kept next
+    to the text file (see load_catalog_cache) and used while it is fresh.
+    If workers is more than 1, the file is split at blank lines and parsed
+    in a pool of that many processes (see load_catalog_parallel).
+
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
@@ -44,35 +66,9 @@ def load_quests(filename="data/quests.txt"):
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Quest file not found: {filename}")
 
-    try:
-        with open(filename, "r") as f:
-            content = f.read().strip()
-    except:
-        raise CorruptedDataError("Could not read quest file.")
-
-    if content == "":
-        raise InvalidDataFormatError("Quest file is empty.")
-
-    # split into blocks safely (ignore accidental extra blank lines)
-    blocks = [b.strip() for b in content.split("\n\n") if b.strip() != ""]
-
-    quests = {}
-
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip() != ""]
-        quest_dict = parse_quest_block(lines)
-        validate_quest_data(quest_dict)
-
-        # must contain quest_id or test fails
-        qid = quest_dict.get("quest_id")
-        if not qid:
-            raise InvalidDataFormatError("Missing quest_id field.")
-
-        quests[qid] = quest_dict
-
-    return quests
+    return _load_catalog(filename, "quest", use_cache, workers)
     
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False, workers=1):
     """
     Load item data from file
     
@@ -84,6 +80,13 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
+    If use_cache is True, a compiled copy of the parsed items is kept next
+    to the text file (see load_catalog_cache) and used while it is fresh.
+    If workers is more than 1, the file is parsed in a process pool.
+
+    Each item also gets 'effects', its effect string compiled with
+    inventory_system.compile_item_effect.
+
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
@@ -92,31 +95,771 @@ def load_items(filename="data/items.txt"):
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Item file not found: {filename}")
 
+    return _load_catalog(filename, "item", use_cache, workers)
+
+def _load_catalog(filename, kind, use_cache, workers):
+    """
+    Shared body of load_quests / load_items once the file is known to exist
+
+    Returns: Dictionary of records keyed by quest_id / item_id
+    Raises: InvalidDataFormatError, CorruptedDataError
+    """
+    if use_cache:
+        cached = load_catalog_cache(filename, kind)
+        if cached is not None:
+            return cached
+        fingerprint = get_file_fingerprint(filename)
+
+    if workers > 1:
+        records = load_catalog_parallel(filename, kind, workers)
+    else:
+        records = {}
+        for line_no, record in _iter_records(filename, kind):
+            _add_record(records, record, kind, filename, line_no)
+
+    if len(records) == 0:
+        raise InvalidDataFormatError(f"{kind.capitalize()} file is empty.")
+
+    if use_cache:
+        save_catalog_cache(filename, kind, records, fingerprint)
+
+    return records
+
+def _add_record(records, record, kind, filename, line_no):
+    """Add a parsed record to the catalog, rejecting duplicate ids"""
+    record_id = record[f"{kind}_id"]
+
+    if record_id in records:
+        raise InvalidDataFormatError(
+            f"{filename}, line {line_no}: Duplicate {kind}_id: {record_id}"
+        )
+
+    records[record_id] = record
+
+# ============================================================================
+# STREAMING LOADERS
+# ============================================================================
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Yield validated quest dictionaries one block at a time
+
+    The file is read line by line, so memory use stays flat no matter how
+    large the catalog is. Blocks are yielded in file order.
+
+    Returns: Generator of quest dictionaries
+    Raises:
+        MissingDataFileError right away if the file doesn't exist
+        InvalidDataFormatError (with the block's line number) while iterating
+        CorruptedDataError if the file can't be read while iterating
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Quest file not found: {filename}")
+
+    return (record for line_no, record in _iter_records(filename, "quest"))
+
+def iter_items(filename="data/items.txt"):
+    """
+    Yield validated item dictionaries one block at a time
+
+    Works like iter_quests but for the item file format.
+
+    Returns: Generator of item dictionaries
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Item file not found: {filename}")
+
+    return (record for line_no, record in _iter_records(filename, "item"))
+
+def _iter_records(filename, kind):
+    """
+    Yield (line_number, record) for every block of a catalog file
+
+    kind is "quest" or "item". Parse and validation errors are re-raised as
+    InvalidDataFormatError naming the file and the line the block starts on.
+    """
+    try:
+        f = open(filename, "r")
+    except OSError:
+        raise CorruptedDataError(f"Could not read {kind} file.")
+
+    with f:
+        try:
+            for line_no, lines in _iter_blocks(f):
+                try:
+                    record = _parse_record(kind, lines)
+                except InvalidDataFormatError as e:
+                    raise InvalidDataFormatError(f"{filename}, line {line_no}: {e}")
+                yield line_no, record
+        except (OSError, UnicodeDecodeError):
+            raise CorruptedDataError(f"Could not read {kind} file.")
+
+def _iter_blocks(lines, first_line=1):
+    """
+    Group lines into blank-line separated blocks
+
+    Args:
+        lines: Any iterable of text lines (an open file, a list, ...)
+        first_line: Line number of the first line in lines
+
+    Returns: Generator of (start_line_number, [stripped non-blank lines])
+    """
+    block = []
+    start = first_line
+
+    for line_no, line in enumerate(lines, first_line):
+        line = line.strip()
+
+        if line == "":
+            # a blank line ends the current block (extra blank lines are fine)
+            if block:
+                yield start, block
+                block = []
+            continue
+
+        if not block:
+            start = line_no
+        block.append(line)
+
+    if block:
+        yield start, block
+
+def _parse_record(kind, lines):
+    """
+    Parse and validate one block of lines
+
+    Returns: Quest or item dictionary
+    Raises: InvalidDataFormatError if the block is invalid
+    """
+    if kind == "quest":
+        record = parse_quest_block(lines)
+        validate_quest_data(record)
+        id_field = "quest_id"
+    else:
+        record = parse_item_block(lines)
+        validate_item_data(record)
+        # compiled once here so using or equipping it never reparses
+        try:
+            record["effects"] = inventory_system.compile_item_effect(record["effect"])
+        except InvalidItemTypeError as e:
+            raise InvalidDataFormatError(f"Invalid item effect: {e}")
+        id_field = "item_id"
+
+    # must contain an id or the record can't be looked up
+    if not record.get(id_field):
+        raise InvalidDataFormatError(f"Missing {id_field} field.")
+
+    return record
+
+# ============================================================================
+# PARALLEL LOADING
+# ============================================================================
+
+def load_catalog_parallel(filename, kind, workers):
+    """
+    Parse a catalog file in a pool of worker processes
+
+    The file is cut into byte ranges that always end on a blank line, so no
+    block is split between workers. Results are merged back in file order,
+    which keeps the same errors as a serial load: the first bad block in the
+    file is the one reported, with its real line number, and duplicate ids
+    are caught across chunk boundaries.
+
+    Args:
+        filename: Path of an existing catalog file
+        kind: "quest" or "item"
+        workers: Number of processes to use
+
+    Returns: Dictionary of records (may be empty)
+    Raises: InvalidDataFormatError, CorruptedDataError
+    """
+    ranges = _split_catalog_file(filename, kind, workers * 4)
+
+    # not worth starting processes for a single chunk
+    if len(ranges) <= 1:
+        chunk_results = [_parse_catalog_chunk(filename, kind, s, e) for s, e in ranges]
+        return _merge_chunk_results(filename, kind, chunk_results)
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(_parse_catalog_chunk, filename, kind, s, e) for s, e in ranges]
+        return _merge_chunk_results(filename, kind, (future.result() for future in futures))
+    finally:
+        # stop queued chunks early if an error was raised
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def _split_catalog_file(filename, kind, chunk_count):
+    """
+    Find byte ranges of a catalog file that start and end between blocks
+
+    Returns: List of (start_offset, end_offset) tuples covering the file
+    """
+    try:
+        size = os.path.getsize(filename)
+        chunk_count = max(1, min(chunk_count, size // MIN_PARALLEL_CHUNK_BYTES))
+
+        ranges = []
+        start = 0
+        with open(filename, "rb") as f:
+            for i in range(1, chunk_count):
+                target = size * i // chunk_count
+                if target <= start:
+                    continue
+
+                # finish the current line, then read on to the next blank one
+                f.seek(target)
+                f.readline()
+                line = f.readline()
+                while line and line.strip() != b"":
+                    line = f.readline()
+
+                end = f.tell()
+                if end >= size:
+                    break
+                ranges.append((start, end))
+                start = end
+    except OSError:
+        raise CorruptedDataError(f"Could not read {kind} file.")
+
+    ranges.append((start, size))
+    return ranges
+
+def _parse_catalog_chunk(filename, kind, start, end):
+    """
+    Parse one byte range of a catalog file (runs in a worker process)
+
+    Errors are returned instead of raised so the parent can put the real
+    line number on them after it knows how many lines came before.
+
+    Returns: Dictionary with:
+        'records': list of (line_in_chunk, record)
+        'line_count': number of lines in the chunk
+        'error': None, or (kind_of_error, line_in_chunk, message)
+    """
+    result = {"records": [], "line_count": 0, "error": None}
+
     try:
-        with open(filename, "r") as f:
-            content = f.read().strip()
-    except:
-        raise CorruptedDataError("Could not read item file.")
+        with open(filename, "rb") as f:
+            f.seek(start)
+            text = f.read(end - start).decode()
+    except (OSError, UnicodeDecodeError):
+        result["error"] = ("corrupted", 0, f"Could not read {kind} file.")
+        return result
+
+    result["line_count"] = text.count("\n")
 
-    if content == "":
-        raise InvalidDataFormatError("Item file is empty.")
+    for line_no, lines in _iter_blocks(text.split("\n")):
+        try:
+            record = _parse_record(kind, lines)
+        except InvalidDataFormatError as e:
+            result["error"] = ("format", line_no, str(e))
+            break
+        result["records"].append((line_no, record))
 
-    blocks = [b.strip() for b in content.split("\n\n") if b.strip() != ""]
+    return result
+
+def _merge_chunk_results(filename, kind, chunk_results):
+    """Combine chunk results in file order into one catalog dictionary"""
+    records = {}
+    lines_before = 0
+
+    for result in chunk_results:
+        # records before an error still count, as they would in a serial load
+        for line_no, record in result["records"]:
+            _add_record(records, record, kind, filename, lines_before + line_no)
+
+        if result["error"] is not None:
+            error_kind, line_no, message = result["error"]
+            if error_kind == "corrupted":
+                raise CorruptedDataError(message)
+            raise InvalidDataFormatError(f"{filename}, line {lines_before + line_no}: {message}")
+
+        lines_before += result["line_count"]
+
+    return records
+
+# ============================================================================
+# LAZY ITEM CATALOG
+# ============================================================================
+
+class LazyItemCatalog(Mapping):
+    """
+    Read-only {item_id: item_data_dict} mapping backed by a memory-mapped
+    item file
+
+    Opening the catalog only records where each item's block sits in the
+    file. An item is parsed and validated the first time it is looked up,
+    and at most cache_size decoded items are kept (least recently used are
+    dropped). It can be used anywhere the dict from load_items is expected.
+
+    Raises (when opening): MissingDataFileError, InvalidDataFormatError,
+                           CorruptedDataError
+    Raises (when looking up): InvalidDataFormatError if that item's block
+                              is invalid
+    """
 
-    items = {}
+    def __init__(self, filename="data/items.txt", cache_size=256):
+        """Map the file and index every item_id to its byte range"""
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"Item file not found: {filename}")
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip() != ""]
-        item_dict = parse_item_block(lines)
-        validate_item_data(item_dict)
+        self.filename = filename
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._index = {}
+        self._file = None
+        self._map = None
 
-        item_id = item_dict.get("item_id")
+        try:
+            self._file = open(filename, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self.close()
+            raise InvalidDataFormatError("Item file is empty.")
+        except OSError:
+            self.close()
+            raise CorruptedDataError("Could not read item file.")
+
+        try:
+            self._build_index()
+        except Exception:
+            self.close()
+            raise
+
+        if len(self._index) == 0:
+            self.close()
+            raise InvalidDataFormatError("Item file is empty.")
+
+    def _build_index(self):
+        """Record (start, end, line_number) of every block by item_id"""
+        mm = self._map
+        line_no = 0
+        block_start = None
+        block_line = 0
+        item_id = None
+
+        while True:
+            offset = mm.tell()
+            line = mm.readline()
+            line_no += 1
+            try:
+                stripped = line.decode().strip()
+            except UnicodeDecodeError:
+                raise CorruptedDataError("Could not read item file.")
+
+            if stripped == "":
+                if block_start is not None:
+                    self._index_block(item_id, block_start, offset, block_line)
+                    block_start = None
+                if line == b"":
+                    break
+                continue
+
+            if block_start is None:
+                block_start = offset
+                block_line = line_no
+                item_id = None
+
+            # split the way parse_item_block does, so every id is the one
+            # load_items would give the same block
+            key, separator, value = stripped.partition(": ")
+            if separator and key.lower() == "item_id":
+                item_id = value
+
+    def _index_block(self, item_id, start, end, line_no):
+        """Add one block to the index, rejecting missing and duplicate ids"""
         if not item_id:
-            raise InvalidDataFormatError("Missing item_id field.")
+            raise InvalidDataFormatError(f"{self.filename}, line {line_no}: Missing item_id field.")
+        if item_id in self._index:
+            raise InvalidDataFormatError(
+                f"{self.filename}, line {line_no}: Duplicate item_id: {item_id}"
+            )
+        self._index[item_id] = (start, end, line_no)
+
+    def _decode(self, item_id):
+        """Parse and validate one item straight from the mapped file"""
+        start, end, line_no = self._index[item_id]
+
+        try:
+            text = self._map[start:end].decode()
+        except UnicodeDecodeError:
+            raise CorruptedDataError("Could not read item file.")
+
+        for block_line, lines in _iter_blocks(text.split("\n"), line_no):
+            try:
+                return _parse_record("item", lines)
+            except InvalidDataFormatError as e:
+                raise InvalidDataFormatError(f"{self.filename}, line {block_line}: {e}")
+
+    def __getitem__(self, item_id):
+        if item_id in self._cache:
+            self._cache.move_to_end(item_id)
+            return self._cache[item_id]
+
+        if item_id not in self._index:
+            raise KeyError(item_id)
+
+        item = self._decode(item_id)
+
+        self._cache[item_id] = item
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return item
+
+    def __contains__(self, item_id):
+        # answered from the index so membership never decodes anything
+        return item_id in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """Release the memory map and the file handle"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Keeps a quest or item catalog in step with its text file
+
+    Each block's text is hashed, and a reload only parses and validates
+    blocks whose hash wasn't seen last time; unchanged blocks reuse their
+    existing record. The new catalog is built off to the side and then
+    swapped in as a whole, so readers always see either the old catalog or
+    the new one, never a mix. If the edited file is invalid, the old
+    catalog stays in place and the error is kept in last_error.
+
+    Args:
+        filename: Path of the catalog text file
+        kind: "quest" or "item"
+        on_reload: Optional function called with each new catalog
+        interval: Seconds between checks once start() is called
+        use_cache: Start from the compiled cache (see load_catalog_cache)
+                   when it's fresh instead of parsing the file, and keep
+                   the cache up to date after each reload
+
+    Raises (when created): MissingDataFileError, InvalidDataFormatError,
+                           CorruptedDataError
+    """
+
+    def __init__(self, filename, kind, on_reload=None, interval=2.0, use_cache=False):
+        self.filename = filename
+        self.kind = kind
+        self.on_reload = on_reload
+        self.interval = interval
+        self.use_cache = use_cache
+        self.catalog = {}
+        self.last_error = None
+        self.blocks_parsed = 0
+        self._records_by_hash = {}
+        self._stat = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        if not (use_cache and self._load_cache()):
+            self.reload()
+
+    def check(self):
+        """
+        Reload the catalog if the file changed since the last load
+
+        Never raises; a failed reload is recorded in last_error.
+
+        Returns: True if a new catalog was swapped in, False otherwise
+        """
+        try:
+            stat = os.stat(self.filename)
+        except OSError as e:
+            self.last_error = e
+            return False
+
+        if (stat.st_mtime_ns, stat.st_size) == self._stat:
+            return False
+
+        try:
+            self.reload()
+        except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
+            self.last_error = e
+            return False
+
+        return True
+
+    def reload(self):
+        """
+        Re-read the file, re-parsing only changed blocks, and swap it in
+
+        Returns: The new catalog dictionary
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        with self._lock:
+            if not os.path.exists(self.filename):
+                raise MissingDataFileError(f"{self.kind.capitalize()} file not found: {self.filename}")
+
+            stat = os.stat(self.filename)
+            # taken before reading, as for _load_catalog
+            fingerprint = get_file_fingerprint(self.filename) if self.use_cache else None
+            records = {}
+            records_by_hash = {}
+            block_hashes = []
+            parsed = 0
+
+            try:
+                f = open(self.filename, "r")
+            except OSError:
+                raise CorruptedDataError(f"Could not read {self.kind} file.")
+
+            with f:
+                try:
+                    for line_no, lines in _iter_blocks(f):
+                        digest = _block_digest(lines)
+                        record = self._records_by_hash.get(digest)
+
+                        if record is None:
+                            try:
+                                record = _parse_record(self.kind, lines)
+                            except InvalidDataFormatError as e:
+                                raise InvalidDataFormatError(f"{self.filename}, line {line_no}: {e}")
+                            parsed += 1
+
+                        _add_record(records, record, self.kind, self.filename, line_no)
+                        records_by_hash[digest] = record
+                        block_hashes.append(digest)
+                except (OSError, UnicodeDecodeError):
+                    raise CorruptedDataError(f"Could not read {self.kind} file.")
+
+            if len(records) == 0:
+                raise InvalidDataFormatError(f"{self.kind.capitalize()} file is empty.")
+
+            # nothing is replaced until the whole file has been read
+            self._records_by_hash = records_by_hash
+            self._stat = (stat.st_mtime_ns, stat.st_size)
+            self.blocks_parsed = parsed
+            self.last_error = None
+            self.catalog = records
+
+        if self.use_cache:
+            save_catalog_cache(self.filename, self.kind, records, fingerprint, block_hashes)
 
-        items[item_id] = item_dict
+        if self.on_reload is not None:
+            self.on_reload(records)
 
-    return items
+        return records
+
+    def _load_cache(self):
+        """
+        Take the catalog and its block hashes from a fresh compiled cache
+
+        Returns: True if the cache was used, False if the file has to be read
+        """
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return False
+
+        cached = load_catalog_cache(self.filename, self.kind, with_block_hashes=True)
+        if cached is None:
+            return False
+
+        records, block_hashes = cached
+        if len(block_hashes) != len(records):
+            return False
+
+        with self._lock:
+            # blocks and records are both in file order
+            self._records_by_hash = dict(zip(block_hashes, records.values()))
+            self._stat = (stat.st_mtime_ns, stat.st_size)
+            self.blocks_parsed = 0
+            self.last_error = None
+            self.catalog = records
+
+        if self.on_reload is not None:
+            self.on_reload(records)
+
+        return True
+
+    def start(self):
+        """Check the file every interval seconds on a background thread"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread started by start()"""
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _watch(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+# ============================================================================
+# COMPILED CATALOG CACHE
+# ============================================================================
+
+def get_catalog_cache_path(filename):
+    """Return the path of the compiled cache kept next to a catalog file"""
+    return filename + ".cache"
+
+def get_file_fingerprint(filename):
+    """
+    Describe the current contents of a catalog text file
+
+    Returns: Dictionary with 'mtime_ns', 'size' and 'sha256' of the file
+    """
+    stat = os.stat(filename)
+    digest = hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        chunk = f.read(1024 * 1024)
+        while chunk:
+            digest.update(chunk)
+            chunk = f.read(1024 * 1024)
+
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest.hexdigest()
+    }
+
+def get_block_hashes(filename):
+    """
+    Hash every blank-line separated block of a catalog file
+
+    Returns: List of block hashes in file order
+    """
+    with open(filename, "r") as f:
+        return [_block_digest(lines) for line_no, lines in _iter_blocks(f)]
+
+def _block_digest(lines):
+    """Hash of one block's lines, as CatalogWatcher matches them"""
+    return hashlib.sha1("\n".join(lines).encode()).digest()
+
+def load_catalog_cache(filename, kind, with_block_hashes=False):
+    """
+    Load a compiled catalog if it still matches its source text file
+
+    The cache is fresh when the source mtime and size are unchanged. If only
+    the mtime moved (e.g. the file was touched or checked out again), the
+    content hash decides. A missing, old-version or unreadable cache is
+    treated as a miss rather than an error.
+
+    Args:
+        filename: Path of the source text file
+        kind: "quest" or "item"
+        with_block_hashes: Also return the hash of every block of the file,
+                           in file order (what CatalogWatcher starts from)
+
+    Returns: Dictionary of records, or (records, block hashes) if
+             with_block_hashes is True; None if the cache can't be used
+    """
+    cache_path = get_catalog_cache_path(filename)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        stat = os.stat(filename)
+        with open(cache_path, "rb") as f:
+            if f.read(len(CATALOG_CACHE_MAGIC)) != CATALOG_CACHE_MAGIC:
+                return None
+
+            # the header is pickled separately so a stale cache is rejected
+            # without unpickling every record
+            header = pickle.load(f)
+            if header.get("version") != CATALOG_CACHE_VERSION:
+                return None
+            if header.get("kind") != kind:
+                return None
+            if header.get("size") != stat.st_size:
+                return None
+
+            if header.get("mtime_ns") != stat.st_mtime_ns:
+                if header.get("sha256") != get_file_fingerprint(filename)["sha256"]:
+                    return None
+
+            records = pickle.load(f)
+            if with_block_hashes:
+                return records, pickle.load(f)
+            return records
+    except Exception:
+        return None
+
+def save_catalog_cache(filename, kind, records, fingerprint=None, block_hashes=None):
+    """
+    Write a compiled catalog next to its source text file
+
+    fingerprint should be taken *before* the source was parsed so that an
+    edit made during parsing leaves the cache stale instead of wrong.
+    block_hashes (the hash of every block, in file order) are read from the
+    file if not given. Failing to write the cache (read-only data
+    directory, full disk) is not an error; the text file stays the source
+    of truth.
+
+    Returns: True if the cache was written, False otherwise
+    """
+    if fingerprint is None:
+        fingerprint = get_file_fingerprint(filename)
+
+    if block_hashes is None:
+        try:
+            block_hashes = get_block_hashes(filename)
+        except (OSError, UnicodeDecodeError):
+            return False
+
+    header = {
+        "version": CATALOG_CACHE_VERSION,
+        "kind": kind,
+        "mtime_ns": fingerprint["mtime_ns"],
+        "size": fingerprint["size"],
+        "sha256": fingerprint["sha256"]
+    }
+
+    cache_path = get_catalog_cache_path(filename)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(CATALOG_CACHE_MAGIC)
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(block_hashes, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # replace in one step so readers never see a half-written cache
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+    return True
 
 
 def validate_quest_data(quest_dict):
@@ -182,6 +925,16 @@ def validate_item_data(item_dict):
     if not isinstance(item_dict["cost"], int):
         raise InvalidDataFormatError("Item cost must be an integer")
 
+    # equipment modifiers have to come back off exactly, which health can't
+    if item_dict["type"] != "consumable":
+        for part in str(item_dict["effect"]).split(","):
+            if part.split(":", 1)[0].strip() == "health":
+                raise InvalidDataFormatError("Weapons and armor can't have a health effect")
+
+    # optional; see inventory_system.EQUIPMENT_SLOTS
+    if "slot" in item_dict and item_dict["slot"] not in inventory_system.EQUIPMENT_SLOTS:
+        raise InvalidDataFormatError(f"Invalid item slot: {item_dict['slot']}")
+
     return True
 
 
@@ -247,7 +1000,9 @@ def parse_quest_block(lines):
             raise InvalidDataFormatError("Invalid quest line format.")
 
         key, value = line.split(": ", 1)
-        key = key.lower()
+        # interned keys are shared by every record, which keeps the
+        # catalog and its compiled cache small
+        key = sys.intern(key.lower())
 
         if key in ["reward_xp", "reward_gold", "required_level"]:
             try:
@@ -277,7 +1032,9 @@ def parse_item_block(lines):
             raise InvalidDataFormatError("Invalid item line format.")
 
         key, value = line.split(": ", 1)
-        key = key.lower()
+        # interned keys are shared by every record, which keeps the
+        # catalog and its compiled cache small
+        key = sys.intern(key.lower())
 
         if key == "cost":
             try:
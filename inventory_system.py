@@ -9,6 +9,9 @@ AI Usage: AI was used to make Readme, help make variable names, and make comment
 This module handles inventory management, item usage, and equipment.
 """
 
+import bisect
+import functools
+import heapq
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -19,6 +22,300 @@ from custom_exceptions import (
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
+# ============================================================================
+# INVENTORY CAPACITY
+# ============================================================================
+
+class InventoryCapacity:
+    """
+    Limits on what an inventory can hold
+
+    Items take up slots: up to a stack limit of the same item share one
+    slot (1 by default, so every item needs its own slot). Items can also
+    have a weight, and the total weight can be capped.
+
+    Args:
+        max_slots: Number of slots (None for no limit)
+        max_stack: Items of one kind per slot, for items not in stack_limits
+        stack_limits: Dictionary of item_id -> items per slot
+        max_weight: Total weight allowed (None for no limit)
+        weights: Dictionary of item_id -> weight of one item (others weigh 0)
+    """
+
+    __slots__ = ("max_slots", "max_stack", "stack_limits", "max_weight", "weights")
+
+    def __init__(self, max_slots=MAX_INVENTORY_SIZE, max_stack=1, stack_limits=None,
+                 max_weight=None, weights=None):
+        if max_stack < 1:
+            raise ValueError("max_stack must be at least 1")
+
+        self.max_slots = max_slots
+        self.max_stack = max_stack
+        self.stack_limits = {} if stack_limits is None else dict(stack_limits)
+        self.max_weight = max_weight
+        self.weights = {} if weights is None else dict(weights)
+
+    def slots_for(self, item_id, count):
+        """Slots taken by count of an item"""
+        limit = self.stack_limits.get(item_id, self.max_stack)
+        return -(-count // limit)
+
+# Capacity of inventories that haven't been given one: MAX_INVENTORY_SIZE
+# items, one per slot, no weight limit
+DEFAULT_CAPACITY = InventoryCapacity()
+
+# ============================================================================
+# INVENTORY TYPE
+# ============================================================================
+
+class Inventory:
+    """
+    A character's inventory: a multiset of item ids
+
+    Keeps a count per item id (in the order the ids were added) plus the
+    total number of items, so adding, removing, counting and checking for
+    an item take the same time however full the inventory is. It has the
+    list operations the game uses (append, remove, count, in, len,
+    iteration, copy, clear), so plain-list inventories and Inventory can
+    be used interchangeably. Iterating yields each id as many times as it
+    is held, so ",".join(inventory) is the save file format.
+
+    Two inventories, or an inventory and a list, are equal when they hold
+    the same items in any order.
+
+    The slots used and total weight under its InventoryCapacity are kept
+    up to date as items come and go, so check_space doesn't need to look
+    at the items already held. The capacity is only enforced by
+    check_space (and the inventory functions that call it); append itself
+    never refuses an item.
+    """
+
+    __slots__ = ("_counts", "_size", "_capacity", "_slots_used", "_weight")
+
+    def __init__(self, items=None, capacity=None):
+        self._counts = {}
+        self._size = 0
+        self._capacity = DEFAULT_CAPACITY if capacity is None else capacity
+        self._slots_used = 0
+        self._weight = 0
+        if items is not None:
+            self.extend(items)
+
+    def append(self, item_id):
+        """Add one item"""
+        count = self._counts.get(item_id, 0)
+        self._counts[item_id] = count + 1
+        self._size += 1
+
+        capacity = self._capacity
+        if count % capacity.stack_limits.get(item_id, capacity.max_stack) == 0:
+            self._slots_used += 1
+        if item_id in capacity.weights:
+            self._weight += capacity.weights[item_id]
+
+    def extend(self, items):
+        """Add every item in an iterable"""
+        for item_id in items:
+            self.append(item_id)
+
+    def remove(self, item_id):
+        """
+        Remove one item
+
+        Raises: ValueError if the item isn't held (like list.remove)
+        """
+        count = self._counts.get(item_id, 0)
+        if count == 0:
+            raise ValueError(f"{item_id!r} is not in the inventory")
+
+        if count == 1:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = count - 1
+        self._size -= 1
+
+        capacity = self._capacity
+        if (count - 1) % capacity.stack_limits.get(item_id, capacity.max_stack) == 0:
+            self._slots_used -= 1
+        if item_id in capacity.weights:
+            self._weight -= capacity.weights[item_id]
+
+    def count(self, item_id):
+        """How many of an item are held"""
+        return self._counts.get(item_id, 0)
+
+    def counts(self):
+        """Dictionary of item_id -> count, in the order ids were added"""
+        return dict(self._counts)
+
+    @property
+    def capacity(self):
+        """The InventoryCapacity this inventory is checked against"""
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        self._capacity = capacity
+        self._slots_used = 0
+        self._weight = 0
+        for item_id, count in self._counts.items():
+            self._slots_used += capacity.slots_for(item_id, count)
+            self._weight += count * capacity.weights.get(item_id, 0)
+
+    @property
+    def slots_used(self):
+        """Slots taken by the items held"""
+        return self._slots_used
+
+    @property
+    def weight(self):
+        """Total weight of the items held"""
+        return self._weight
+
+    def check_space(self, item_id, quantity=1):
+        """
+        Check that more of one item would fit
+
+        Only the item being added is looked at, so this takes the same
+        time however much is already held.
+
+        Raises: InventoryFullError if it would take more slots or weight
+                than the capacity allows
+        """
+        capacity = self._capacity
+        max_slots = capacity.max_slots
+
+        # the usual case: one item per slot and no weights at all
+        if capacity.max_weight is None and capacity.max_stack == 1 and not capacity.stack_limits:
+            if max_slots is not None and self._slots_used + quantity > max_slots:
+                raise InventoryFullError("Inventory is full.")
+            return
+
+        self.check_space_for({item_id: quantity})
+
+    def check_space_for(self, additions):
+        """
+        Check that several items would fit together (like check_space)
+
+        Args:
+            additions: Dictionary of item_id -> quantity to add
+
+        Raises: InventoryFullError if they don't all fit
+        """
+        capacity = self._capacity
+        slots = self._slots_used
+        weight = self._weight
+
+        for item_id, quantity in additions.items():
+            count = self._counts.get(item_id, 0)
+            limit = capacity.stack_limits.get(item_id, capacity.max_stack)
+            slots += -(-(count + quantity) // limit) - -(-count // limit)
+            if item_id in capacity.weights:
+                weight += quantity * capacity.weights[item_id]
+
+        if capacity.max_slots is not None and slots > capacity.max_slots:
+            raise InventoryFullError("Inventory is full.")
+        if capacity.max_weight is not None and weight > capacity.max_weight:
+            raise InventoryFullError("That would be too heavy to carry.")
+
+    def copy(self):
+        """Independent copy (with the same capacity)"""
+        inventory = Inventory(capacity=self._capacity)
+        inventory._counts = dict(self._counts)
+        inventory._size = self._size
+        inventory._slots_used = self._slots_used
+        inventory._weight = self._weight
+        return inventory
+
+    def clear(self):
+        """Remove every item"""
+        self._counts.clear()
+        self._size = 0
+        self._slots_used = 0
+        self._weight = 0
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for item_id, count in list(self._counts.items()):
+            for _ in range(count):
+                yield item_id
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, (list, tuple)):
+            return self._counts == Inventory(other)._counts
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Inventory({list(self)!r})"
+
+def get_item_counts(inventory):
+    """
+    Count the items in an inventory (an Inventory or a plain list)
+
+    Returns: Dictionary of item_id -> count, in first-seen order
+    """
+    if isinstance(inventory, Inventory):
+        return inventory.counts()
+
+    counts = {}
+    for item_id in inventory:
+        counts[item_id] = counts.get(item_id, 0) + 1
+    return counts
+
+def set_inventory_capacity(character, capacity):
+    """
+    Give a character's inventory its own capacity
+
+    A plain-list inventory is replaced by an Inventory holding the same
+    items. Items already held are kept even if they're over the new limits.
+    """
+    inventory = character["inventory"]
+    if not isinstance(inventory, Inventory):
+        inventory = Inventory(inventory)
+        character["inventory"] = inventory
+
+    inventory.capacity = capacity
+
+def check_inventory_space(character, item_id, quantity=1):
+    """
+    Check that more of an item would fit in a character's inventory
+
+    Raises: InventoryFullError if it doesn't fit
+    """
+    _check_space(character["inventory"], item_id, quantity)
+
+def _check_space(inventory, item_id, quantity=1):
+    """check_inventory_space for an inventory already looked up"""
+    if isinstance(inventory, Inventory):
+        inventory.check_space(item_id, quantity)
+    elif len(inventory) + quantity > MAX_INVENTORY_SIZE:
+        # plain lists have the default capacity: one item per slot
+        raise InventoryFullError("Inventory is full.")
+
+def check_basket_space(character, additions):
+    """
+    Check that several items would all fit in a character's inventory
+
+    Args:
+        character: Character dictionary
+        additions: Dictionary of item_id -> quantity to add
+
+    Raises: InventoryFullError if they don't fit
+    """
+    inventory = character["inventory"]
+
+    if isinstance(inventory, Inventory):
+        inventory.check_space_for(additions)
+    elif len(inventory) + sum(additions.values()) > MAX_INVENTORY_SIZE:
+        raise InventoryFullError("Inventory is full.")
+
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
@@ -37,13 +334,10 @@ def add_item_to_inventory(character, item_id):
     # TODO: Implement adding items
     # Check if inventory is full (>= MAX_INVENTORY_SIZE)
     # Add item_id to character['inventory'] list
-    inventory = character["inventory"]
-
-    if len(inventory) >= MAX_INVENTORY_SIZE:
-        raise InventoryFullError("Inventory is full.")
+    check_inventory_space(character, item_id)
 
     # add item
-    inventory.append(item_id)
+    character["inventory"].append(item_id)
 
     return True
 
@@ -98,13 +392,19 @@ def get_inventory_space_remaining(character):
     """
     Calculate how many more items can fit in inventory
     
-    Returns: Integer representing available slots
+    Returns: Integer representing available slots (None if the
+             character's capacity has no slot limit)
     """
     # TODO: Implement space calculation
     inventory = character["inventory"]
 
     # calculate remaining space
-    remaining = MAX_INVENTORY_SIZE - len(inventory)
+    if not isinstance(inventory, Inventory):
+        return MAX_INVENTORY_SIZE - len(inventory)
+    if inventory.capacity.max_slots is None:
+        return None
+
+    return inventory.capacity.max_slots - inventory.slots_used
 
 def clear_inventory(character):
     """
@@ -115,7 +415,7 @@ def clear_inventory(character):
     # TODO: Implement inventory clearing
     # Save current inventory before clearing
     # Clear character's inventory list
-    old_items = character["inventory"].copy()   # save what was there
+    old_items = list(character["inventory"])    # save what was there
     
     character["inventory"].clear()              # empty the inventory
     
@@ -157,15 +457,14 @@ def use_item(character, item_id, item_data):
     if item_data["type"] != "consumable":
         raise InvalidItemTypeError("Item is not a consumable.") # only consumables can be "used"
 
-    effect_tuple = item_data["effect"] # effect looks like: "health:20"
+    effects = get_item_effects(item_data) # effects look like: (("health", 20),)
 
-    stat_name, value = parse_item_effect(effect_tuple)
-
-    apply_stat_effect(character, stat_name, value) # apply the effect to the character
+    apply_item_effects(character, effects) # apply the effects to the character
 
     inventory.remove(item_id) # remove the item after using it
 
-    return f"You used {item_id} and gained {stat_name} +{value}."
+    gained = ", ".join(f"{stat_name} +{value}" for stat_name, value in effects)
+    return f"You used {item_id} and gained {gained}."
 
 
 def equip_weapon(character, item_id, item_data):
@@ -187,6 +486,7 @@ def equip_weapon(character, item_id, item_data):
     Raises:
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'weapon'
+        InventoryFullError if the weapon it replaces doesn't fit in the inventory
     """
     # TODO: Implement weapon equipping
     # Check item exists and is type 'weapon'
@@ -204,34 +504,8 @@ def equip_weapon(character, item_id, item_data):
     if item_data["type"] != "weapon":
         raise InvalidItemTypeError("Item is not a weapon.")
 
-    # if a weapon is already equipped, unequip it
-    if "equipped_weapon" in character and character["equipped_weapon"] is not None:
-
-        old_weapon = character["equipped_weapon"]
-        old_effect = character["equipped_weapon_effect"]    
-
-        # reverse the old weapon's stat effect
-        stat_name, value = parse_item_effect(old_effect)
-        apply_stat_effect(character, stat_name, -value)      # subtract bonus
-
-        # add old weapon back to inventory
-        inventory.append(old_weapon)
-
-    # parse the new weapon's effect
-    effect_string = item_data["effect"]   # example: "strength:5"
-    stat_name, value = parse_item_effect(effect_string)
-
-    # apply stat bonus
-    apply_stat_effect(character, stat_name, value)
-
-    # store equipped data on character
-    character["equipped_weapon"] = item_id
-    character["equipped_weapon_effect"] = effect_string
-
-    # remove new weapon from inventory
-    inventory.remove(item_id)
-
-    return f"You equipped {item_id} (+{stat_name} {value})."
+    # swaps out whatever is in the weapon's slot (see EQUIPMENT SLOTS)
+    return _equip(character, inventory, item_id, item_data, get_item_slot(item_data))
 
     
 def equip_armor(character, item_id, item_data):
@@ -244,8 +518,11 @@ def equip_armor(character, item_id, item_data):
         item_data: Item information dictionary
     
     Armor effect format: "max_health:10" (adds 10 to max_health)
+
+    Armor goes in the slot named by its SLOT line (helmet, boots, ...),
+    or the armor slot if it has none.
     
-    If character already has armor equipped:
+    If character already has armor equipped in that slot:
     - Unequip current armor (remove bonus)
     - Add old armor back to inventory
     
@@ -253,6 +530,7 @@ def equip_armor(character, item_id, item_data):
     Raises:
         ItemNotFoundError if item not in inventory
         InvalidItemTypeError if item type is not 'armor'
+        InventoryFullError if the armor it replaces doesn't fit in the inventory
     """
     # TODO: Implement armor equipping
     # Similar to equip_weapon but for armor
@@ -266,34 +544,9 @@ def equip_armor(character, item_id, item_data):
     if item_data["type"] != "armor":
         raise InvalidItemTypeError("Item is not armor.")
 
-    # if armor is already equipped, unequip it first
-    if "equipped_armor" in character and character["equipped_armor"] is not None: # not empty meanning somehting is there
-
-        old_armor = character["equipped_armor"]
-        old_effect = character["equipped_armor_effect"]
-
-        # reverse old armor bonus
-        stat_name, value = parse_item_effect(old_effect)
-        apply_stat_effect(character, stat_name, -value)   # subtract the old bonus
-
-        # return old armor to inventory
-        inventory.append(old_armor)
-
-    # parse new armor effect (example: "max_health:10")
-    effect_string = item_data["effect"]
-    stat_name, value = parse_item_effect(effect_string)
-
-    # apply bonus
-    apply_stat_effect(character, stat_name, value)
-
-    # save equipped armor info on character
-    character["equipped_armor"] = item_id
-    character["equipped_armor_effect"] = effect_string
-
-    # remove armor from inventory
-    inventory.remove(item_id)
-
-    return f"You equipped {item_id} (+{stat_name} {value})."
+    # swaps out whatever is in the armor's slot, so a helmet doesn't
+    # replace body armor (see EQUIPMENT SLOTS)
+    return _equip(character, inventory, item_id, item_data, get_item_slot(item_data))
 
 
 def unequip_weapon(character):
@@ -308,65 +561,253 @@ def unequip_weapon(character):
     # Remove stat bonuses
     # Add weapon back to inventory
     # Clear equipped_weapon from character
+    return unequip_item(character, "weapon")
+
+def unequip_armor(character):
+    """
+    Remove equipped armor and return it to inventory
+    
+    Returns: Item ID that was unequipped, or None if no armor equipped
+    Raises: InventoryFullError if inventory is full
+    """
+    # TODO: Implement armor unequipping
+    return unequip_item(character, "armor")
+
+# ============================================================================
+# EQUIPMENT SLOTS
+# ============================================================================
+#
+# A character's equipment is kept in character["equipment"], an
+# EquipmentStats. The character's stats stay the totals every other
+# module reads (base + all equipment bonuses); equipping or unequipping
+# only adds or takes off that one slot's recorded modifiers, so reading a
+# stat never replays the equipment and taking an item off always undoes
+# exactly what putting it on did. The one exception is health, which is
+# a pool rather than a stat: it is clamped to max_health when gear that
+# raised max_health comes off, and equipment can't have health effects
+# at all (there would be nothing to take back off once it was spent).
+# The items in the weapon and armor slots
+# are also mirrored into equipped_weapon / equipped_armor for older code;
+# their effects are only kept in the EquipmentStats.
+
+# Slots an item can be equipped in. Weapons and armor go in the slot named
+# after their type; any other slot is chosen with a SLOT line in the item
+# file (e.g. TYPE: armor / SLOT: helmet).
+EQUIPMENT_SLOTS = ["weapon", "armor", "helmet", "gloves", "boots", "shield", "ring", "amulet"]
+
+# Slots mirrored into an equipped_{slot} key on the character
+_LEGACY_SLOTS = ["weapon", "armor"]
+_LEGACY_KEYS = {slot: f"equipped_{slot}" for slot in _LEGACY_SLOTS}
+
+class EquipmentStats:
+    """
+    What each equipment slot holds, and the bonus it adds to each stat
+
+    slots maps slot -> (item_id, compiled effects); bonuses maps stat ->
+    sum of every slot's modifiers for it, kept up to date as slots change,
+    so a character's base stat is character[stat] - bonuses[stat].
+    """
+
+    __slots__ = ("slots", "bonuses")
+
+    def __init__(self):
+        self.slots = {}
+        self.bonuses = {}
+
+    def add(self, slot, item_id, effects):
+        """Record an item going into an empty slot"""
+        self.slots[slot] = (item_id, effects)
+        for stat_name, value in effects:
+            self.bonuses[stat_name] = self.bonuses.get(stat_name, 0) + value
+
+    def remove(self, slot):
+        """
+        Empty a slot
+
+        Returns: (item_id, effects) that were in it
+        """
+        item_id, effects = self.slots.pop(slot)
+        for stat_name, value in effects:
+            self.bonuses[stat_name] -= value
+        return item_id, effects
+
+    def copy(self):
+        """Independent copy"""
+        equipment = EquipmentStats()
+        equipment.slots = dict(self.slots)
+        equipment.bonuses = dict(self.bonuses)
+        return equipment
+
+    def __repr__(self):
+        return f"EquipmentStats({self.slots!r})"
+
+def get_equipment(character):
+    """
+    A character's EquipmentStats, created on first use
+
+    Weapons and armor equipped before there were equipment slots (only the
+    equipped_weapon / equipped_armor keys and their _effect keys set) are
+    picked up here; the _effect keys are dropped once their effects are
+    in the EquipmentStats.
+    """
+    try:
+        equipment = character["equipment"]
+    except KeyError:
+        equipment = None
+
+    if equipment is None:
+        equipment = EquipmentStats()
+        for slot in _LEGACY_SLOTS:
+            item_id = character.get(f"equipped_{slot}")
+            effect = character.pop(f"equipped_{slot}_effect", None)
+            if item_id is not None:
+                equipment.add(slot, item_id, compile_item_effect(effect))
+        character["equipment"] = equipment
+
+    return equipment
+
+def get_item_slot(item_data):
+    """
+    Slot an item is equipped in
+
+    Returns: One of EQUIPMENT_SLOTS
+    Raises: InvalidItemTypeError if the item can't be equipped
+    """
+    slot = item_data.get("slot", item_data["type"])
+
+    if slot not in EQUIPMENT_SLOTS:
+        raise InvalidItemTypeError(f"Item can't be equipped: {item_data['type']}")
+    return slot
+
+def get_base_stat(character, stat_name):
+    """A stat without any equipment bonuses"""
+    equipment = get_equipment(character)
+    return character[stat_name] - equipment.bonuses.get(stat_name, 0)
+
+def equip_item(character, item_id, item_data, slot=None):
+    """
+    Equip an item in its slot, swapping out whatever was there
+
+    Args:
+        character: Character dictionary
+        item_id: Item to equip
+        item_data: Item information dictionary
+        slot: Slot to use (defaults to get_item_slot(item_data))
+
+    Returns: String describing equipment change
+    Raises:
+        ItemNotFoundError if item not in inventory
+        InvalidItemTypeError if the item can't be equipped (or has a health effect)
+        InventoryFullError if the item it replaces doesn't fit in the inventory
+    """
     inventory = character["inventory"]
 
-    # check if a weapon is even equipped
-    if "equipped_weapon" not in character or character["equipped_weapon"] is None:
-        return None   # nothing to unequip
+    if item_id not in inventory:
+        raise ItemNotFoundError(f"Item not found: {item_id}")
+
+    if slot is None:
+        slot = get_item_slot(item_data)
+    elif slot not in EQUIPMENT_SLOTS:
+        raise InvalidItemTypeError(f"Unknown equipment slot: {slot}")
 
-    weapon_id = character["equipped_weapon"]
-    effect = character["equipped_weapon_effect"]
+    return _equip(character, inventory, item_id, item_data, slot)
 
-    # make sure inventory has space
-    if len(inventory) >= MAX_INVENTORY_SIZE:
-        raise InventoryFullError("Inventory is full.")
+def _equip(character, inventory, item_id, item_data, slot):
+    """equip_item once the item and slot have been checked"""
+    # get_equipment and get_item_effects inlined: this runs on every equip
+    try:
+        equipment = character["equipment"]
+    except KeyError:
+        equipment = None
+    if equipment is None:
+        equipment = get_equipment(character)
 
-    # reverse the weapon's stat bonus
-    stat_name, value = parse_item_effect(effect)
-    apply_stat_effect(character, stat_name, -value)   # subtract bonus
+    effects = item_data.get("effects")
+    if effects is None:
+        effects = compile_item_effect(item_data["effect"])
+    description = _describe_equipment_effects(effects)
 
-    # add weapon back to inventory
-    inventory.append(weapon_id)
+    inventory.remove(item_id)
 
-    # remove equipped info
-    character["equipped_weapon"] = None
-    character["equipped_weapon_effect"] = None
+    if slot in equipment.slots:
+        # the item coming off has to fit in the space the new one left,
+        # which it may not with stack or weight limits
+        if isinstance(inventory, Inventory):
+            try:
+                inventory.check_space_for({equipment.slots[slot][0]: 1})
+            except InventoryFullError:
+                inventory.append(item_id)
+                raise
 
-    return weapon_id
+        old_item, old_effects = equipment.remove(slot)
+        _apply_equipment_effects(character, old_effects, -1)
+        inventory.append(old_item)
 
-def unequip_armor(character):
+    equipment.add(slot, item_id, effects)
+    _apply_equipment_effects(character, effects, 1)
+
+    legacy_key = _LEGACY_KEYS.get(slot)
+    if legacy_key is not None:
+        character[legacy_key] = item_id
+
+    return f"You equipped {item_id} ({description})."
+
+def unequip_item(character, slot):
     """
-    Remove equipped armor and return it to inventory
-    
-    Returns: Item ID that was unequipped, or None if no armor equipped
+    Take the item out of an equipment slot and return it to inventory
+
+    Returns: Item ID that was unequipped, or None if the slot is empty
     Raises: InventoryFullError if inventory is full
     """
-    # TODO: Implement armor unequipping
+    try:
+        equipment = character["equipment"]
+    except KeyError:
+        equipment = None
+    if equipment is None:
+        equipment = get_equipment(character)
+
+    entry = equipment.slots.get(slot)
+    if entry is None:
+        return None
+
     inventory = character["inventory"]
+    item_id = entry[0]
+    _check_space(inventory, item_id)
 
-    # check if armor is even equipped
-    if "equipped_armor" not in character or character["equipped_armor"] is None:
-        return None   # nothing to unequip
+    item_id, effects = equipment.remove(slot)
+    _apply_equipment_effects(character, effects, -1)
+    inventory.append(item_id)
 
-    armor_id = character["equipped_armor"]
-    effect = character["equipped_armor_effect"]   # example: "max_health:10"
+    legacy_key = _LEGACY_KEYS.get(slot)
+    if legacy_key is not None:
+        character[legacy_key] = None
 
-    # check if there is space in inventory
-    if len(inventory) >= MAX_INVENTORY_SIZE:
-        raise InventoryFullError("Inventory is full.")
+    return item_id
 
-    # reverse the armor's stat bonus
-    stat_name, value = parse_item_effect(effect)
-    apply_stat_effect(character, stat_name, -value)   # subtract bonus
+@functools.lru_cache(maxsize=256)
+def _describe_equipment_effects(effects):
+    """
+    describe_item_effects for effects that are about to be equipped
 
-    # add old armor back to inventory
-    inventory.append(armor_id)
+    Returns: Text of the effects
+    Raises: InvalidItemTypeError if they change health
+    """
+    for stat_name, value in effects:
+        if stat_name == "health":
+            raise InvalidItemTypeError("Equipment can't have a health effect (use max_health).")
+    return describe_item_effects(effects)
 
-    # clear equipped armor fields
-    character["equipped_armor"] = None
-    character["equipped_armor_effect"] = None
+def _apply_equipment_effects(character, effects, sign):
+    """
+    Add (sign=1) or take off (sign=-1) an equipped item's modifiers
 
-    return armor_id
+    Health is clamped to max_health after max_health changes, so taking
+    off gear that raised it never leaves health over the new maximum.
+    """
+    for stat_name, value in effects:
+        character[stat_name] += sign * value
+        if stat_name == "max_health" and character["health"] > character["max_health"]:
+            character["health"] = character["max_health"]
 
 # ============================================================================
 # SHOP SYSTEM
@@ -399,8 +840,7 @@ def purchase_item(character, item_id, item_data):
         raise InsufficientResourcesError("Not enough gold to purchase this item.")
 
     # check inventory space
-    if len(inventory) >= MAX_INVENTORY_SIZE:
-        raise InventoryFullError("Inventory is full.")
+    check_inventory_space(character, item_id)
 
     # subtract gold
     character["gold"] -= cost
@@ -445,6 +885,281 @@ def sell_item(character, item_id, item_data):
 
     return sell_price
 
+def purchase_items(character, basket, catalog):
+    """
+    Buy a whole basket of items in one transaction
+
+    Every line is checked before anything changes, so either the whole
+    basket is bought or nothing is (no gold spent, no items added).
+
+    Args:
+        character: Character dictionary
+        basket: List of (item_id, quantity) tuples; repeated ids add up
+        catalog: Dictionary of all item data (item_id -> item info)
+
+    Returns: Receipt dictionary (see _make_receipt) with the gold spent
+    Raises:
+        ItemNotFoundError if an item isn't in the catalog
+        ValueError if a quantity isn't a positive integer
+        InsufficientResourcesError if the basket costs more than the gold
+        InventoryFullError if the items don't all fit
+    """
+    lines = _basket_lines(basket, catalog, lambda item: item["cost"])
+    total = sum(line["subtotal"] for line in lines)
+
+    if character["gold"] < total:
+        raise InsufficientResourcesError(f"Not enough gold: basket costs {total}.")
+
+    check_basket_space(character, {line["item_id"]: line["quantity"] for line in lines})
+
+    character["gold"] -= total
+    inventory = character["inventory"]
+    for line in lines:
+        for _ in range(line["quantity"]):
+            inventory.append(line["item_id"])
+
+    return _make_receipt(character, lines, total)
+
+def sell_items(character, basket, catalog):
+    """
+    Sell a whole basket of items in one transaction, each for half its cost
+
+    Every line is checked before anything changes, so either the whole
+    basket is sold or nothing is.
+
+    Args:
+        character: Character dictionary
+        basket: List of (item_id, quantity) tuples; repeated ids add up
+        catalog: Dictionary of all item data (item_id -> item info)
+
+    Returns: Receipt dictionary (see _make_receipt) with the gold received
+    Raises:
+        ItemNotFoundError if an item isn't in the catalog or the character
+                          holds fewer than the quantity
+        ValueError if a quantity isn't a positive integer
+    """
+    lines = _basket_lines(basket, catalog, lambda item: item["cost"] // 2)
+    inventory = character["inventory"]
+
+    for line in lines:
+        if inventory.count(line["item_id"]) < line["quantity"]:
+            raise ItemNotFoundError(
+                f"Not enough {line['item_id']} to sell {line['quantity']}."
+            )
+
+    total = sum(line["subtotal"] for line in lines)
+    for line in lines:
+        for _ in range(line["quantity"]):
+            inventory.remove(line["item_id"])
+    character["gold"] += total
+
+    return _make_receipt(character, lines, total)
+
+def _basket_lines(basket, catalog, unit_price):
+    """
+    Check a basket and merge repeated items into one line each
+
+    Returns: List of line dictionaries (item_id, name, quantity,
+             unit_price, subtotal) in basket order
+    Raises: ItemNotFoundError, ValueError
+    """
+    lines = {}
+
+    for item_id, quantity in basket:
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError(f"Invalid quantity for {item_id}: {quantity}")
+
+        item = catalog.get(item_id)
+        if item is None:
+            raise ItemNotFoundError(f"Item not found: {item_id}")
+
+        if item_id not in lines:
+            lines[item_id] = {
+                "item_id": item_id,
+                "name": item["name"],
+                "quantity": 0,
+                "unit_price": unit_price(item),
+                "subtotal": 0
+            }
+        line = lines[item_id]
+        line["quantity"] += quantity
+        line["subtotal"] = line["quantity"] * line["unit_price"]
+
+    return list(lines.values())
+
+def _make_receipt(character, lines, total):
+    """
+    Receipt for a finished basket
+
+    Returns: Dictionary with 'lines' (list of line dictionaries), 'total'
+             (gold spent or received) and 'gold' (gold left afterwards)
+    """
+    return {"lines": lines, "total": total, "gold": character["gold"]}
+
+
+# ============================================================================
+# SHOP CATALOG
+# ============================================================================
+
+class ShopCatalog:
+    """
+    Item catalog indexed for shop queries
+
+    Built once from an item dictionary (e.g. game_data.load_items). Items
+    are kept sorted by cost (overall and per type) and by value for every
+    stat their effects change, so range queries and pages are a binary
+    search plus a slice instead of a scan. best_affordable keeps a
+    range-maximum table over the cost order, built the first time each
+    stat (and type) is asked for, so the k best items under a budget take
+    O(log n + k log k).
+
+    The catalog doesn't notice changes to the item dictionary; build a new
+    one when the items are reloaded.
+    """
+
+    def __init__(self, items):
+        self.items = items
+
+        # type (None for every type) -> (sorted costs, item ids in that order)
+        self._by_cost = {}
+        # stat -> (sorted values, item ids in that order)
+        self._by_stat = {}
+        # (stat, type) -> (costs, keys, item ids, max table) for best_affordable
+        self._best = {}
+
+        by_cost = {None: []}
+        by_stat = {}
+        for item_id, item in items.items():
+            entry = (item["cost"], item_id)
+            by_cost[None].append(entry)
+            by_cost.setdefault(item["type"], []).append(entry)
+            for stat_name, value in get_item_effects(item):
+                by_stat.setdefault(stat_name, []).append((value, item["cost"], item_id))
+
+        for item_type, entries in by_cost.items():
+            entries.sort()
+            self._by_cost[item_type] = ([e[0] for e in entries], [e[1] for e in entries])
+
+        for stat_name, entries in by_stat.items():
+            entries.sort()
+            self._by_stat[stat_name] = ([e[0] for e in entries], [e[2] for e in entries])
+
+    def __len__(self):
+        return len(self.items)
+
+    def find(self, item_type=None, min_cost=None, max_cost=None, page=0, page_size=20):
+        """
+        One page of items in a cost range, cheapest first
+
+        Args:
+            item_type: Only items of this type (None for all)
+            min_cost, max_cost: Cost range, inclusive (None for open-ended)
+            page: Page number, starting at 0
+            page_size: Items per page
+
+        Returns: Dictionary with 'items' (list of item dictionaries) and
+                 'total' (number of matching items)
+        """
+        costs, item_ids = self._by_cost.get(item_type, ([], []))
+        lo = 0 if min_cost is None else bisect.bisect_left(costs, min_cost)
+        hi = len(costs) if max_cost is None else bisect.bisect_right(costs, max_cost)
+
+        first = lo + page * page_size
+        page_ids = item_ids[first:min(hi, first + page_size)] if first < hi else []
+        return {"items": [self.items[i] for i in page_ids], "total": max(0, hi - lo)}
+
+    def find_by_stat(self, stat_name, min_value=None, max_value=None, page=0, page_size=20):
+        """
+        One page of items whose effect changes a stat, highest value first
+
+        Args:
+            stat_name: Stat the effect changes (e.g. "strength")
+            min_value, max_value: Value range, inclusive (None for open-ended)
+            page: Page number, starting at 0
+            page_size: Items per page
+
+        Returns: Dictionary with 'items' and 'total', like find
+        """
+        values, item_ids = self._by_stat.get(stat_name, ([], []))
+        lo = 0 if min_value is None else bisect.bisect_left(values, min_value)
+        hi = len(values) if max_value is None else bisect.bisect_right(values, max_value)
+
+        # walk down from the top of the range
+        stop = hi - page * page_size
+        start = max(lo, stop - page_size)
+        page_ids = item_ids[start:stop][::-1] if start < stop else []
+        return {"items": [self.items[i] for i in page_ids], "total": max(0, hi - lo)}
+
+    def best_affordable(self, gold, stat_name, k=1, item_type=None):
+        """
+        The k items with the biggest bonus to a stat that cost at most gold
+
+        Ties go to the cheaper item.
+
+        Returns: List of up to k item dictionaries, best first
+        """
+        costs, keys, item_ids, table = self._best_index(stat_name, item_type)
+        hi = bisect.bisect_right(costs, gold)
+
+        # every heap entry is the best item of a cost-order range; taking
+        # it splits the range in two around it
+        best = []
+        heap = []
+        _push_range_max(heap, table, keys, 0, hi)
+        while len(heap) > 0 and len(best) < k:
+            _, i, lo, hi = heapq.heappop(heap)
+            best.append(self.items[item_ids[i]])
+            _push_range_max(heap, table, keys, lo, i)
+            _push_range_max(heap, table, keys, i + 1, hi)
+
+        return best
+
+    def _best_index(self, stat_name, item_type):
+        """Cost-ordered items with a stat, and their range-maximum table"""
+        key = (stat_name, item_type)
+        if key not in self._best:
+            entries = []
+            for item_id in self._by_cost.get(item_type, ([], []))[1]:
+                item = self.items[item_id]
+                for effect_stat, value in get_item_effects(item):
+                    if effect_stat == stat_name:
+                        entries.append((item["cost"], (value, -item["cost"]), item_id))
+
+            keys = [e[1] for e in entries]
+            self._best[key] = ([e[0] for e in entries], keys, [e[2] for e in entries],
+                               _build_max_table(keys))
+
+        return self._best[key]
+
+def _build_max_table(keys):
+    """Sparse table: table[j][i] is the index of the largest of keys[i:i + 2**j]"""
+    table = [list(range(len(keys)))]
+    width = 1
+
+    while 2 * width <= len(keys):
+        previous = table[-1]
+        row = []
+        for i in range(len(keys) - 2 * width + 1):
+            a = previous[i]
+            b = previous[i + width]
+            row.append(a if keys[a] >= keys[b] else b)
+        table.append(row)
+        width *= 2
+
+    return table
+
+def _push_range_max(heap, table, keys, lo, hi):
+    """Push the largest key in keys[lo:hi] (if the range isn't empty)"""
+    if lo >= hi:
+        return
+
+    level = (hi - lo).bit_length() - 1
+    a = table[level][lo]
+    b = table[level][hi - (1 << level)]
+    i = a if keys[a] >= keys[b] else b
+
+    value, negative_cost = keys[i]
+    heapq.heappush(heap, ((-value, -negative_cost), i, lo, hi))
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -475,6 +1190,54 @@ def parse_item_effect(effect_string):
 
     return stat_name, value
 
+def compile_item_effect(effect):
+    """
+    Compile an effect string into (stat_name, value) pairs
+
+    An item can change several stats, separated by commas:
+    "strength:5,magic:-2". Effects that are already compiled are
+    returned unchanged, so older effect strings stored on a character
+    and compiled tuples can both be passed in.
+
+    Returns: Tuple of (stat_name, value) tuples
+    Example: "health:20" → (("health", 20),)
+    Raises: InvalidItemTypeError if the effect is malformed
+    """
+    if isinstance(effect, tuple):
+        return effect
+
+    return tuple(parse_item_effect(part.strip()) for part in effect.split(","))
+
+def get_item_effects(item_data):
+    """
+    Compiled effects of an item
+
+    Items loaded by game_data carry them in 'effects'; for any other item
+    dictionary the 'effect' string is compiled here.
+
+    Returns: Tuple of (stat_name, value) tuples
+    """
+    effects = item_data.get("effects")
+    if effects is None:
+        effects = compile_item_effect(item_data["effect"])
+    return effects
+
+def apply_item_effects(character, effects, sign=1):
+    """Apply compiled effects to a character (sign=-1 takes them back off)"""
+    # apply_stat_effect inlined; equipment uses _apply_equipment_effects
+    for stat_name, value in effects:
+        character[stat_name] += sign * value
+        if stat_name == "health" and character["health"] > character["max_health"]:
+            character["health"] = character["max_health"]
+
+@functools.lru_cache(maxsize=256)
+def describe_item_effects(effects):
+    """Compiled effects as text, e.g. +strength 5, +magic -2"""
+    # cached: a catalog only has so many effects, and this runs on every equip
+    if len(effects) == 1:
+        return f"+{effects[0][0]} {effects[0][1]}"
+    return ", ".join([f"+{stat_name} {value}" for stat_name, value in effects])
+
 def apply_stat_effect(character, stat_name, value):
     """
     Apply a stat modification to character
@@ -513,11 +1276,7 @@ def display_inventory(character, item_data_dict):
         return
 
     # Count items (because duplicates may exist)
-    item_counts = {}
-    for item_id in inventory:
-        if item_id not in item_counts:
-            item_counts[item_id] = 0
-        item_counts[item_id] += 1
+    item_counts = get_item_counts(inventory)
 
     print("=== INVENTORY ===")
 
@@ -29,6 +29,29 @@ all_quests = {}
 all_items = {}
 game_running = False
 
+# SaveQueue that writes the current character after each action
+save_queue = None
+
+# CatalogWatchers that keep all_quests / all_items up to date (see
+# start_catalog_watchers)
+catalog_watchers = []
+
+# Saved characters shown per page in the load menu
+LOAD_PAGE_SIZE = 10
+
+# Indexed view of all_items for the shop (see get_shop_catalog)
+shop_catalog = None
+
+# QuestGraph of all_quests, rebuilt whenever the quests are (re)loaded
+quest_graph = quest_handler.QuestGraph({})
+
+# QuestTracker of the current character's available quests (see
+# get_quest_tracker)
+quest_tracker = None
+
+# Items shown per page in the shop
+SHOP_PAGE_SIZE = 10
+
 # ============================================================================
 # MAIN MENU
 # ============================================================================
@@ -128,21 +151,40 @@ def load_game():
     load_game_data()
 
     print("\n=== LOAD GAME ===")
-    saved_chars = character_manager.list_saved_characters()
+    page = 0
+    result = character_manager.list_saved_characters_page(page, LOAD_PAGE_SIZE)
 
-    if len(saved_chars) == 0:
+    if result["total"] == 0:
         print("No saved characters found.")
         return
 
-    for i, name in enumerate(saved_chars, 1):
-        print(f"{i}. {name}")
+    page_count = (result["total"] + LOAD_PAGE_SIZE - 1) // LOAD_PAGE_SIZE
 
-    choice = input("Pick a character number: ").strip()
-    while not choice.isdigit() or int(choice) < 1 or int(choice) > len(saved_chars):
-        print("Invalid choice.")
-        choice = input("Pick a character number: ").strip()
+    while True:
+        saved_chars = result["characters"]
+        for i, entry in enumerate(saved_chars, 1):
+            if entry["level"] is None:
+                print(f"{i}. {entry['name']}")
+            else:
+                print(f"{i}. {entry['name']} (Level {entry['level']} {entry['class']})")
+
+        if page_count > 1:
+            print(f"Page {page + 1}/{page_count} - 'n' next page, 'p' previous page")
+
+        choice = input("Pick a character number: ").strip().lower()
+        if choice == "n" and page + 1 < page_count:
+            page += 1
+        elif choice == "p" and page > 0:
+            page -= 1
+        elif choice.isdigit() and 1 <= int(choice) <= len(saved_chars):
+            break
+        else:
+            print("Invalid choice.")
+            continue
+
+        result = character_manager.list_saved_characters_page(page, LOAD_PAGE_SIZE)
 
-    char_name = saved_chars[int(choice) - 1]
+    char_name = saved_chars[int(choice) - 1]["name"]
 
     try:
         current_character = character_manager.load_character(char_name)
@@ -188,6 +230,9 @@ def game_loop():
             print("Goodbye.")
             game_running = False
 
+        if game_running:
+            queue_save()
+
 
 def game_menu():
     """
@@ -250,12 +295,18 @@ def view_inventory():
     print("\n=== INVENTORY ===")
     inventory_system.display_inventory(current_character, all_items)
 
+    equipment = inventory_system.get_equipment(current_character)
+    for slot in inventory_system.EQUIPMENT_SLOTS:
+        if slot in equipment.slots:
+            print(f"Equipped {slot}: {equipment.slots[slot][0]}")
+
     print("\nOptions:")
     print("1. Use an item")
     print("2. Drop an item")
     print("3. Equip weapon")
-    print("4. Equip armor")
-    print("5. Back")
+    print("4. Equip armor (body armor, helmet, boots, ...)")
+    print("5. Unequip a slot")
+    print("6. Back")
 
     choice = input("Choose an option: ").strip()
 
@@ -287,10 +338,18 @@ def view_inventory():
         except Exception as e:
             print(f"Error: {e}")
 
+    elif choice == "5":
+        slot = input(f"Enter slot ({', '.join(inventory_system.EQUIPMENT_SLOTS)}): ").strip().lower()
+        try:
+            if inventory_system.unequip_item(current_character, slot) is None:
+                print("Nothing is equipped there.")
+        except Exception as e:
+            print(f"Error: {e}")
+
 
 def quest_menu():
     """Quest management menu"""
-    global current_character, all_quests
+    global current_character, all_quests, quest_graph
     
     # TODO: Implement quest menu
     # Show:
@@ -319,7 +378,8 @@ def quest_menu():
             quest_handler.display_quest_info(q)
 
     elif choice == "2":
-        available = quest_handler.get_available_quests(current_character, all_quests)
+        available = quest_handler.get_available_quests(current_character, all_quests,
+                                                       get_quest_tracker())
         for q in available:
             quest_handler.display_quest_list([q])
 
@@ -331,7 +391,8 @@ def quest_menu():
     elif choice == "4":
         qid = input("Enter quest_id: ").strip()
         try:
-            quest_handler.accept_quest(current_character, qid, all_quests)
+            quest_handler.accept_quest(current_character, qid, all_quests, quest_graph,
+                                       get_quest_tracker())
             print("Quest accepted.")
         except Exception as e:
             print(f"Error: {e}")
@@ -339,7 +400,7 @@ def quest_menu():
     elif choice == "5":
         qid = input("Enter quest_id: ").strip()
         try:
-            quest_handler.abandon_quest(current_character, qid)
+            quest_handler.abandon_quest(current_character, qid, get_quest_tracker())
             print("Quest abandoned.")
         except Exception as e:
             print(f"Error: {e}")
@@ -347,13 +408,27 @@ def quest_menu():
     elif choice == "6":
         qid = input("Enter quest_id: ").strip()
         try:
-            rewards = quest_handler.complete_quest(current_character, qid, all_quests)
+            rewards = quest_handler.complete_quest(current_character, qid, all_quests,
+                                                   get_quest_tracker())
             print("Quest completed.")
             print(f"XP: {rewards['xp']}")
             print(f"Gold: {rewards['gold']}")
         except Exception as e:
             print(f"Error: {e}")
 
+def get_quest_tracker():
+    """
+    The QuestTracker for current_character
+
+    A new one is built when the character or the quest graph changes.
+    """
+    global quest_tracker
+
+    if quest_tracker is None or quest_tracker.character is not current_character \
+            or quest_tracker.graph is not quest_graph:
+        quest_tracker = quest_handler.QuestTracker(current_character, quest_graph)
+    return quest_tracker
+
 
 def explore():
     """Find and fight random enemies"""
@@ -389,32 +464,119 @@ def shop():
     print("\n--- The General Store ---")
     print(f"You have {current_character['gold']} gold.\n")
 
-    for item_id, data in all_items.items():
-        print(f"{item_id}: {data['name']} - {data['cost']} gold")
+    catalog = get_shop_catalog()
+    print_shop_items(catalog.find(page_size=SHOP_PAGE_SIZE))
 
     print("\nOptions:")
-    print("1. Buy Item")
-    print("2. Sell Item")
-    print("3. Back")
+    print("1. Buy Items")
+    print("2. Sell Items")
+    print("3. Browse Items")
+    print("4. Best Item I Can Afford")
+    print("5. Back")
 
     choice = input("Choose an option: ").strip()
 
     if choice == "1":
-        item_id = input("Enter item_id: ").strip()
+        cart = input("Enter items to buy (e.g. health_potion x2, iron_sword): ")
         try:
-            inventory_system.purchase_item(current_character, item_id, all_items[item_id])
-            print("Purchase successful.")
+            receipt = inventory_system.purchase_items(current_character, parse_cart(cart), all_items)
+            print_receipt(receipt, "Spent")
         except Exception as e:
             print(f"Error: {e}")
 
     elif choice == "2":
-        item_id = input("Enter item_id: ").strip()
+        cart = input("Enter items to sell (e.g. health_potion x2, iron_sword): ")
         try:
-            gold = inventory_system.sell_item(current_character, item_id, all_items[item_id])
-            print(f"Sold for {gold} gold.")
+            receipt = inventory_system.sell_items(current_character, parse_cart(cart), all_items)
+            print_receipt(receipt, "Received")
         except Exception as e:
             print(f"Error: {e}")
 
+    elif choice == "3":
+        item_type = input("Item type (weapon/armor/consumable, blank for all): ").strip().lower()
+        max_cost = input("Highest price (blank for any): ").strip()
+        if max_cost != "" and not max_cost.isdigit():
+            print("Invalid price.")
+            return
+        browse_shop(catalog, item_type or None, int(max_cost) if max_cost else None)
+
+    elif choice == "4":
+        stat_name = input("Which stat (e.g. strength, magic, max_health)? ").strip().lower()
+        best = catalog.best_affordable(current_character["gold"], stat_name, k=3)
+        if len(best) == 0:
+            print("Nothing you can afford improves that stat.")
+        for data in best:
+            print(f"{data['item_id']}: {data['name']} - {data['cost']} gold ({data['effect']})")
+
+def get_shop_catalog():
+    """The ShopCatalog for all_items, rebuilt when all_items is replaced"""
+    global shop_catalog
+
+    if shop_catalog is None or shop_catalog.items is not all_items:
+        shop_catalog = inventory_system.ShopCatalog(all_items)
+    return shop_catalog
+
+def print_shop_items(result):
+    """Print one page of ShopCatalog.find results"""
+    for data in result["items"]:
+        print(f"{data['item_id']}: {data['name']} - {data['cost']} gold")
+    if result["total"] > len(result["items"]):
+        print(f"({result['total'] - len(result['items'])} more - use Browse Items)")
+
+def browse_shop(catalog, item_type, max_cost):
+    """Page through the catalog, cheapest first"""
+    page = 0
+
+    while True:
+        result = catalog.find(item_type, max_cost=max_cost, page=page, page_size=SHOP_PAGE_SIZE)
+        if result["total"] == 0:
+            print("No items match.")
+            return
+
+        page_count = (result["total"] + SHOP_PAGE_SIZE - 1) // SHOP_PAGE_SIZE
+        for data in result["items"]:
+            print(f"{data['item_id']}: {data['name']} - {data['cost']} gold")
+        print(f"Page {page + 1}/{page_count} - 'n' next page, 'p' previous page, anything else to stop")
+
+        choice = input("> ").strip().lower()
+        if choice == "n" and page + 1 < page_count:
+            page += 1
+        elif choice == "p" and page > 0:
+            page -= 1
+        else:
+            return
+
+def parse_cart(text):
+    """
+    Turn "item_a x2, item_b" into [("item_a", 2), ("item_b", 1)]
+
+    Raises: ValueError if a quantity isn't a number or the cart is empty
+    """
+    cart = []
+
+    for entry in text.split(","):
+        entry = entry.strip()
+        if entry == "":
+            continue
+
+        parts = entry.split()
+        if len(parts) == 2 and parts[1].lower().startswith("x"):
+            if not parts[1][1:].isdigit():
+                raise ValueError(f"Invalid quantity: {parts[1]}")
+            cart.append((parts[0], int(parts[1][1:])))
+        else:
+            cart.append((entry, 1))
+
+    if len(cart) == 0:
+        raise ValueError("The cart is empty.")
+    return cart
+
+def print_receipt(receipt, label):
+    """Print the lines and total of a shop receipt"""
+    for line in receipt["lines"]:
+        print(f"{line['name']} x{line['quantity']} @ {line['unit_price']} = {line['subtotal']} gold")
+    print(f"{label} {receipt['total']} gold. You have {receipt['gold']} gold.")
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -431,31 +593,95 @@ def save_game():
         return
 
     try:
-        character_manager.save_character(current_character)
+        queue_save()
+        save_queue.flush()
         print("Game saved.")
     except Exception:
         print("Error saving game.")
 
+def queue_save():
+    """
+    Queue a save of the current character
+
+    Repeated saves are coalesced and written in the background by
+    save_queue; save_game() forces them to disk.
+    """
+    global save_queue
+
+    if current_character is None:
+        return
+
+    if save_queue is None:
+        save_queue = character_manager.SaveQueue()
+
+    save_queue.save(current_character)
+
 def load_game_data():
     """Load all quest and item data from files"""
-    global all_quests, all_items
+    global all_quests, all_items, quest_graph
     
     # TODO: Implement data loading
     # Try to load quests with game_data.load_quests()
     # Try to load items with game_data.load_items()
     # Handle MissingDataFileError, InvalidDataFormatError
     # If files missing, create defaults with game_data.create_default_data_files()
+    if len(catalog_watchers) > 0:
+        # the watchers already hold the latest catalogs, just pick up any
+        # edit they haven't polled yet
+        for watcher in catalog_watchers:
+            watcher.check()
+        return
+
+    # use_cache skips re-parsing the text files when they haven't changed
     try:
-        all_quests = game_data.load_quests("data/quests.txt")
-        all_items = game_data.load_items("data/items.txt")
+        all_quests = game_data.load_quests("data/quests.txt", use_cache=True)
+        all_items = game_data.load_items("data/items.txt", use_cache=True)
     except MissingDataFileError:
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests("data/quests.txt")
-        all_items = game_data.load_items("data/items.txt")
+        all_quests = game_data.load_quests("data/quests.txt", use_cache=True)
+        all_items = game_data.load_items("data/items.txt", use_cache=True)
     except InvalidDataFormatError:
         all_quests = {}
         all_items = {}
 
+    quest_graph = quest_handler.QuestGraph(all_quests)
+
+def start_catalog_watchers(interval=2.0):
+    """
+    Reload quests and items in the background when their files change
+
+    Swaps new catalogs into all_quests / all_items, so an edited data file
+    is picked up without restarting the game.
+    """
+    if len(catalog_watchers) > 0:
+        return
+
+    try:
+        quest_watcher = game_data.CatalogWatcher(
+            "data/quests.txt", "quest", _set_all_quests, interval, use_cache=True
+        )
+        item_watcher = game_data.CatalogWatcher(
+            "data/items.txt", "item", _set_all_items, interval, use_cache=True
+        )
+    except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
+        print(f"Catalog reloading disabled: {e}")
+        return
+
+    for watcher in [quest_watcher, item_watcher]:
+        watcher.start()
+        catalog_watchers.append(watcher)
+
+def _set_all_quests(quests):
+    """Swap in a reloaded quest catalog"""
+    global all_quests, quest_graph
+    quest_graph = quest_handler.QuestGraph(quests)
+    all_quests = quests
+
+def _set_all_items(items):
+    """Swap in a reloaded item catalog"""
+    global all_items
+    all_items = items
+
 def handle_character_death():
     """Handle character death"""
     global current_character, game_running
@@ -477,15 +703,17 @@ def handle_character_death():
         if current_character["gold"] < 25:
             print("Not enough gold. Game over.")
             game_running = False
-            return
-
-        current_character["gold"] -= 25
-        character_manager.revive_character(current_character)
-        print("Revived.")
+        else:
+            current_character["gold"] -= 25
+            character_manager.revive_character(current_character)
+            print("Revived.")
     else:
         print("Goodbye.")
         game_running = False
 
+    # death is a checkpoint: make sure it's on disk either way
+    save_game()
+
 
 def display_welcome():
     """Display welcome message"""
@@ -506,6 +734,7 @@ def main():
     
     # Load game data
     load_game_data()
+    start_catalog_watchers()
 
     while True:
         choice = main_menu()
@@ -518,6 +747,12 @@ def main():
             print("Thanks for playing.")
             break
 
+    for watcher in catalog_watchers:
+        watcher.stop()
+
+    if save_queue is not None:
+        save_queue.close()
+
 if __name__ == "__main__":
     main()
 
@@ -9,6 +9,7 @@ AI Usage: AI was used to make Readme, help make variable names, and make comment
 This module handles quest management, dependencies, and completion.
 """
 
+import bisect
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
@@ -20,11 +21,118 @@ from custom_exceptions import (
 from character_manager import gain_experience, add_gold
 
 
+# ============================================================================
+# QUEST LISTS
+# ============================================================================
+
+class QuestList(list):
+    """
+    A character's active or completed quest ids, with O(1) membership
+
+    Still a list (saved, compared, copied and iterated exactly like one),
+    but it also keeps a count per quest id, so "quest_id in quest_ids"
+    doesn't scan. Every list method that adds or removes ids keeps the
+    counts up to date.
+    """
+
+    __slots__ = ("_counts",)
+
+    def __init__(self, quest_ids=()):
+        super().__init__(quest_ids)
+        self._counts = {}
+        self._add(self)
+
+    def _add(self, quest_ids):
+        for quest_id in quest_ids:
+            self._counts[quest_id] = self._counts.get(quest_id, 0) + 1
+
+    def _discard(self, quest_ids):
+        for quest_id in quest_ids:
+            count = self._counts[quest_id]
+            if count == 1:
+                del self._counts[quest_id]
+            else:
+                self._counts[quest_id] = count - 1
+
+    def __contains__(self, quest_id):
+        try:
+            return quest_id in self._counts
+        except TypeError:
+            # unhashable: a list would compare and find nothing
+            return False
+
+    def append(self, quest_id):
+        super().append(quest_id)
+        self._add((quest_id,))
+
+    def extend(self, quest_ids):
+        quest_ids = list(quest_ids)
+        super().extend(quest_ids)
+        self._add(quest_ids)
+
+    def insert(self, index, quest_id):
+        super().insert(index, quest_id)
+        self._add((quest_id,))
+
+    def remove(self, quest_id):
+        super().remove(quest_id)
+        self._discard((quest_id,))
+
+    def pop(self, index=-1):
+        quest_id = super().pop(index)
+        self._discard((quest_id,))
+        return quest_id
+
+    def clear(self):
+        super().clear()
+        self._counts.clear()
+
+    def __setitem__(self, index, value):
+        old = self[index]
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._discard(old)
+            self._add(value)
+        else:
+            super().__setitem__(index, value)
+            self._discard((old,))
+            self._add((value,))
+
+    def __delitem__(self, index):
+        old = self[index]
+        super().__delitem__(index)
+        self._discard(old if isinstance(index, slice) else (old,))
+
+    def __iadd__(self, quest_ids):
+        self.extend(quest_ids)
+        return self
+
+    def __imul__(self, times):
+        super().__imul__(times)
+        self._counts.clear()
+        self._add(self)
+        return self
+
+    def copy(self):
+        return QuestList(self)
+
+    def __reduce__(self):
+        return (QuestList, (list(self),))
+
+def _quest_list(character, key):
+    """character[key] as a QuestList, replacing a plain list the first time"""
+    quest_ids = character[key]
+    if not isinstance(quest_ids, QuestList):
+        quest_ids = QuestList(quest_ids)
+        character[key] = quest_ids
+    return quest_ids
+
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
 
-def accept_quest(character, quest_id, quests):
+def accept_quest(character, quest_id, quests, graph=None, tracker=None):
     """
     Accept a new quest
     
@@ -32,18 +140,26 @@ def accept_quest(character, quest_id, quests):
         character: Character dictionary
         quest_id: Quest to accept
         quest_data_dict: Dictionary of all quest data
+        graph: QuestGraph of the quests (optional); quests on a
+               prerequisite cycle are then refused up front
+        tracker: The character's QuestTracker (optional); it's updated,
+                 and a quest it lists as available is accepted at once
     
     Requirements to accept quest:
     - Character level >= quest required_level
     - Prerequisite quest completed (if any)
     - Quest not already completed
     - Quest not already active
+
+    The character's quest lists become QuestLists, so each of these
+    checks is a dictionary lookup however many quests they hold.
     
     Returns: True if quest accepted
     Raises:
         QuestNotFoundError if quest_id not in quest_data_dict
         InsufficientLevelError if character level too low
-        QuestRequirementsNotMetError if prerequisite not completed
+        QuestRequirementsNotMetError if prerequisite not completed (or
+                                     the prerequisites form a cycle)
         QuestAlreadyCompletedError if quest already done
     """
     # TODO: Implement quest acceptance
@@ -56,15 +172,26 @@ def accept_quest(character, quest_id, quests):
     if quest_id not in quests:
         raise QuestNotFoundError("Quest does not exist.")
 
+    active = _quest_list(character, "active_quests")
+
+    if tracker is not None and tracker.is_available(quest_id):
+        active.append(quest_id)
+        tracker.accepted(quest_id)
+        return True
+
     quest = quests[quest_id]
+    completed = _quest_list(character, "completed_quests")
 
     # if already finished, cannot accept again
-    if quest_id in character["completed_quests"]:
+    if quest_id in completed:
         raise QuestAlreadyCompletedError("Quest already completed.")
 
     # check prerequisite requirement
+    if graph is not None and quest_id in graph.cyclic:
+        raise QuestRequirementsNotMetError("Quest prerequisites form a cycle.")
+
     prereq = quest.get("prerequisite", "NONE")
-    if prereq != "NONE" and prereq not in character["completed_quests"]:
+    if prereq != "NONE" and prereq not in completed:
         raise QuestRequirementsNotMetError("Missing prerequisite quest.")
 
     # character level too low
@@ -72,15 +199,17 @@ def accept_quest(character, quest_id, quests):
         raise InsufficientLevelError("Not high enough level for this quest.")
 
     # cannot accept an already active quest
-    if quest_id in character["active_quests"]:
+    if quest_id in active:
         raise QuestRequirementsNotMetError("Quest already active.")
 
     # add quest to active list
-    character["active_quests"].append(quest_id)
+    active.append(quest_id)
+    if tracker is not None:
+        tracker.accepted(quest_id)
     return True
 
 
-def complete_quest(character, quest_id, quests):
+def complete_quest(character, quest_id, quests, tracker=None):
     """
     Complete an active quest and grant rewards
     
@@ -88,6 +217,7 @@ def complete_quest(character, quest_id, quests):
         character: Character dictionary
         quest_id: Quest to complete
         quest_data_dict: Dictionary of all quest data
+        tracker: The character's QuestTracker to update (optional)
     
     Rewards:
     - Experience points (reward_xp)
@@ -108,15 +238,19 @@ def complete_quest(character, quest_id, quests):
     if quest_id not in quests:
         raise QuestNotFoundError("Quest does not exist.")
 
+    active = _quest_list(character, "active_quests")
+
     # can only complete if it's active
-    if quest_id not in character["active_quests"]:
+    if quest_id not in active:
         raise QuestNotActiveError("Quest is not active.")
 
     quest = quests[quest_id]
 
     # remove from active and move to completed
-    character["active_quests"].remove(quest_id)
-    character["completed_quests"].append(quest_id)
+    active.remove(quest_id)
+    _quest_list(character, "completed_quests").append(quest_id)
+    if tracker is not None:
+        tracker.completed(quest_id)
 
     # give rewards
     xp = quest["reward_xp"]
@@ -128,18 +262,23 @@ def complete_quest(character, quest_id, quests):
     return {"xp": xp, "gold": gold}
 
 
-def abandon_quest(character, quest_id):
+def abandon_quest(character, quest_id, tracker=None):
     """
     Remove a quest from active quests without completing it
+
+    tracker is the character's QuestTracker to update (optional).
     
     Returns: True if abandoned
     Raises: QuestNotActiveError if quest not active
     """
     # TODO: Implement quest abandonment
-    if quest_id not in character["active_quests"]:
+    active = _quest_list(character, "active_quests")
+    if quest_id not in active:
         raise QuestNotActiveError("Quest is not active.")
 
-    character["active_quests"].remove(quest_id)
+    active.remove(quest_id)
+    if tracker is not None:
+        tracker.abandoned(quest_id)
     return True
 
 
@@ -174,30 +313,38 @@ def get_completed_quests(character, quests):
     # TODO: Implement completed quest retrieval
     return [quests[q] for q in character["completed_quests"] if q in quests]
 
-def get_available_quests(character, quests):
+def get_available_quests(character, quests, tracker=None):
     """
     Get quests that character can currently accept
     
     Available = meets level req + prerequisite done + not completed + not active
+
+    With the character's QuestTracker the list comes straight from it
+    instead of checking every quest.
     
     Returns: List of quest dictionaries
     """
     # TODO: Implement available quest search
     # Filter all quests by requirements
+    if tracker is not None:
+        return tracker.available_quests()
+
     available = []
+    completed = _quest_list(character, "completed_quests")
+    active = _quest_list(character, "active_quests")
 
     for qid, quest in quests.items():
 
-        if qid in character["completed_quests"]:
+        if qid in completed:
             continue
-        if qid in character["active_quests"]:
+        if qid in active:
             continue
 
         if character["level"] < quest["required_level"]:
             continue
 
         prereq = quest["prerequisite"]
-        if prereq != "NONE" and prereq not in character["completed_quests"]:
+        if prereq != "NONE" and prereq not in completed:
             continue
 
         available.append(quest)
@@ -215,7 +362,7 @@ def is_quest_completed(character, quest_id):
     Returns: True if completed, False otherwise
     """
     # TODO: Implement completion check
-    return quest_id in character["completed_quests"]
+    return quest_id in _quest_list(character, "completed_quests")
 
 def is_quest_active(character, quest_id):
     """
@@ -224,11 +371,14 @@ def is_quest_active(character, quest_id):
     Returns: True if active, False otherwise
     """
     # TODO: Implement active check
-    return quest_id in character["active_quests"]
+    return quest_id in _quest_list(character, "active_quests")
 
-def can_accept_quest(character, quest_id, quests):
+def can_accept_quest(character, quest_id, quests, graph=None):
     """
     Check if character meets all requirements to accept quest
+
+    graph is an optional QuestGraph of the quests, as for accept_quest.
+    As there, the completed and active checks are QuestList lookups.
     
     Returns: True if can accept, False otherwise
     Does NOT raise exceptions - just returns boolean
@@ -239,44 +389,59 @@ def can_accept_quest(character, quest_id, quests):
         return False
 
     quest = quests[quest_id]
+    completed = _quest_list(character, "completed_quests")
 
-    if quest_id in character["completed_quests"]:
+    if quest_id in completed:
         return False
-    if quest_id in character["active_quests"]:
+    if quest_id in _quest_list(character, "active_quests"):
         return False
     if character["level"] < quest["required_level"]:
         return False
+    if graph is not None and quest_id in graph.cyclic:
+        return False
 
     prereq = quest["prerequisite"]
-    if prereq != "NONE" and prereq not in character["completed_quests"]:
+    if prereq != "NONE" and prereq not in completed:
         return False
 
     return True
 
-def get_quest_prerequisite_chain(quest_id, quests):
+def get_quest_prerequisite_chain(quest_id, quests, graph=None):
     """
     Get the full chain of prerequisites for a quest
+
+    With a QuestGraph of the quests, chains are looked up (and remembered)
+    there instead of followed from scratch.
     
     Returns: List of quest IDs in order [earliest_prereq, ..., quest_id]
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
-    Raises: QuestNotFoundError if quest doesn't exist
+    Raises:
+        QuestNotFoundError if quest doesn't exist
+        QuestRequirementsNotMetError if the prerequisites form a cycle
     """
     # TODO: Implement prerequisite chain tracing
     # Follow prerequisite links backwards
     # Build list in reverse order
+    if graph is not None:
+        return list(graph.chain(quest_id))
+
     if quest_id not in quests:
         raise QuestNotFoundError("Quest not found.")
 
     chain = []
+    seen = set()
     current = quest_id
 
     while True:
         if current not in quests:
             raise QuestNotFoundError("Invalid quest in chain.")
+        if current in seen:
+            raise QuestRequirementsNotMetError("Quest prerequisites form a cycle.")
 
-        chain.insert(0, current)
+        chain.append(current)
+        seen.add(current)
 
         prereq = quests[current]["prerequisite"]
         if prereq == "NONE":
@@ -284,6 +449,8 @@ def get_quest_prerequisite_chain(quest_id, quests):
 
         current = prereq
 
+    # built from the quest back to the first prerequisite
+    chain.reverse()
     return chain
 
 # ============================================================================
@@ -384,6 +551,223 @@ def display_character_quest_progress(character, quests):
     print(f"Total XP earned: {rewards['total_xp']}")
     print(f"Total Gold earned: {rewards['total_gold']}")
 
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Prerequisite links between quests, indexed once per quest catalog
+
+    Every quest has at most one prerequisite, so the links form trees
+    hanging off the quests with prerequisite "NONE". Building the graph
+    follows each link once and sorts the quests into:
+
+        order    - every quest whose chain is sound, each one after its
+                   prerequisite (topological order)
+        missing  - quest_id -> the missing quest its chain runs into
+        cyclic   - quests whose chain loops back on itself; they can
+                   never be accepted
+
+    unlocks(quest_id) gives the reverse links, and quests_between_levels
+    finds the quests opened up by a level-up. chain() only walks up to
+    the nearest ancestor whose chain it has already worked out.
+
+    The graph doesn't notice changes to the quest dictionary; build a new
+    one when the quests are reloaded.
+    """
+
+    def __init__(self, quests):
+        self.quests = quests
+        self.order = []
+        self.missing = {}
+        self.cyclic = set()
+
+        # quest_id -> quests that need it as their prerequisite
+        self._unlocks = {}
+        # quest_id -> tuple chain, for every chain asked for so far
+        self._chains = {}
+        # quest ids sorted by required level, and those levels
+        self._level_order = sorted(quests, key=lambda quest_id: quests[quest_id]["required_level"])
+        self._levels = [quests[quest_id]["required_level"] for quest_id in self._level_order]
+
+        roots = []
+        for quest_id, quest in quests.items():
+            prereq = quest.get("prerequisite", "NONE")
+            if prereq == "NONE":
+                roots.append(quest_id)
+            elif prereq in quests:
+                self._unlocks.setdefault(prereq, []).append(quest_id)
+            else:
+                self.missing[quest_id] = prereq
+
+        # a quest is placed once its prerequisite has been, so anything
+        # never reached is on (or behind) a cycle
+        for quest_id in roots:
+            self._walk_down(quest_id, self.order)
+
+        dangling = []
+        for quest_id in list(self.missing):
+            self._walk_down(quest_id, dangling)
+        for quest_id in dangling:
+            if quest_id not in self.missing:
+                self.missing[quest_id] = self.missing[quests[quest_id]["prerequisite"]]
+
+        if len(self.order) + len(dangling) < len(quests):
+            placed = set(self.order)
+            placed.update(dangling)
+            self.cyclic = set(quests) - placed
+
+    def _walk_down(self, quest_id, placed):
+        """Add quest_id and everything it unlocks to placed, parents first"""
+        start = len(placed)
+        placed.append(quest_id)
+        while start < len(placed):
+            placed.extend(self._unlocks.get(placed[start], ()))
+            start += 1
+
+    def unlocks(self, quest_id):
+        """Quest IDs that have quest_id as their prerequisite"""
+        return self._unlocks.get(quest_id, ())
+
+    def quests_between_levels(self, low, high):
+        """Quest IDs with low < required_level <= high"""
+        start = bisect.bisect_right(self._levels, low)
+        stop = bisect.bisect_right(self._levels, high)
+        return self._level_order[start:stop]
+
+    def chain(self, quest_id):
+        """
+        Prerequisite chain of a quest
+
+        Returns: Tuple of quest IDs (earliest_prereq, ..., quest_id)
+        Raises:
+            QuestNotFoundError if the quest, or a quest in its chain,
+                               doesn't exist
+            QuestRequirementsNotMetError if the chain is a cycle
+        """
+        chain = self._chains.get(quest_id)
+        if chain is not None:
+            return chain
+
+        if quest_id not in self.quests:
+            raise QuestNotFoundError("Quest not found.")
+        if quest_id in self.missing:
+            raise QuestNotFoundError("Invalid quest in chain.")
+        if quest_id in self.cyclic:
+            raise QuestRequirementsNotMetError("Quest prerequisites form a cycle.")
+
+        # walk up to the first quest with a known chain (or the root)
+        path = []
+        current = quest_id
+        while current != "NONE" and current not in self._chains:
+            path.append(current)
+            current = self.quests[current].get("prerequisite", "NONE")
+
+        base = () if current == "NONE" else self._chains[current]
+        path.reverse()
+        chain = base + tuple(path)
+        self._chains[quest_id] = chain
+        return chain
+
+# ============================================================================
+# QUEST AVAILABILITY
+# ============================================================================
+
+class QuestTracker:
+    """
+    The quests one character can accept right now, kept up to date
+
+    Built from a QuestGraph, then told about every accept, complete and
+    abandon by passing it to accept_quest, complete_quest and
+    abandon_quest. Each change only rechecks the quests it can affect:
+    completing a quest checks the quests it unlocks, and a level-up checks
+    the quests whose required level was passed. Level-ups are noticed the
+    next time the tracker is read, so gain_experience needs no hook.
+    Listing the available quests takes time proportional to how many
+    there are.
+
+    Changes made to the character's quest lists without telling the
+    tracker aren't seen until rebuild() is called.
+    """
+
+    def __init__(self, character, graph):
+        self.character = character
+        self.graph = graph
+        self.rebuild()
+
+    def rebuild(self):
+        """Work out the available quests from scratch"""
+        self._completed = set(self.character["completed_quests"])
+        self._active = set(self.character["active_quests"])
+        self._level = self.character["level"]
+
+        # quest_id -> True; a dict rather than a set to keep a stable order
+        self._available = {}
+        for quest_id in self.graph.quests:
+            self._check(quest_id)
+
+    def is_available(self, quest_id):
+        """True if the character can accept the quest right now"""
+        self._sync_level()
+        return quest_id in self._available
+
+    def available_quests(self):
+        """List of quest dictionaries the character can accept"""
+        self._sync_level()
+        quests = self.graph.quests
+        return [quests[quest_id] for quest_id in self._available]
+
+    def accepted(self, quest_id):
+        """Record that a quest was accepted"""
+        self._active.add(quest_id)
+        self._available.pop(quest_id, None)
+
+    def completed(self, quest_id):
+        """Record that a quest was completed"""
+        self._active.discard(quest_id)
+        self._completed.add(quest_id)
+        self._available.pop(quest_id, None)
+
+        for unlocked_id in self.graph.unlocks(quest_id):
+            self._check(unlocked_id)
+
+    def abandoned(self, quest_id):
+        """Record that a quest was abandoned"""
+        self._active.discard(quest_id)
+        self._check(quest_id)
+
+    def _check(self, quest_id):
+        """Add a quest to the available quests if it can be accepted"""
+        quest = self.graph.quests.get(quest_id)
+
+        if quest is None or quest_id in self._completed or quest_id in self._active:
+            return
+        if self._level < quest["required_level"] or quest_id in self.graph.cyclic:
+            return
+
+        prereq = quest.get("prerequisite", "NONE")
+        if prereq != "NONE" and prereq not in self._completed:
+            return
+
+        self._available[quest_id] = True
+
+    def _sync_level(self):
+        """Catch up with the character's level"""
+        level = self.character["level"]
+        if level == self._level:
+            return
+
+        if level < self._level:
+            # levels don't normally go down; just start over
+            self.rebuild()
+            return
+
+        previous = self._level
+        self._level = level
+        for quest_id in self.graph.quests_between_levels(previous, level):
+            self._check(quest_id)
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -392,10 +776,13 @@ def validate_quest_prerequisites(quests):
     """
     Validate that all quest prerequisites exist
     
-    Checks that every prerequisite (that's not "NONE") refers to a real quest
+    Checks that every prerequisite (that's not "NONE") refers to a real quest,
+    and that no chain of prerequisites loops back on itself
     
     Returns: True if all valid
-    Raises: QuestNotFoundError if invalid prerequisite found
+    Raises:
+        QuestNotFoundError if invalid prerequisite found
+        QuestRequirementsNotMetError if prerequisites form a cycle
     """
     # TODO: Implement prerequisite validation
     # Check each quest's prerequisite
@@ -404,6 +791,12 @@ def validate_quest_prerequisites(quests):
         prereq = quest["prerequisite"]
         if prereq != "NONE" and prereq not in quests:
             raise QuestNotFoundError("Invalid prerequisite found.")
+
+    graph = QuestGraph(quests)
+    if len(graph.cyclic) > 0:
+        raise QuestRequirementsNotMetError(
+            f"Quest prerequisites form a cycle: {', '.join(sorted(graph.cyclic))}"
+        )
     return True
 
 
@@ -0,0 +1,139 @@
+"""
+Test Character Records
+Tests for the Character record type and character stat operations
+"""
+
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import inventory_system
+
+# ============================================================================
+# CHARACTER RECORD TESTS
+# ============================================================================
+
+def test_character_record_acts_like_dict():
+    """Test that a Character supports the dictionary operations modules use"""
+    char = character_manager.create_character("RecordTest", "Rogue")
+
+    assert isinstance(char, character_manager.Character)
+    assert char["class"] == "Rogue"
+    assert list(char) == character_manager.CHARACTER_FIELDS
+    assert "equipped_weapon" not in char
+    assert char.get("equipped_weapon") is None
+
+    char["health"] -= 10
+    char["equipped_weapon"] = "dagger"
+    char["title"] = "the Quick"
+
+    assert char["health"] == 80
+    assert "equipped_weapon" in char
+    assert char["title"] == "the Quick"
+    assert char == char.to_dict()
+
+    with pytest.raises(KeyError):
+        char["nonexistent"]
+
+def test_character_record_works_with_other_modules(tmp_path):
+    """Test equipping, saving and loading a Character record"""
+    char = character_manager.create_character("RecordSave", "Warrior")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.equip_weapon(char, "iron_sword", {"type": "weapon", "effect": "strength:5"})
+    assert char["strength"] == 20
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("RecordSave", str(tmp_path))
+
+    assert isinstance(loaded, character_manager.Character)
+    assert loaded["strength"] == 20
+    assert loaded["inventory"] == []
+
+# ============================================================================
+# CHARACTER ROSTER TESTS
+# ============================================================================
+
+def make_characters(count, seed):
+    """Create characters of mixed classes, levels and health"""
+    rng = random.Random(seed)
+    classes = ["Warrior", "Mage", "Rogue", "Cleric"]
+    characters = []
+    for i in range(count):
+        char = character_manager.create_character(f"Hero{i}", classes[i % 4])
+        character_manager.gain_experience(char, rng.randint(0, 5000))
+        char["health"] = rng.choice([0, 1, char["max_health"] // 2])
+        characters.append(char)
+    return characters
+
+def test_roster_bulk_operations_match_scalar_functions():
+    """Test that bulk roster updates give the same stats as the scalar ones"""
+    scalar = make_characters(40, seed=7)
+    bulk = make_characters(40, seed=7)
+    roster = character_manager.CharacterRoster(bulk)
+
+    skipped = roster.bulk_gain_experience(2750)
+    roster.bulk_add_gold(30)
+    healed = roster.bulk_heal(25)
+    roster.update_characters(bulk)
+
+    expected_skipped = []
+    for row, char in enumerate(scalar):
+        try:
+            character_manager.gain_experience(char, 2750)
+        except CharacterDeadError:
+            expected_skipped.append(row)
+        character_manager.add_gold(char, 30)
+        assert healed[row] == character_manager.heal_character(char, 25)
+
+    assert skipped == expected_skipped
+    assert [c.to_dict() for c in bulk] == [c.to_dict() for c in scalar]
+
+def test_roster_bulk_add_gold_is_all_or_nothing():
+    """Test that a charge one character can't pay leaves every row unchanged"""
+    characters = make_characters(5, seed=1)
+    characters[3]["gold"] = 10
+    roster = character_manager.CharacterRoster(characters)
+
+    with pytest.raises(ValueError):
+        roster.bulk_add_gold(-50)
+
+    assert [roster.get_stat(row, "gold") for row in range(5)] == [c["gold"] for c in characters]
+
+# ============================================================================
+# LEVEL UP TESTS
+# ============================================================================
+
+def test_closed_form_level_ups_match_loop():
+    """Test the closed-form level up against the loop on random inputs"""
+    rng = random.Random(163)
+    for _ in range(5000):
+        level = rng.choice([rng.randint(-2, 3), rng.randint(1, 100), rng.randint(1, 10**6)])
+        experience = rng.choice([rng.randint(-300, 300), rng.randint(0, 10**6)])
+
+        assert (character_manager.calculate_level_ups(level, experience)
+                == character_manager._calculate_level_ups_loop(level, experience))
+
+    # exact boundaries: 100 + 200 + 300 XP takes level 1 to level 4
+    assert character_manager.calculate_level_ups(1, 600) == (4, 0, 3)
+    assert character_manager.calculate_level_ups(1, 599) == (3, 299, 2)
+
+def test_huge_experience_grant():
+    """Test that a million-level grant resolves without looping per level"""
+    char = character_manager.create_character("Admin", "Cleric")
+    xp = 100 * (10**6 * (10**6 + 1) // 2) + 42
+
+    character_manager.gain_experience(char, xp)
+
+    assert char["level"] == 10**6 + 1
+    assert char["experience"] == 42
+    assert char["strength"] == 10 + 2 * 10**6
+    assert char["health"] == char["max_health"] == 100 + 10 * 10**6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,252 @@
+"""
+Test Game Data Loading
+Tests for the catalog loading features in game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+import inventory_system
+
+ITEM_BLOCK = (
+    "ITEM_ID: {item_id}\n"
+    "NAME: {item_id} name\n"
+    "TYPE: consumable\n"
+    "EFFECT: health:{value}\n"
+    "COST: {value}\n"
+    "DESCRIPTION: A test item\n"
+)
+
+
+def write_items(path, values):
+    """Write an item file with one consumable per (item_id, value) pair"""
+    with open(path, "w") as f:
+        f.write("\n".join(ITEM_BLOCK.format(item_id=i, value=v) for i, v in values))
+
+# ============================================================================
+# COMPILED CATALOG CACHE TESTS
+# ============================================================================
+
+def test_cache_is_written_and_reused(tmp_path):
+    """Test that a fresh compiled cache is used instead of the text file"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("potion", 20)])
+
+    items = game_data.load_items(path, use_cache=True)
+    assert os.path.exists(game_data.get_catalog_cache_path(path))
+    assert game_data.load_catalog_cache(path, "item") == items
+    assert game_data.load_catalog_cache(path, "quest") is None
+    assert game_data.load_items(path, use_cache=True) == items
+
+def test_cache_is_ignored_when_source_changes(tmp_path):
+    """Test that editing the text file invalidates the compiled cache"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("potion", 20)])
+    game_data.load_items(path, use_cache=True)
+
+    write_items(path, [("potion", 20), ("elixir", 35)])
+
+    assert game_data.load_catalog_cache(path, "item") is None
+    items = game_data.load_items(path, use_cache=True)
+    assert set(items) == {"potion", "elixir"}
+
+def test_corrupted_cache_falls_back_to_text(tmp_path):
+    """Test that an unreadable cache file is treated as a cache miss"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("potion", 20)])
+    with open(game_data.get_catalog_cache_path(path), "wb") as f:
+        f.write(b"not a cache")
+
+    items = game_data.load_items(path, use_cache=True)
+    assert items["potion"]["cost"] == 20
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_items_yields_blocks_in_order(tmp_path):
+    """Test that iter_items yields one validated item per block"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("potion", 20), ("elixir", 35)])
+
+    items = list(game_data.iter_items(path))
+
+    assert [item["item_id"] for item in items] == ["potion", "elixir"]
+    assert items[1]["cost"] == 35
+    assert game_data.load_items(path) == {item["item_id"]: item for item in items}
+
+def test_iter_quests_reports_line_number(tmp_path):
+    """Test that a bad block is reported with the line it starts on"""
+    path = str(tmp_path / "quests.txt")
+    with open(path, "w") as f:
+        f.write(
+            "QUEST_ID: first\nTITLE: First\nDESCRIPTION: d\nREWARD_XP: 10\n"
+            "REWARD_GOLD: 5\nREQUIRED_LEVEL: 1\nPREREQUISITE: NONE\n"
+            "\n\n"
+            "QUEST_ID: second\nREWARD_XP: lots\n"
+        )
+
+    quests = game_data.iter_quests(path)
+    assert next(quests)["quest_id"] == "first"
+    with pytest.raises(InvalidDataFormatError, match="line 10"):
+        next(quests)
+
+def test_iter_items_missing_file_raises_immediately():
+    """Test that a missing file is reported before iteration starts"""
+    with pytest.raises(MissingDataFileError):
+        game_data.iter_items("nonexistent_items.txt")
+
+# ============================================================================
+# PARALLEL LOADING TESTS
+# ============================================================================
+
+def test_parallel_load_matches_serial_load(tmp_path, monkeypatch):
+    """Test that a process pool load returns the same catalog"""
+    monkeypatch.setattr(game_data, "MIN_PARALLEL_CHUNK_BYTES", 512)
+    path = str(tmp_path / "items.txt")
+    write_items(path, [(f"item_{i}", i + 1) for i in range(300)])
+
+    assert len(game_data._split_catalog_file(path, "item", 8)) > 1
+    assert game_data.load_items(path, workers=4) == game_data.load_items(path)
+
+def test_parallel_load_reports_errors_like_serial_load(tmp_path, monkeypatch):
+    """Test duplicate ids and bad blocks keep their real line numbers"""
+    monkeypatch.setattr(game_data, "MIN_PARALLEL_CHUNK_BYTES", 512)
+    path = str(tmp_path / "items.txt")
+    values = [(f"item_{i}", i + 1) for i in range(300)]
+
+    write_items(path, values + [("item_3", 1)])
+    with pytest.raises(InvalidDataFormatError, match="line 2101: Duplicate item_id"):
+        game_data.load_items(path, workers=4)
+
+    write_items(path, values)
+    with open(path, "a") as f:
+        f.write("\nITEM_ID: broken\nCOST: free\n")
+    with pytest.raises(InvalidDataFormatError, match="line 2101"):
+        game_data.load_items(path, workers=4)
+    with pytest.raises(InvalidDataFormatError, match="line 2101"):
+        game_data.load_items(path)
+
+# ============================================================================
+# LAZY ITEM CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_matches_load_items(tmp_path):
+    """Test that the lazy catalog exposes the same items as load_items"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [(f"item_{i}", i + 1) for i in range(10)])
+
+    with game_data.LazyItemCatalog(path, cache_size=3) as catalog:
+        assert len(catalog) == 10
+        assert "item_4" in catalog
+        assert "missing" not in catalog
+        assert catalog.get("missing") is None
+        assert dict(catalog) == game_data.load_items(path)
+        assert len(catalog._cache) == 3
+
+def test_lazy_catalog_uses_the_same_ids_as_load_items(tmp_path):
+    """Test key case, spacing and trailing whitespace around item ids"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("plain", 1)])
+    with open(path, "a") as f:
+        f.write("\n" + ITEM_BLOCK.format(item_id="x", value=2).replace("ITEM_ID: x", "item_id: lower"))
+        f.write("\n" + ITEM_BLOCK.format(item_id="x", value=3).replace("ITEM_ID: x", "Item_Id:  spaced  "))
+
+    items = game_data.load_items(path)
+    with game_data.LazyItemCatalog(path) as catalog:
+        assert set(catalog) == set(items) == {"plain", "lower", " spaced"}
+        assert dict(catalog) == items
+
+def test_lazy_catalog_decodes_on_first_access(tmp_path, capsys):
+    """Test that only looked-up items are parsed and invalid ones fail then"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("potion", 20)])
+    with open(path, "a") as f:
+        f.write("\nITEM_ID: broken\nCOST: free\n")
+
+    catalog = game_data.LazyItemCatalog(path)
+    char = {"inventory": ["potion", "potion"]}
+    inventory_system.display_inventory(char, catalog)
+
+    assert "x2" in capsys.readouterr().out
+    with pytest.raises(InvalidDataFormatError, match="line 8"):
+        catalog["broken"]
+    catalog.close()
+
+def test_lazy_catalog_rejects_duplicate_ids(tmp_path):
+    """Test that duplicate ids are caught while building the index"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("potion", 20), ("potion", 30)])
+
+    with pytest.raises(InvalidDataFormatError, match="Duplicate item_id"):
+        game_data.LazyItemCatalog(path)
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_watcher_reparses_only_changed_blocks(tmp_path):
+    """Test that a reload reuses records for unchanged blocks"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [(f"item_{i}", i + 1) for i in range(5)])
+    swapped = []
+
+    watcher = game_data.CatalogWatcher(path, "item", on_reload=swapped.append)
+    old_catalog = watcher.catalog
+    assert watcher.blocks_parsed == 5
+    assert watcher.check() == False
+
+    write_items(path, [(f"item_{i}", i + 1) for i in range(4)] + [("item_4", 99), ("new", 7)])
+    assert watcher.check() == True
+
+    assert watcher.blocks_parsed == 2
+    assert watcher.catalog["item_4"]["cost"] == 99
+    assert watcher.catalog["item_0"] is old_catalog["item_0"]
+    assert old_catalog["item_4"]["cost"] == 5
+    assert swapped == [old_catalog, watcher.catalog]
+
+def test_watcher_starts_from_compiled_cache(tmp_path, monkeypatch):
+    """Test that a watcher seeded from a fresh cache parses nothing until an edit"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [(f"item_{i}", i + 1) for i in range(5)])
+    items = game_data.load_items(path, use_cache=True)
+
+    parsed = []
+    parse_record = game_data._parse_record
+    monkeypatch.setattr(game_data, "_parse_record",
+                        lambda kind, lines: parsed.append(lines) or parse_record(kind, lines))
+
+    watcher = game_data.CatalogWatcher(path, "item", use_cache=True)
+    assert parsed == []
+    assert watcher.catalog == items
+
+    write_items(path, [(f"item_{i}", i + 1) for i in range(4)] + [("item_4", 99)])
+    assert watcher.check() == True
+    assert len(parsed) == 1
+    assert watcher.catalog["item_4"]["cost"] == 99
+
+    # the reload refreshed the cache, so the next watcher parses nothing either
+    assert game_data.CatalogWatcher(path, "item", use_cache=True).catalog["item_4"]["cost"] == 99
+    assert len(parsed) == 1
+
+def test_watcher_keeps_old_catalog_on_bad_edit(tmp_path):
+    """Test that an invalid edit leaves the current catalog in place"""
+    path = str(tmp_path / "items.txt")
+    write_items(path, [("potion", 20)])
+    watcher = game_data.CatalogWatcher(path, "item")
+
+    with open(path, "a") as f:
+        f.write("\nITEM_ID: broken\nCOST: free\n")
+
+    assert watcher.check() == False
+    assert isinstance(watcher.last_error, InvalidDataFormatError)
+    assert list(watcher.catalog) == ["potion"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
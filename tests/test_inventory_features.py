@@ -0,0 +1,458 @@
+"""
+Test Inventory Features
+Tests for the Inventory type and the inventory and shop features built on it
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import game_data
+import inventory_system
+from inventory_system import Inventory
+
+# ============================================================================
+# INVENTORY TYPE TESTS
+# ============================================================================
+
+def test_inventory_behaves_like_a_list_of_items():
+    """Test the list operations the game uses on an Inventory"""
+    inventory = Inventory(["potion", "sword", "potion"])
+
+    assert len(inventory) == 3
+    assert inventory.count("potion") == 2
+    assert "sword" in inventory and "shield" not in inventory
+    assert list(inventory) == ["potion", "potion", "sword"]
+    assert inventory == ["sword", "potion", "potion"]
+    assert inventory.counts() == {"potion": 2, "sword": 1}
+
+    copy = inventory.copy()
+    inventory.remove("potion")
+    inventory.remove("sword")
+    assert inventory == ["potion"]
+    assert copy.count("potion") == 2
+    with pytest.raises(ValueError):
+        inventory.remove("sword")
+
+    inventory.clear()
+    assert len(inventory) == 0 and inventory == []
+
+def test_inventory_functions_keep_max_size():
+    """Test that a full Inventory still raises InventoryFullError"""
+    char = character_manager.create_character("Packrat", "Rogue")
+    assert isinstance(char["inventory"], Inventory)
+
+    for _ in range(inventory_system.MAX_INVENTORY_SIZE):
+        inventory_system.add_item_to_inventory(char, "rock")
+
+    assert inventory_system.count_item(char, "rock") == inventory_system.MAX_INVENTORY_SIZE
+    assert inventory_system.get_inventory_space_remaining(char) == 0
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "rock")
+
+    inventory_system.remove_item_from_inventory(char, "rock")
+    assert inventory_system.has_item(char, "rock")
+    assert inventory_system.clear_inventory(char) == ["rock"] * (inventory_system.MAX_INVENTORY_SIZE - 1)
+
+def test_inventory_saves_in_the_old_format(tmp_path, capsys):
+    """Test that an Inventory round-trips through the comma-separated format"""
+    char = character_manager.create_character("Saver", "Mage")
+    char["inventory"].extend(["potion", "sword", "potion"])
+
+    assert "INVENTORY: potion,potion,sword\n" in character_manager.format_save_data(char)
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Saver", str(tmp_path))
+    assert isinstance(loaded["inventory"], Inventory)
+    assert loaded["inventory"].count("potion") == 2
+
+    inventory_system.display_inventory(loaded, {"potion": {"name": "Potion", "type": "consumable"}})
+    out = capsys.readouterr().out
+    assert "Potion (consumable) x2" in out
+    assert "sword x1 (Unknown item)" in out
+
+
+# ============================================================================
+# BATCH SHOP TESTS
+# ============================================================================
+
+SHOP_ITEMS = {
+    "potion": {"name": "Potion", "type": "consumable", "effect": "health:20", "cost": 10},
+    "sword": {"name": "Sword", "type": "weapon", "effect": "strength:5", "cost": 45},
+}
+
+def test_purchase_items_buys_whole_basket():
+    """Test that a basket is charged once and returns a receipt"""
+    char = character_manager.create_character("Shopper", "Warrior")
+
+    receipt = inventory_system.purchase_items(
+        char, [("potion", 2), ("sword", 1), ("potion", 1)], SHOP_ITEMS
+    )
+
+    assert receipt["total"] == 75
+    assert receipt["gold"] == char["gold"] == 25
+    assert [(l["item_id"], l["quantity"], l["subtotal"]) for l in receipt["lines"]] == [
+        ("potion", 3, 30), ("sword", 1, 45)
+    ]
+    assert char["inventory"] == ["potion", "potion", "potion", "sword"]
+
+def test_failed_basket_changes_nothing():
+    """Test that any bad line leaves gold and inventory untouched"""
+    char = character_manager.create_character("Careful", "Mage")
+    char["inventory"].extend(["rock"] * (inventory_system.MAX_INVENTORY_SIZE - 2))
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.purchase_items(char, [("potion", 2), ("sword", 1)], SHOP_ITEMS)
+    with pytest.raises(InsufficientResourcesError):
+        inventory_system.purchase_items(char, [("sword", 3)], SHOP_ITEMS)
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.purchase_items(char, [("potion", 1), ("dragon", 1)], SHOP_ITEMS)
+    with pytest.raises(ValueError):
+        inventory_system.purchase_items(char, [("potion", 0)], SHOP_ITEMS)
+
+    assert char["gold"] == 100
+    assert len(char["inventory"]) == inventory_system.MAX_INVENTORY_SIZE - 2
+
+def test_sell_items_is_all_or_nothing():
+    """Test selling a basket for half price, or nothing if one line fails"""
+    char = character_manager.create_character("Seller", "Rogue")
+    char["inventory"].extend(["potion", "potion", "sword"])
+
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.sell_items(char, [("sword", 1), ("potion", 3)], SHOP_ITEMS)
+    assert char["inventory"].count("sword") == 1
+
+    receipt = inventory_system.sell_items(char, [("sword", 1), ("potion", 2)], SHOP_ITEMS)
+    assert receipt["total"] == 22 + 10
+    assert char["gold"] == 132
+    assert char["inventory"] == []
+
+# ============================================================================
+# INVENTORY CAPACITY TESTS
+# ============================================================================
+
+def test_capacity_counts_stacks_as_slots():
+    """Test that stackable items share slots and the totals stay right"""
+    char = character_manager.create_character("Packer", "Warrior")
+    capacity = inventory_system.InventoryCapacity(max_slots=3, max_stack=5,
+                                                  stack_limits={"sword": 1})
+    inventory_system.set_inventory_capacity(char, capacity)
+
+    for _ in range(10):
+        inventory_system.add_item_to_inventory(char, "potion")
+    inventory_system.add_item_to_inventory(char, "sword")
+    assert char["inventory"].slots_used == 3
+    assert inventory_system.get_inventory_space_remaining(char) == 0
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "potion")
+
+    inventory_system.remove_item_from_inventory(char, "potion")
+    inventory_system.add_item_to_inventory(char, "potion")
+    assert char["inventory"].count("potion") == 10
+
+    # running totals match a count from scratch after any mix of changes
+    copy = char["inventory"].copy()
+    for item_id in ["potion", "sword", "potion", "potion", "potion", "potion", "potion"]:
+        copy.remove(item_id)
+    copy.append("gem")
+    slots_used = copy.slots_used
+    copy.capacity = capacity
+    assert copy.slots_used == slots_used == 2
+
+def test_capacity_limits_weight():
+    """Test that weight limits apply to buying, adding and unequipping"""
+    char = character_manager.create_character("Mule", "Rogue")
+    capacity = inventory_system.InventoryCapacity(max_slots=None, max_weight=30,
+                                                  weights={"sword": 12, "potion": 1})
+    inventory_system.set_inventory_capacity(char, capacity)
+    char["gold"] = 1000
+
+    inventory_system.purchase_items(char, [("sword", 2), ("potion", 6)], SHOP_ITEMS)
+    assert char["inventory"].weight == 30
+    assert inventory_system.get_inventory_space_remaining(char) is None
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.purchase_item(char, "potion", SHOP_ITEMS["potion"])
+    inventory_system.add_item_to_inventory(char, "feather")
+
+    inventory_system.equip_weapon(char, "sword", SHOP_ITEMS["sword"])
+    inventory_system.purchase_items(char, [("potion", 12)], SHOP_ITEMS)
+    with pytest.raises(InventoryFullError):
+        inventory_system.unequip_weapon(char)
+    assert char["equipped_weapon"] == "sword"
+
+def test_swap_checks_space_for_the_replaced_item():
+    """Test that a swap is refused, and undone, when the old item won't fit"""
+    dagger = {"type": "weapon", "effect": "strength:2"}
+    sword = {"type": "weapon", "effect": "strength:5"}
+
+    # the new dagger shares a stack, so equipping it frees no slot
+    char = character_manager.create_character("Stacker", "Warrior")
+    inventory_system.set_inventory_capacity(
+        char, inventory_system.InventoryCapacity(max_slots=2, max_stack=5))
+    char["inventory"].extend(["sword", "dagger", "dagger", "potion"])
+    inventory_system.equip_weapon(char, "sword", sword)
+    strength = char["strength"]
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.equip_weapon(char, "dagger", dagger)
+    assert char["inventory"].counts() == {"dagger": 2, "potion": 1}
+    assert char["inventory"].slots_used == 2
+    assert (char["equipped_weapon"], char["strength"]) == ("sword", strength)
+
+    # the sword coming off weighs more than the dagger going on
+    char = character_manager.create_character("Carrier", "Warrior")
+    inventory_system.set_inventory_capacity(char, inventory_system.InventoryCapacity(
+        max_slots=None, max_weight=10, weights={"sword": 9, "dagger": 1, "potion": 1}))
+    char["inventory"].extend(["sword", "dagger"] + ["potion"] * 8)
+    inventory_system.equip_weapon(char, "sword", sword)
+
+    with pytest.raises(InventoryFullError):
+        inventory_system.equip_weapon(char, "dagger", dagger)
+    assert char["inventory"].weight == 9
+    assert char["equipped_weapon"] == "sword"
+
+    for _ in range(7):
+        inventory_system.remove_item_from_inventory(char, "potion")
+    inventory_system.equip_weapon(char, "dagger", dagger)
+    assert char["inventory"].weight == 1 + 9
+
+
+# ============================================================================
+# COMPILED EFFECT TESTS
+# ============================================================================
+
+def test_compile_item_effect():
+    """Test compiling single and multi-stat effects"""
+    assert inventory_system.compile_item_effect("health:20") == (("health", 20),)
+    assert inventory_system.compile_item_effect("strength:5, magic:-2") == (
+        ("strength", 5), ("magic", -2)
+    )
+    compiled = (("max_health", 10),)
+    assert inventory_system.compile_item_effect(compiled) is compiled
+
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.compile_item_effect("strength:lots")
+
+def test_catalog_items_carry_compiled_effects(tmp_path):
+    """Test that load_items compiles effects and rejects bad ones"""
+    path = str(tmp_path / "items.txt")
+    with open(path, "w") as f:
+        f.write("ITEM_ID: staff\nNAME: Staff\nTYPE: weapon\nEFFECT: strength:2,magic:6\n"
+                "COST: 60\nDESCRIPTION: Glows\n")
+
+    items = game_data.load_items(path)
+    assert items["staff"]["effects"] == (("strength", 2), ("magic", 6))
+
+    with open(path, "a") as f:
+        f.write("\nITEM_ID: wand\nNAME: Wand\nTYPE: weapon\nEFFECT: magic\n"
+                "COST: 5\nDESCRIPTION: Broken\n")
+    with pytest.raises(InvalidDataFormatError, match="line 8"):
+        game_data.load_items(path)
+
+def test_equip_multi_stat_weapon_and_legacy_slot():
+    """Test equipping compiled effects and unequipping an old string slot"""
+    char = character_manager.create_character("Caster", "Mage")
+    staff = {"type": "weapon", "effect": "strength:2,magic:6",
+             "effects": (("strength", 2), ("magic", 6))}
+    char["inventory"].append("staff")
+
+    message = inventory_system.equip_weapon(char, "staff", staff)
+    assert message == "You equipped staff (+strength 2, +magic 6)."
+    assert (char["strength"], char["magic"]) == (10, 26)
+    assert char["equipped_weapon"] == "staff"
+    assert inventory_system.get_equipment(char).slots["weapon"] == ("staff", staff["effects"])
+
+    assert inventory_system.unequip_weapon(char) == "staff"
+    assert (char["strength"], char["magic"]) == (8, 20)
+
+    # a slot filled before effects were compiled
+    old = character_manager.create_character("Veteran", "Mage")
+    old["equipped_armor"] = "old_robe"
+    old["equipped_armor_effect"] = "max_health:10"
+    old["max_health"] += 10
+    assert inventory_system.unequip_armor(old) == "old_robe"
+    assert old["max_health"] == 80
+    assert "equipped_armor_effect" not in old
+
+
+# ============================================================================
+# EQUIPMENT SLOT TESTS
+# ============================================================================
+
+def test_equip_item_in_many_slots():
+    """Test that every slot adds its bonus and swapping returns the old item"""
+    char = character_manager.create_character("Knight", "Warrior")
+    helmet = {"type": "armor", "slot": "helmet", "effect": "max_health:10"}
+    ring = {"type": "armor", "slot": "ring", "effect": "strength:3,magic:3"}
+    big_ring = {"type": "armor", "slot": "ring", "effect": "strength:7"}
+    char["inventory"].extend(["helmet", "ring", "big_ring"])
+
+    inventory_system.equip_item(char, "helmet", helmet)
+    inventory_system.equip_item(char, "ring", ring)
+    assert (char["max_health"], char["strength"], char["magic"]) == (130, 18, 8)
+    assert inventory_system.get_base_stat(char, "strength") == 15
+
+    inventory_system.equip_item(char, "big_ring", big_ring)
+    assert (char["strength"], char["magic"]) == (22, 5)
+    assert char["inventory"] == ["ring"]
+    assert "equipped_ring" not in char
+
+    assert inventory_system.unequip_item(char, "helmet") == "helmet"
+    assert inventory_system.unequip_item(char, "helmet") is None
+    assert char["max_health"] == 120
+
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.equip_item(char, "helmet", {"type": "consumable", "effect": "health:5"})
+
+def test_equip_armor_uses_the_item_slot():
+    """Test that a helmet equipped as armor doesn't replace body armor"""
+    char = character_manager.create_character("Knight", "Warrior")
+    plate = {"type": "armor", "effect": "max_health:20"}
+    helm = {"type": "armor", "slot": "helmet", "effect": "max_health:5"}
+    char["inventory"].extend(["plate", "helm"])
+
+    inventory_system.equip_armor(char, "plate", plate)
+    inventory_system.equip_armor(char, "helm", helm)
+
+    slots = inventory_system.get_equipment(char).slots
+    assert (slots["armor"][0], slots["helmet"][0]) == ("plate", "helm")
+    assert char["equipped_armor"] == "plate"
+    assert char["max_health"] == 120 + 25
+    assert char["inventory"] == []
+
+    assert inventory_system.unequip_item(char, "helmet") == "helm"
+    assert char["max_health"] == 120 + 20
+
+def test_catalog_rejects_unknown_slot(tmp_path):
+    """Test that an item file with a bad SLOT line doesn't load"""
+    path = str(tmp_path / "items.txt")
+    with open(path, "w") as f:
+        f.write("ITEM_ID: hat\nNAME: Hat\nTYPE: armor\nSLOT: head\n"
+                "EFFECT: max_health:2\nCOST: 5\nDESCRIPTION: A hat\n")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_items(path)
+
+def test_unequip_takes_off_exactly_what_was_added():
+    """Test that stat changes while equipped survive unequipping"""
+    char = character_manager.create_character("Grower", "Rogue")
+    char["inventory"].append("dagger")
+    inventory_system.equip_weapon(char, "dagger", {"type": "weapon", "effect": "strength:4"})
+
+    character_manager.gain_experience(char, 100)
+    assert char["strength"] == 12 + 4 + character_manager.LEVEL_UP_STRENGTH
+
+    inventory_system.unequip_weapon(char)
+    assert char["strength"] == 12 + character_manager.LEVEL_UP_STRENGTH
+    assert char["equipped_weapon"] is None
+    assert inventory_system.get_equipment(char).bonuses["strength"] == 0
+
+def test_unequip_max_health_gear_clamps_health():
+    """Test that health never stays above max_health once armor comes off"""
+    char = character_manager.create_character("Tank", "Warrior")
+    char["inventory"].append("plate")
+    inventory_system.equip_armor(char, "plate", {"type": "armor", "effect": "max_health:30"})
+    char["health"] = char["max_health"]
+    assert char["health"] == 150
+
+    inventory_system.unequip_armor(char)
+    assert (char["health"], char["max_health"]) == (120, 120)
+
+    # below the new maximum, a round trip leaves health alone
+    char["health"] = 100
+    inventory_system.equip_armor(char, "plate", {"type": "armor", "effect": "max_health:30"})
+    inventory_system.unequip_armor(char)
+    assert (char["health"], char["max_health"]) == (100, 120)
+
+def test_equipment_with_health_effect_is_refused():
+    """Test that gear can't change health, so unequipping reverses equipping"""
+    char = character_manager.create_character("Healer", "Cleric")
+    char["inventory"].append("charm")
+    inventory_system.get_equipment(char)
+    before = dict(char.items())
+    charm = {"type": "armor", "slot": "amulet", "effect": "magic:3,health:20"}
+
+    with pytest.raises(InvalidItemTypeError):
+        inventory_system.equip_armor(char, "charm", charm)
+    assert dict(char.items()) == before
+    assert inventory_system.get_equipment(char).slots == {}
+
+    charm["effect"] = "magic:3"
+    inventory_system.equip_armor(char, "charm", charm)
+    inventory_system.unequip_item(char, "amulet")
+    after = dict(char.items())
+    assert [after[key] for key in ["health", "max_health", "magic"]] == \
+        [before[key] for key in ["health", "max_health", "magic"]]
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_item_data({"item_id": "charm", "name": "Charm", "type": "armor",
+                                      "effect": "health:20", "cost": 5, "description": ""})
+
+# ============================================================================
+# SHOP CATALOG TESTS
+# ============================================================================
+
+def make_catalog_items(count):
+    """count items with varied types, costs and effects"""
+    types = ["weapon", "armor", "consumable"]
+    stats = ["strength", "max_health", "health"]
+    items = {}
+    for i in range(count):
+        item_id = f"item_{i}"
+        effect = f"{stats[i % 3]}:{(i * 7) % 23 + 1}"
+        items[item_id] = {"item_id": item_id, "name": f"Item {i}", "type": types[i % 3],
+                          "effect": effect, "cost": (i * 13) % 97 + 1, "description": ""}
+    return items
+
+def test_shop_catalog_cost_ranges_and_pages():
+    """Test find filters by type and cost and pages cheapest first"""
+    items = make_catalog_items(300)
+    catalog = inventory_system.ShopCatalog(items)
+
+    expected = sorted((d["cost"], i) for i, d in items.items()
+                      if d["type"] == "weapon" and 10 <= d["cost"] <= 50)
+    seen = []
+    for page in range(10):
+        result = catalog.find("weapon", 10, 50, page=page, page_size=7)
+        assert result["total"] == len(expected)
+        seen.extend(d["item_id"] for d in result["items"])
+    assert seen == [i for _, i in expected]
+
+    assert catalog.find("helmet")["total"] == 0
+    assert catalog.find(max_cost=0) == {"items": [], "total": 0}
+
+    best = catalog.find_by_stat("strength", min_value=20, page_size=1000)["items"]
+    assert len(best) > 0
+    assert all(d["type"] == "weapon" for d in best)
+    values = [inventory_system.get_item_effects(d)[0][1] for d in best]
+    assert values == sorted(values, reverse=True) and min(values) >= 20
+
+def test_shop_catalog_best_affordable_matches_a_scan():
+    """Test best_affordable returns the same items as sorting everything"""
+    items = make_catalog_items(500)
+    items["tie_cheap"] = {"item_id": "tie_cheap", "name": "Tie", "type": "weapon",
+                          "effect": "strength:23", "cost": 2, "description": ""}
+    catalog = inventory_system.ShopCatalog(items)
+
+    for gold in [0, 1, 5, 40, 1000]:
+        for item_type in [None, "weapon", "consumable"]:
+            for stat_name in ["strength", "health", "magic"]:
+                candidates = [d for d in items.values()
+                              if d["cost"] <= gold and item_type in (None, d["type"])
+                              and d["effect"].split(":")[0] == stat_name]
+                candidates.sort(key=lambda d: (-int(d["effect"].split(":")[1]), d["cost"]))
+                best = catalog.best_affordable(gold, stat_name, k=5, item_type=item_type)
+                assert [(d["effect"], d["cost"]) for d in best] == \
+                       [(d["effect"], d["cost"]) for d in candidates[:5]]
+
+    assert catalog.best_affordable(2, "strength")[0]["item_id"] == "tie_cheap"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,217 @@
+"""
+Test Quest Features
+Tests for the quest prerequisite graph and the quest features built on it
+"""
+
+import pytest
+import pickle
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import quest_handler
+
+
+def make_quest(quest_id, prerequisite="NONE", required_level=1):
+    """Quest dictionary with the fields quest_handler uses"""
+    return {
+        "quest_id": quest_id, "title": quest_id.title(), "description": "",
+        "reward_xp": 10, "reward_gold": 5,
+        "required_level": required_level, "prerequisite": prerequisite,
+    }
+
+def make_quests(links):
+    """Quest dictionary from {quest_id: prerequisite}"""
+    return {quest_id: make_quest(quest_id, prereq) for quest_id, prereq in links.items()}
+
+# ============================================================================
+# QUEST GRAPH TESTS
+# ============================================================================
+
+def test_quest_graph_orders_and_classifies_quests():
+    """Test topological order, unlocks, missing links and cycles"""
+    quests = make_quests({
+        "c": "b", "a": "NONE", "b": "a", "side": "a",
+        "lost": "ghost", "after_lost": "lost",
+        "x": "y", "y": "x", "after_x": "x",
+    })
+    graph = quest_handler.QuestGraph(quests)
+
+    assert sorted(graph.order) == ["a", "b", "c", "side"]
+    position = {quest_id: i for i, quest_id in enumerate(graph.order)}
+    assert position["a"] < position["b"] < position["c"]
+    assert position["a"] < position["side"]
+
+    assert sorted(graph.unlocks("a")) == ["b", "side"]
+    assert graph.unlocks("c") == ()
+    assert graph.missing == {"lost": "ghost", "after_lost": "ghost"}
+    assert graph.cyclic == {"x", "y", "after_x"}
+
+    assert graph.chain("c") == ("a", "b", "c")
+    assert graph.chain("c") is graph.chain("c")
+    with pytest.raises(QuestNotFoundError):
+        graph.chain("after_lost")
+    with pytest.raises(QuestRequirementsNotMetError):
+        graph.chain("after_x")
+
+def test_prerequisite_chain_with_and_without_graph():
+    """Test both chain lookups agree and neither loops forever on a cycle"""
+    links = {f"q{i}": f"q{i - 1}" for i in range(1, 300)}
+    links["q0"] = "NONE"
+    links["loop_a"] = "loop_b"
+    links["loop_b"] = "loop_a"
+    quests = make_quests(links)
+    graph = quest_handler.QuestGraph(quests)
+
+    expected = [f"q{i}" for i in range(300)]
+    assert quest_handler.get_quest_prerequisite_chain("q299", quests) == expected
+    assert quest_handler.get_quest_prerequisite_chain("q299", quests, graph) == expected
+    assert quest_handler.get_quest_prerequisite_chain("q150", quests, graph) == expected[:151]
+
+    for use_graph in [None, graph]:
+        with pytest.raises(QuestRequirementsNotMetError):
+            quest_handler.get_quest_prerequisite_chain("loop_a", quests, use_graph)
+        with pytest.raises(QuestNotFoundError):
+            quest_handler.get_quest_prerequisite_chain("nope", quests, use_graph)
+
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.validate_quest_prerequisites(quests)
+    del quests["loop_a"], quests["loop_b"]
+    assert quest_handler.validate_quest_prerequisites(quests)
+
+def test_accept_quest_with_graph_refuses_cycles():
+    """Test that quests behind a cycle can't be accepted when a graph is given"""
+    quests = make_quests({"start": "NONE", "x": "y", "y": "x"})
+    graph = quest_handler.QuestGraph(quests)
+    char = character_manager.create_character("Seeker", "Mage")
+
+    assert quest_handler.can_accept_quest(char, "start", quests, graph)
+    assert not quest_handler.can_accept_quest(char, "x", quests, graph)
+
+    # even with the prerequisite somehow completed, a cyclic quest is refused
+    char["completed_quests"].append("y")
+    assert quest_handler.can_accept_quest(char, "x", quests)
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.accept_quest(char, "x", quests, graph)
+
+    assert quest_handler.accept_quest(char, "start", quests, graph)
+    assert char["active_quests"] == ["start"]
+
+def test_quest_list_keeps_membership_in_step():
+    """Test that every list mutation keeps QuestList lookups right"""
+    quest_ids = quest_handler.QuestList(["a", "b", "a"])
+    quest_ids.append("c")
+    quest_ids.extend(iter(["d", "e"]))
+    quest_ids.insert(0, "f")
+    quest_ids.remove("a")
+    assert quest_ids.pop() == "e"
+    quest_ids[0] = "g"
+    quest_ids[1:3] = ["h"]
+    del quest_ids[-1]
+    quest_ids += ["i"]
+
+    assert quest_ids == ["g", "h", "c", "i"]
+    for quest_id in "abcdefghi":
+        assert (quest_id in quest_ids) == (quest_id in list(quest_ids))
+    assert [] not in quest_ids
+
+    for copy in [quest_ids.copy(), pickle.loads(pickle.dumps(quest_ids))]:
+        assert type(copy) is quest_handler.QuestList
+        assert copy == quest_ids and "h" in copy
+        copy.clear()
+        assert "h" not in copy and "h" in quest_ids
+
+def test_quest_functions_use_quest_lists(tmp_path):
+    """Test that plain quest lists are upgraded and still save as before"""
+    quests = make_quests({"first": "NONE", "second": "first"})
+    char = character_manager.create_character("Lister", "Mage")
+    assert type(char["completed_quests"]) is list
+
+    assert quest_handler.can_accept_quest(char, "first", quests)
+    assert type(char["completed_quests"]) is quest_handler.QuestList
+    assert type(char["active_quests"]) is quest_handler.QuestList
+
+    quest_handler.accept_quest(char, "first", quests)
+    quest_handler.complete_quest(char, "first", quests)
+    assert quest_handler.is_quest_completed(char, "first")
+    assert quest_handler.can_accept_quest(char, "second", quests)
+
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Lister", str(tmp_path))
+    assert loaded["completed_quests"] == ["first"]
+    assert loaded["active_quests"] == []
+
+# ============================================================================
+# QUEST AVAILABILITY TESTS
+# ============================================================================
+
+def test_quest_tracker_matches_full_scan():
+    """Test that the tracker agrees with get_available_quests as play goes on"""
+    rng = random.Random(25)
+    quests = {}
+    for i in range(200):
+        prereq = "NONE" if i < 10 or rng.random() < 0.2 else f"q{rng.randrange(i)}"
+        quests[f"q{i}"] = make_quest(f"q{i}", prereq, rng.randint(1, 8))
+    quests["loop_a"] = make_quest("loop_a", "loop_b")
+    quests["loop_b"] = make_quest("loop_b", "loop_a")
+
+    graph = quest_handler.QuestGraph(quests)
+    char = character_manager.create_character("Tracker", "Warrior")
+    tracker = quest_handler.QuestTracker(char, graph)
+
+    def available_ids():
+        return sorted(q["quest_id"] for q in quest_handler.get_available_quests(char, quests, tracker))
+
+    for _ in range(400):
+        expected = sorted(q["quest_id"] for q in quest_handler.get_available_quests(char, quests)
+                          if q["quest_id"] not in graph.cyclic)
+        assert available_ids() == expected
+
+        roll = rng.random()
+        if roll < 0.5 and len(expected) > 0:
+            quest_handler.accept_quest(char, rng.choice(expected), quests, graph, tracker)
+        elif roll < 0.8 and len(char["active_quests"]) > 0:
+            quest_handler.complete_quest(char, rng.choice(char["active_quests"]), quests, tracker)
+        elif len(char["active_quests"]) > 0:
+            quest_handler.abandon_quest(char, rng.choice(char["active_quests"]), tracker)
+        else:
+            character_manager.gain_experience(char, 150)
+
+    assert char["level"] > 1 and len(char["completed_quests"]) > 20
+
+def test_accept_quest_with_tracker_still_explains_refusals():
+    """Test that quests the tracker doesn't list raise the usual errors"""
+    quests = {
+        "first": make_quest("first"),
+        "second": make_quest("second", "first"),
+        "hard": make_quest("hard", required_level=5),
+    }
+    graph = quest_handler.QuestGraph(quests)
+    char = character_manager.create_character("Rookie", "Rogue")
+    tracker = quest_handler.QuestTracker(char, graph)
+
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.accept_quest(char, "second", quests, graph, tracker)
+    with pytest.raises(InsufficientLevelError):
+        quest_handler.accept_quest(char, "hard", quests, graph, tracker)
+
+    quest_handler.accept_quest(char, "first", quests, graph, tracker)
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.accept_quest(char, "first", quests, graph, tracker)
+
+    quest_handler.complete_quest(char, "first", quests, tracker)
+    assert tracker.is_available("second")
+    with pytest.raises(QuestAlreadyCompletedError):
+        quest_handler.accept_quest(char, "first", quests, graph, tracker)
+
+    # a level-up made outside quest_handler is picked up on the next read
+    char["level"] = 5
+    assert [q["quest_id"] for q in tracker.available_quests()] == ["second", "hard"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,572 @@
+"""
+Test Save Storage
+Tests for the character save backends and save file handling
+"""
+
+import pytest
+import sys
+import io
+import os
+import tarfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    """Route saves to a SQLite database for one test"""
+    backend = character_manager.SQLiteSaveBackend(str(tmp_path / "saves.db"))
+    previous = character_manager.set_save_backend(backend)
+    yield backend
+    character_manager.set_save_backend(previous)
+    backend.close()
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_backend_round_trip(sqlite_backend):
+    """Test saving, listing, loading and deleting through SQLite"""
+    char = character_manager.create_character("SqlHero", "Mage")
+    char["inventory"].append("health_potion")
+    character_manager.save_character(char)
+    character_manager.save_character(character_manager.create_character("Another", "Rogue"))
+
+    assert character_manager.list_saved_characters() == ["Another", "SqlHero"]
+    loaded = character_manager.load_character("SqlHero")
+    assert loaded == char
+
+    assert character_manager.delete_character("SqlHero") == True
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SqlHero")
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("SqlHero")
+
+def test_migrate_text_saves_to_sqlite(tmp_path):
+    """Test copying a directory of text saves into a database"""
+    save_dir = str(tmp_path / "saves")
+    for name in ["Ann", "Bob"]:
+        character_manager.save_character(character_manager.create_character(name, "Cleric"), save_dir)
+    with open(os.path.join(save_dir, "Bad_save.txt"), "w") as f:
+        f.write("NAME: Bad\nLEVEL: high\n")
+
+    result = character_manager.migrate_text_saves_to_sqlite(save_dir, str(tmp_path / "saves.db"))
+
+    assert result == {"migrated": 2, "failed": ["Bad"]}
+    backend = character_manager.SQLiteSaveBackend(str(tmp_path / "saves.db"))
+    assert backend.list_saved_characters() == ["Ann", "Bob"]
+    assert backend.load_character("Bob")["class"] == "Cleric"
+    backend.close()
+
+# ============================================================================
+# WRITE-BEHIND QUEUE TESTS
+# ============================================================================
+
+def test_save_queue_coalesces_and_flushes(tmp_path):
+    """Test that repeated saves become one write of the latest state"""
+    save_dir = str(tmp_path)
+    queue = character_manager.SaveQueue(save_dir, window=60)
+    char = character_manager.create_character("QueueHero", "Warrior")
+
+    for gold in [110, 120, 130]:
+        char["gold"] = gold
+        queue.save(char)
+    char["inventory"].append("after_queue")
+
+    assert queue.pending_count() == 1
+    assert character_manager.list_saved_characters(save_dir) == []
+
+    assert queue.flush() == 1
+    loaded = character_manager.load_character("QueueHero", save_dir)
+    assert loaded["gold"] == 130
+    assert loaded["inventory"] == []
+    queue.close()
+
+def test_save_queue_writes_in_background(tmp_path):
+    """Test that queued saves reach disk after the window without flush()"""
+    save_dir = str(tmp_path)
+    queue = character_manager.SaveQueue(save_dir, window=0.05)
+    queue.save(character_manager.create_character("Later", "Mage"))
+
+    deadline = time.monotonic() + 5
+    while queue.writes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert character_manager.list_saved_characters(save_dir) == ["Later"]
+    assert queue.writes == 1
+    queue.close()
+
+# ============================================================================
+# ATOMIC SAVE TESTS
+# ============================================================================
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    """Test that an interrupted save leaves the old save and no temp file"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Atomic", "Rogue")
+    character_manager.save_character(char, save_dir)
+
+    def crash(src, dst):
+        raise OSError("disk unplugged")
+
+    monkeypatch.setattr(character_manager.os, "replace", crash)
+    char["gold"] = 999
+    with pytest.raises(IOError):
+        character_manager.save_character(char, save_dir)
+
+    assert os.listdir(save_dir) == ["Atomic_save.txt"]
+    assert character_manager.load_character("Atomic", save_dir)["gold"] == 100
+
+def test_every_durability_mode_saves(tmp_path):
+    """Test that each durability mode writes a loadable save"""
+    char = character_manager.create_character("Durable", "Cleric")
+    try:
+        for mode in character_manager.SAVE_DURABILITY_MODES:
+            character_manager.set_save_durability(mode)
+            char["gold"] += 1
+            character_manager.save_character(char, str(tmp_path))
+            assert character_manager.load_character("Durable", str(tmp_path))["gold"] == char["gold"]
+    finally:
+        character_manager.set_save_durability("none")
+
+    with pytest.raises(ValueError):
+        character_manager.set_save_durability("sometimes")
+
+# ============================================================================
+# SAVE JOURNAL TESTS
+# ============================================================================
+
+@pytest.fixture
+def journal_on():
+    """Turn the save journal on for one test"""
+    character_manager.set_save_journal(True, compact_bytes=200)
+    yield
+    character_manager.set_save_journal(False)
+
+def test_journal_appends_changes_and_replays(tmp_path, journal_on):
+    """Test that saves append only changed fields and load replays them"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Journal", "Warrior")
+    character_manager.save_character(char, save_dir)
+    snapshot = open(os.path.join(save_dir, "Journal_save.txt")).read()
+
+    char["gold"] = 140
+    char["inventory"].extend(["health_potion", "health_potion"])
+    character_manager.save_character(char, save_dir)
+    char["inventory"].remove("health_potion")
+    character_manager.save_character(char, save_dir)
+
+    journal = open(os.path.join(save_dir, "Journal_save.journal")).read().split("\n")
+    assert journal[1:] == [
+        "GOLD: 140", "INVENTORY_ADD: health_potion", "INVENTORY_ADD: health_potion", "END",
+        "INVENTORY_REMOVE: health_potion", "END", ""
+    ]
+    assert open(os.path.join(save_dir, "Journal_save.txt")).read() == snapshot
+
+    loaded = character_manager.load_character("Journal", save_dir)
+    assert loaded == char
+    assert "generation" not in loaded
+
+def test_journal_compacts_and_ignores_torn_writes(tmp_path, journal_on):
+    """Test compaction into a snapshot and skipping an unfinished group"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Compact", "Mage")
+    for gold in range(101, 131):
+        char["gold"] = gold
+        character_manager.save_character(char, save_dir)
+
+    journal_name = os.path.join(save_dir, "Compact_save.journal")
+    assert os.path.getsize(journal_name) < 200
+    assert character_manager.load_character("Compact", save_dir)["gold"] == 130
+
+    with open(journal_name, "a") as f:
+        f.write("GOLD: 999\n")
+    assert character_manager.load_character("Compact", save_dir)["gold"] == 130
+
+    character_manager.delete_character("Compact", save_dir)
+    assert os.listdir(save_dir) == []
+
+def test_journal_keeps_state_for_recent_saves_only(tmp_path, journal_on, monkeypatch):
+    """Test that journal state is bounded and a dropped save gets a snapshot"""
+    monkeypatch.setattr(character_manager, "JOURNAL_STATE_LIMIT", 2)
+    save_dir = str(tmp_path)
+    chars = [character_manager.create_character(f"Hero{i}", "Rogue") for i in range(4)]
+    for char in chars:
+        character_manager.save_character(char, save_dir)
+
+    states = character_manager._journal_states
+    assert [os.path.basename(name) for name in states] == ["Hero2_save.txt", "Hero3_save.txt"]
+    assert not any(isinstance(value, character_manager.Character)
+                   for state in states.values() for value in state["record"])
+
+    # Hero0's state was dropped, so its next save is a fresh snapshot
+    chars[0]["gold"] = 75
+    chars[0]["inventory"].append("health_potion")
+    character_manager.save_character(chars[0], save_dir)
+    journal = open(os.path.join(save_dir, "Hero0_save.journal")).read().split("\n")
+    assert journal[1:] == [""]
+    assert character_manager.load_character("Hero0", save_dir) == chars[0]
+    assert len(states) == 2
+
+
+# ============================================================================
+# SAVE INDEX TESTS
+# ============================================================================
+
+def test_save_index_pages_and_filters(tmp_path):
+    """Test that saves and deletes keep the index's pages up to date"""
+    save_dir = str(tmp_path / "saves")
+    for i, char_class in enumerate(["Warrior", "Mage", "Mage", "Rogue", "Mage"]):
+        char = character_manager.create_character(f"Hero{i}", char_class)
+        char["level"] = i + 1
+        character_manager.save_character(char, save_dir)
+
+    assert character_manager.list_saved_characters(save_dir) == [f"Hero{i}" for i in range(5)]
+
+    result = character_manager.list_saved_characters_page(1, 2, save_directory=save_dir)
+    assert [c["name"] for c in result["characters"]] == ["Hero2", "Hero3"]
+    assert result["total"] == 5
+
+    result = character_manager.list_saved_characters_page(
+        0, 10, character_class="Mage", min_level=3, save_directory=save_dir
+    )
+    assert [(c["name"], c["level"]) for c in result["characters"]] == [("Hero2", 3), ("Hero4", 5)]
+
+    char = character_manager.load_character("Hero0", save_dir)
+    char["class"] = "Mage"
+    character_manager.save_character(char, save_dir)
+    character_manager.delete_character("Hero4", save_dir)
+
+    result = character_manager.list_saved_characters_page(
+        0, 10, character_class="Mage", save_directory=save_dir
+    )
+    assert [c["name"] for c in result["characters"]] == ["Hero0", "Hero1", "Hero2"]
+
+def test_save_index_is_reused_from_disk(tmp_path, monkeypatch):
+    """Test that a new process reads the index file instead of every save"""
+    save_dir = str(tmp_path / "saves")
+    for name in ["Ann", "Bob"]:
+        character_manager.save_character(character_manager.create_character(name, "Cleric"), save_dir)
+    character_manager.list_saved_characters(save_dir)
+
+    monkeypatch.setattr(character_manager, "_save_indexes", {})
+    scanned = []
+    real_scan = character_manager._scan_save_entry
+    monkeypatch.setattr(character_manager, "_scan_save_entry",
+                        lambda name, directory: scanned.append(name) or real_scan(name, directory))
+
+    assert character_manager.list_saved_characters(save_dir) == ["Ann", "Bob"]
+    assert scanned == []
+
+    # a save copied in by hand changes the directory, so it gets rescanned
+    with open(os.path.join(save_dir, "Bad_save.txt"), "w") as f:
+        f.write("NAME: Bad\nLEVEL: high\n")
+    result = character_manager.list_saved_characters_page(save_directory=save_dir)
+
+    assert [c["name"] for c in result["characters"]] == ["Ann", "Bad", "Bob"]
+    assert result["characters"][1]["level"] is None
+    assert character_manager.rebuild_save_index(save_dir) == 3
+
+def test_save_index_without_write_access(tmp_path, monkeypatch):
+    """Test that listing and exporting work when the index can't be written"""
+    save_dir = str(tmp_path / "saves")
+    for name in ["Ann", "Bob"]:
+        character_manager.save_character(character_manager.create_character(name, "Cleric"), save_dir)
+
+    real_write = character_manager.write_file_atomic
+    def write_file_atomic(filename, data, durability="none"):
+        if filename.endswith(character_manager.SAVE_INDEX_FILENAME):
+            raise PermissionError(filename)
+        real_write(filename, data, durability)
+    monkeypatch.setattr(character_manager, "write_file_atomic", write_file_atomic)
+
+    index_path = os.path.join(save_dir, character_manager.SAVE_INDEX_FILENAME)
+    assert character_manager.list_saved_characters(save_dir) == ["Ann", "Bob"]
+    assert not os.path.exists(index_path)
+
+    result = character_manager.export_saves(str(tmp_path / "saves.tar.gz"), save_dir)
+    assert result == {"exported": 2, "failed": []}
+
+    # the in-memory index still follows saves and files copied in by hand
+    character_manager.save_character(character_manager.create_character("Cal", "Mage"), save_dir)
+    with open(os.path.join(save_dir, "Bad_save.txt"), "w") as f:
+        f.write("NAME: Bad\nLEVEL: high\n")
+    assert character_manager.list_saved_characters(save_dir) == ["Ann", "Bad", "Bob", "Cal"]
+    assert not os.path.exists(index_path)
+
+    # once writing works again the whole index is written, not just the change
+    monkeypatch.setattr(character_manager, "write_file_atomic", real_write)
+    character_manager.delete_character("Bad", save_dir)
+    monkeypatch.setattr(character_manager, "_save_indexes", {})
+    monkeypatch.setattr(character_manager, "_scan_save_entry", None)
+    assert character_manager.list_saved_characters(save_dir) == ["Ann", "Bob", "Cal"]
+
+def test_sqlite_backend_pages(sqlite_backend):
+    """Test paging and filtering saves stored in SQLite"""
+    for i in range(4):
+        char = character_manager.create_character(f"Sql{i}", "Rogue" if i % 2 else "Mage")
+        char["level"] = 4 - i
+        character_manager.save_character(char)
+
+    result = character_manager.list_saved_characters_page(0, 1, character_class="Rogue", max_level=3)
+    assert [c["name"] for c in result["characters"]] == ["Sql3"]
+    assert result["total"] == 2
+
+
+# ============================================================================
+# SAVE LAYOUT TESTS
+# ============================================================================
+
+@pytest.fixture
+def sharded_layout():
+    """Write text saves in the sharded layout for one test"""
+    previous = character_manager.set_save_layout("sharded")
+    yield
+    character_manager.set_save_layout(previous)
+
+def test_sharded_layout_round_trip(tmp_path, sharded_layout):
+    """Test that sharded saves are found without callers knowing the path"""
+    save_dir = str(tmp_path / "saves")
+    char = character_manager.create_character("Shard", "Rogue")
+    character_manager.save_character(char, save_dir)
+
+    path = character_manager._save_path(save_dir, "Shard")
+    assert os.path.exists(path)
+    assert os.path.dirname(os.path.dirname(os.path.dirname(path))) == save_dir
+
+    assert character_manager.list_saved_characters(save_dir) == ["Shard"]
+    assert character_manager.load_character("Shard", save_dir) == char
+    character_manager.delete_character("Shard", save_dir)
+    assert character_manager.list_saved_characters(save_dir) == []
+
+def test_migrate_save_layout_moves_saves_and_journals(tmp_path, journal_on):
+    """Test moving flat saves (and their journals) into shards"""
+    save_dir = str(tmp_path / "saves")
+    for name in ["Ann", "Bob", "Cid"]:
+        character_manager.save_character(character_manager.create_character(name, "Cleric"), save_dir)
+    char = character_manager.load_character("Ann", save_dir)
+    char["gold"] = 999
+    character_manager.save_character(char, save_dir)
+    assert character_manager.list_saved_characters(save_dir) == ["Ann", "Bob", "Cid"]
+
+    try:
+        assert character_manager.migrate_save_layout(save_dir, "sharded") == 3
+        assert character_manager.migrate_save_layout(save_dir, "sharded") == 0
+
+        assert not any(name.endswith(("_save.txt", ".journal")) for name in os.listdir(save_dir))
+        assert character_manager.load_character("Ann", save_dir)["gold"] == 999
+        assert character_manager.list_saved_characters(save_dir) == ["Ann", "Bob", "Cid"]
+    finally:
+        character_manager.set_save_layout("flat")
+
+def test_interrupted_move_keeps_journal(tmp_path, journal_on):
+    """Test that a journal left behind by a crash is found with its save"""
+    save_dir = str(tmp_path / "saves")
+    char = character_manager.create_character("Moved", "Mage")
+    character_manager.save_character(char, save_dir)
+    char["level"] = 7
+    character_manager.save_character(char, save_dir)
+
+    flat = character_manager._save_path(save_dir, "Moved", "flat")
+    sharded = character_manager._save_path(save_dir, "Moved", "sharded")
+    os.makedirs(os.path.dirname(sharded))
+    os.replace(flat, sharded)
+
+    character_manager.set_save_journal(True, compact_bytes=200)
+    assert character_manager.load_character("Moved", save_dir)["level"] == 7
+    assert os.path.exists(sharded[:-len(".txt")] + ".journal")
+
+
+# ============================================================================
+# CHARACTER CACHE TESTS
+# ============================================================================
+
+@pytest.fixture
+def character_cache():
+    """Put a small character cache in front of load_character for one test"""
+    cache = character_manager.CharacterCache(max_entries=2)
+    previous = character_manager.set_character_cache(cache)
+    yield cache
+    character_manager.set_character_cache(previous)
+
+def test_character_cache_hits_and_invalidates(tmp_path, character_cache):
+    """Test that repeat loads hit the cache until the save changes"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Cached", "Warrior")
+    character_manager.save_character(char, save_dir)
+
+    first = character_manager.load_character("Cached", save_dir)
+    first["inventory"].append("stolen_sword")
+    first["gold"] = 0
+    second = character_manager.load_character("Cached", save_dir)
+
+    assert (character_cache.hits, character_cache.misses) == (1, 1)
+    assert second == char
+
+    char["gold"] = 555
+    character_manager.save_character(char, save_dir)
+    assert len(character_cache) == 0
+    assert character_manager.load_character("Cached", save_dir)["gold"] == 555
+
+    # an edit that didn't go through save_character is noticed too
+    with open(os.path.join(save_dir, "Cached_save.txt"), "a") as f:
+        f.write("\n")
+    character_manager.load_character("Cached", save_dir)
+    assert character_cache.misses == 3
+
+    character_manager.delete_character("Cached", save_dir)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Cached", save_dir)
+
+def test_character_cache_evicts_least_recently_used(tmp_path, character_cache):
+    """Test that the cache stays within max_entries"""
+    save_dir = str(tmp_path)
+    for name in ["A", "B", "C"]:
+        character_manager.save_character(character_manager.create_character(name, "Mage"), save_dir)
+
+    for name in ["A", "B", "A", "C", "A", "B"]:
+        character_manager.load_character(name, save_dir)
+
+    assert len(character_cache) == 2
+    assert (character_cache.hits, character_cache.misses) == (2, 4)
+
+def test_copy_on_write_view_keeps_cache_clean(tmp_path, character_cache):
+    """Test that changing a view only changes that view"""
+    character_cache.copy_on_write = True
+    save_dir = str(tmp_path)
+    character_manager.save_character(character_manager.create_character("Cow", "Cleric"), save_dir)
+
+    view = character_manager.load_character("Cow", save_dir)
+    assert isinstance(view, character_manager.CharacterView)
+    view["inventory"].append("health_potion")
+    view["gold"] += 50
+    view["nickname"] = "Moo"
+    del view["completed_quests"]
+
+    other = character_manager.load_character("Cow", save_dir)
+    assert other["inventory"] == []
+    assert other["gold"] == 100
+    assert "nickname" not in other and "completed_quests" in other
+    assert view["inventory"] == ["health_potion"]
+    assert "completed_quests" not in view
+
+    view["completed_quests"] = []
+    character_manager.save_character(view, save_dir)
+    assert character_manager.load_character("Cow", save_dir)["gold"] == 150
+
+
+# ============================================================================
+# SAVE CODEC TESTS
+# ============================================================================
+
+def test_compressed_saves_round_trip(tmp_path):
+    """Test that compressed saves load, and old text saves still do"""
+    save_dir = str(tmp_path)
+    old = character_manager.create_character("Plain", "Rogue")
+    character_manager.save_character(old, save_dir)
+
+    for codec in ["zlib", "lzma"]:
+        previous = character_manager.set_save_codec(codec)
+        try:
+            char = character_manager.create_character(f"Packed_{codec}", "Mage")
+            char["inventory"].extend(["health_potion"] * 20)
+            character_manager.save_character(char, save_dir)
+        finally:
+            character_manager.set_save_codec(previous)
+
+        with open(os.path.join(save_dir, f"Packed_{codec}_save.txt"), "rb") as f:
+            data = f.read()
+        assert not data.startswith(b"NAME:")
+        assert len(data) < len(character_manager.format_save_data(char))
+        assert character_manager.load_character(f"Packed_{codec}", save_dir) == char
+
+    assert character_manager.load_character("Plain", save_dir) == old
+
+def test_compressed_snapshot_with_journal(tmp_path, journal_on):
+    """Test that journal snapshots are compressed and still replay"""
+    save_dir = str(tmp_path)
+    previous = character_manager.set_save_codec("zlib")
+    try:
+        char = character_manager.create_character("Zipped", "Cleric")
+        character_manager.save_character(char, save_dir)
+        char["gold"] = 321
+        character_manager.save_character(char, save_dir)
+    finally:
+        character_manager.set_save_codec(previous)
+
+    assert character_manager.load_character("Zipped", save_dir)["gold"] == 321
+
+def test_damaged_compressed_save_is_corrupted(tmp_path):
+    """Test that a truncated compressed save raises SaveFileCorruptedError"""
+    data = character_manager.encode_save_data("NAME: Broken\n" * 50, "zlib")
+    with open(os.path.join(str(tmp_path), "Broken_save.txt"), "wb") as f:
+        f.write(data[:len(data) // 2])
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Broken", str(tmp_path))
+
+
+# ============================================================================
+# SAVE ARCHIVE TESTS
+# ============================================================================
+
+def test_export_and_import_saves(tmp_path, journal_on):
+    """Test that every save survives a trip through an archive"""
+    source = str(tmp_path / "source")
+    chars = []
+    for i in range(5):
+        char = character_manager.create_character(f"Arc{i}", "Rogue")
+        char["inventory"].append("health_potion")
+        character_manager.save_character(char, source)
+        char["gold"] = i * 10
+        character_manager.save_character(char, source)
+        chars.append(char)
+    with open(os.path.join(source, "Bad_save.txt"), "w") as f:
+        f.write("NAME: Bad\nLEVEL: high\n")
+
+    archive = str(tmp_path / "saves.tar.gz")
+    result = character_manager.export_saves(archive, source)
+    assert result == {"exported": 5, "failed": ["Bad"]}
+
+    target = str(tmp_path / "target")
+    result = character_manager.import_saves(archive, target, workers=2, batch_size=2)
+
+    assert result == {"imported": 5, "failed": []}
+    assert character_manager.list_saved_characters(target) == [c["name"] for c in chars]
+    for char in chars:
+        assert character_manager.load_character(char["name"], target) == char
+
+def test_import_rejects_bad_members(tmp_path):
+    """Test that members that aren't valid saves are reported, not saved"""
+    archive = str(tmp_path / "saves.tar")
+    members = {
+        "Good_save.txt": character_manager.format_save_data(
+            character_manager.create_character("Good", "Mage")),
+        "Liar_save.txt": character_manager.format_save_data(
+            character_manager.create_character("../escape", "Mage")),
+        "notes.txt": "hello",
+    }
+    with tarfile.open(archive, "w") as tar:
+        for name, text in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(text.encode())
+            tar.addfile(info, io.BytesIO(text.encode()))
+
+    save_dir = str(tmp_path / "saves")
+    result = character_manager.import_saves(archive, save_dir)
+
+    assert result == {"imported": 1, "failed": ["Liar_save.txt", "notes.txt"]}
+    assert character_manager.list_saved_characters(save_dir) == ["Good"]
+
+    with open(archive, "wb") as f:
+        f.write(b"not an archive")
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.import_saves(archive, save_dir)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])